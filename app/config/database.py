@@ -49,4 +49,19 @@ def get_representative_collection():
     return mongodb.get_collection("representatives")
 
 def get_methodology_prompt_collection():
-    return mongodb.get_collection("methodology_prompts")
\ No newline at end of file
+    return mongodb.get_collection("methodology_prompts")
+
+def get_question_cache_collection():
+    return mongodb.get_collection("question_cache")
+
+def get_job_collection():
+    return mongodb.get_collection("jobs")
+
+def get_voice_catalog_collection():
+    return mongodb.get_collection("voice_catalog")
+
+def get_live_session_collection():
+    return mongodb.get_collection("live_sessions")
+
+def get_company_enrichment_collection():
+    return mongodb.get_collection("company_enrichment_cache")
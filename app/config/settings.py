@@ -23,6 +23,111 @@ class Settings(BaseSettings):
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "sales_training_db"
     
+    # Top-question cache (shared across workers via MongoDB)
+    QUESTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    QUESTION_CACHE_MAX_ENTRIES: int = 5000
+    
+    # Background job queue (see app/workers/job_worker.py)
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 15
+    JOB_RETRY_MAX_SECONDS: int = 1800
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    RUN_EMBEDDED_JOB_WORKER: bool = False  # dev only: process jobs inside the API process
+    
+    # Analytics backfill via the OpenAI Batch API
+    ANALYTICS_BACKFILL_BATCH_SIZE: int = 1000
+    ANALYTICS_BACKFILL_POLL_SECONDS: int = 30
+    ANALYTICS_BACKFILL_MAX_ATTEMPTS: int = 3  # sessions that failed this often are no longer picked up
+    
+    # Map-reduce analytics for long transcripts
+    ANALYTICS_MAP_REDUCE_MIN_TOKENS: int = 6000   # transcripts above this use map-reduce in "auto" mode
+    ANALYTICS_WINDOW_TOKENS: int = 2500
+    ANALYTICS_MAP_MODEL: str = "gpt-4o-mini"
+    ANALYTICS_MAP_CONCURRENCY: int = 8
+    
+    # Speech-to-text engine: "hosted" (OpenAI whisper-1), "local" (faster-whisper on CPU)
+    # or "auto" (local once its model is loaded, hosted otherwise / on local errors)
+    STT_ENGINE: str = "hosted"
+    STT_TIMEOUT_SECONDS: float = 30.0
+    STT_LOCAL_MODEL: str = "base.en"
+    STT_LOCAL_COMPUTE_TYPE: str = "int8"
+    STT_LOCAL_WORKERS: int = 0  # 0 = one per CPU core
+    STT_MIN_SPEECH_MS: int = 300                 # silence gate: voiced audio needed to call STT
+    STT_NO_SPEECH_PROB_THRESHOLD: float = 0.6
+    STT_LOGPROB_THRESHOLD: float = -1.0
+    STT_HALLUCINATION_MAX_SECONDS: float = 2.0   # stock phrases from shorter clips are dropped
+    STT_TURN_BUDGET_SECONDS: float = 10.0        # hard deadline for one utterance, hedges included
+    STT_HEDGE_ENABLED: bool = True               # second request if the first is slower than its p95
+    STT_HEDGE_DEFAULT_SECONDS: float = 2.5       # hedge delay until enough latency samples exist
+    STT_HEDGE_MIN_SECONDS: float = 0.75
+    STT_HEDGE_MIN_SAMPLES: int = 20
+    
+    # Audio normalization before STT (16 kHz mono PCM, int16 RMS units)
+    AUDIO_SILENCE_RMS: int = 300   # ~ -40 dBFS
+    AUDIO_TRIM_PADDING_MS: int = 150
+    
+    # TTS audio: formats offered to live clients (negotiated per connection) and stored recording format
+    TTS_STREAM_FORMATS: str = "mp3,opus,pcm"
+    TTS_DEFAULT_STREAM_FORMAT: str = "mp3"
+    RECORDING_ARCHIVE_FORMAT: str = "mp3"   # "mp3" or "opus"
+    
+    # TTS phrase cache: fixed fallback/filler lines, in-memory LRU backed by S3
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MEMORY_MB: int = 32
+    TTS_CACHE_WARMUP_ON_STARTUP: bool = False   # pre-render at startup (only with S3, so renders persist)
+    TTS_CACHE_WARMUP_FORMATS: str = "mp3"   # add "opus"/"pcm" if clients negotiate them
+    TTS_CACHE_WARMUP_CONCURRENCY: int = 4
+    
+    # ElevenLabs voice catalog (cached in MongoDB, refreshed in the background once stale)
+    VOICE_CATALOG_TTL_SECONDS: int = 86400
+    VOICE_CATALOG_FETCH_TIMEOUT_SECONDS: float = 10.0
+    
+    # Company scraper: per-source deadlines and the budget for the text sources used by extraction
+    SCRAPER_WEBSITE_TIMEOUT_SECONDS: float = 15.0
+    SCRAPER_PAGESPEED_TIMEOUT_SECONDS: float = 60.0   # merged into the company later if it finishes late
+    SCRAPER_WIKIPEDIA_TIMEOUT_SECONDS: float = 8.0
+    SCRAPER_AI_SEARCH_TIMEOUT_SECONDS: float = 40.0
+    SCRAPER_TOTAL_BUDGET_SECONDS: float = 45.0
+    SCRAPER_WEBSITE_MAX_BYTES: int = 1_000_000  # stop downloading a page past this size
+    
+    # Multi-page crawl of the company site (about / careers / pricing / press); 0 pages disables it
+    SCRAPER_CRAWL_MAX_PAGES: int = 4
+    SCRAPER_CRAWL_PER_HOST_CONCURRENCY: int = 2
+    SCRAPER_CRAWL_MAX_TOTAL_BYTES: int = 2_000_000
+    SCRAPER_CRAWL_PAGE_CHARS: int = 1500
+    SCRAPER_CRAWL_BUDGET_SECONDS: float = 6.0
+    
+    # URL validation result cache (per process); failures are re-checked sooner
+    URL_VALIDATION_CACHE_TTL_SECONDS: int = 3600
+    URL_VALIDATION_NEGATIVE_TTL_SECONDS: int = 120
+    URL_VALIDATION_CACHE_MAX_ENTRIES: int = 2048
+    URL_VALIDATION_BATCH_CONCURRENCY: int = 8
+    
+    # Company enrichment cache (per domain); each field expires on its group's TTL
+    COMPANY_CACHE_SLOW_TTL_SECONDS: int = 30 * 86400    # tech stack, founding, HQ, socials
+    COMPANY_CACHE_MEDIUM_TTL_SECONDS: int = 7 * 86400   # size, revenue, industry, description
+    COMPANY_CACHE_FAST_TTL_SECONDS: int = 86400         # news, hiring, reviews
+    
+    # Background company enrichment (company_enrichment jobs)
+    COMPANY_ENRICHMENT_CONCURRENCY: int = 4   # enrichments running at once per worker process
+    COMPANY_ENRICHMENT_POLL_SECONDS: float = 1.0
+    COMPANY_ENRICHMENT_STREAM_MAX_SECONDS: int = 300
+    
+    # Bulk company import (/api/company/bulk-import)
+    COMPANY_IMPORT_MAX_ROWS: int = 1000
+    COMPANY_IMPORT_INSERT_BATCH: int = 100   # companies per insert_many
+    
+    # Multi-worker serving (python -m app.server) and the live-session registry
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 0   # uvicorn worker processes; 0 = one per CPU core
+    NODE_URL: str = ""   # this node's address as reachable by the load balancer (reported per session)
+    SESSION_REGISTRY_BACKEND: str = "mongo"   # "mongo" (cluster-wide) or "memory" (single process)
+    SESSION_HEARTBEAT_SECONDS: int = 15
+    SESSION_TTL_SECONDS: int = 60
+    
     # Application
     APP_ENV: str = "development"
     DEBUG: bool = True
@@ -316,6 +316,14 @@ class CompanyCreate(BaseModel):
     company_url: HttpUrl
     salesperson_id: str
     auto_fetch: bool = True
+    refresh_cache: bool = False  # bypass the shared enrichment cache and re-scrape
+
+
+class CompanyBulkImport(BaseModel):
+    salesperson_id: str
+    urls: List[str]  # raw URLs or bare domains; validated per row
+    auto_fetch: bool = True
+    refresh_cache: bool = False
 
 
 class CompanyResponse(BaseModel):
@@ -339,6 +347,16 @@ class RepresentativeCreate(BaseModel):
     voice_id: Optional[str] = None
 
 
+class RepresentativeUpdate(RepresentativeCreate):
+    id: str
+
+
+class RepresentativeBulkWrite(BaseModel):
+    create: List[RepresentativeCreate] = []
+    update: List[RepresentativeUpdate] = []
+    delete: List[str] = []  # representative ids
+
+
 class RepresentativeResponse(BaseModel):
     id: str
     name: str
@@ -363,6 +381,7 @@ class MeetingCreate(BaseModel):
     sales_methodology: SalesMethodology = SalesMethodology.MEDDIC
     custom_sales_methodology: Optional[str] = None  # used when sales_methodology = "Other"
     methodology_description: Optional[str] = None  # extra context to influence AI behavior
+    fresh_questions: bool = False  # bypass the shared top-questions cache
 
 
 class MeetingResponse(BaseModel):
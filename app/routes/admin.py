@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 from typing import Optional
 from pydantic import BaseModel
 from app.config.database import get_methodology_prompt_collection
+from app.services.job_queue_service import job_queue_service
 from app.utils.helpers import current_timestamp, build_api_response
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -58,6 +59,12 @@ class MethodologyPromptUpdate(BaseModel):
     description: Optional[str] = None
 
 
+class AnalyticsBackfillRequest(BaseModel):
+    limit: int = 1000
+    older_than_minutes: int = 60
+    dry_run: bool = False
+
+
 async def _seed_defaults():
     """Insert default prompts if collection is empty."""
     col = get_methodology_prompt_collection()
@@ -113,3 +120,98 @@ async def update_methodology_prompt(methodology_name: str, body: MethodologyProm
 
     await col.update_one({"_id": key}, {"$set": update})
     return build_api_response(success=True, message=f"{key} prompt updated successfully")
+
+
+@router.post("/analytics/backfill", response_model=dict)
+async def backfill_analytics(body: AnalyticsBackfillRequest):
+    """
+    Queue a Batch API backfill for sessions that ended without analytics.
+    Runs in the job worker; progress is logged there.
+    """
+    try:
+        job_id = await job_queue_service.enqueue("analytics_backfill", body.dict())
+        return build_api_response(
+            success=True,
+            data={"job_id": job_id},
+            message="Analytics backfill queued"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stt/stats", response_model=dict)
+async def get_stt_stats():
+    """Per-engine speech-to-text latency stats for this process."""
+    from app.services.whisper_service import whisper_service
+    return build_api_response(success=True, data=whisper_service.get_stats())
+
+
+@router.get("/tts-cache/stats", response_model=dict)
+async def get_tts_cache_stats():
+    """Phrase-level TTS cache hit rates and memory use for this process."""
+    from app.services.tts_cache_service import tts_cache_service
+    return build_api_response(success=True, data=tts_cache_service.get_stats())
+
+
+@router.post("/tts-cache/warm", response_model=dict)
+async def warm_tts_cache(background_tasks: BackgroundTasks):
+    """Re-render fixed phrases for every voice in use (e.g. after adding representatives)."""
+    from app.services.tts_cache_service import tts_cache_service
+    background_tasks.add_task(tts_cache_service.warm_up)
+    return build_api_response(success=True, message="TTS cache warm-up started")
+
+
+@router.get("/voices", response_model=dict)
+async def list_voices(refresh: bool = Query(False, description="Re-fetch from ElevenLabs now")):
+    """
+    ElevenLabs voices available for representatives.
+    Served from the voice catalog cache — ElevenLabs is only called when the
+    cache is stale (in the background) or ``refresh=true``.
+    """
+    try:
+        from app.services.voice_catalog_service import voice_catalog_service
+        voices = await voice_catalog_service.get_voices(force_refresh=refresh)
+        return build_api_response(
+            success=True,
+            data={"voices": voices, "catalog": voice_catalog_service.get_stats()}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/url-validation/stats", response_model=dict)
+async def get_url_validation_stats():
+    """URL validation cache hits, misses and coalesced checks for this process."""
+    from app.services.url_validator_service import url_validator
+    return build_api_response(success=True, data=url_validator.get_cache_stats())
+
+
+@router.get("/sessions", response_model=dict)
+async def list_live_sessions(meeting_id: Optional[str] = None):
+    """Live conversation sessions on every worker, with the worker that owns each."""
+    try:
+        from app.services.session_registry_service import session_registry_service
+        sessions = await session_registry_service.list_active(meeting_id)
+        for session in sessions:
+            session["session_id"] = session.pop("_id")
+            session.pop("expires_at", None)
+        workers = sorted({s["worker_id"] for s in sessions})
+        return build_api_response(
+            success=True,
+            data={"sessions": sessions, "total": len(sessions), "workers": workers}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}", response_model=dict)
+async def get_live_session_owner(session_id: str):
+    """Which worker/node owns a live session (for routing and debugging)."""
+    from app.services.session_registry_service import session_registry_service
+    session = await session_registry_service.owner(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not active")
+    session = dict(session, session_id=session.get("_id"))
+    session.pop("_id", None)
+    session.pop("expires_at", None)
+    return build_api_response(success=True, data=session)
@@ -1,34 +1,47 @@
-from fastapi import APIRouter, HTTPException, Body, Query
-from starlette.responses import RedirectResponse
+import json
+from fastapi import APIRouter, HTTPException, Body, Query, File, Form, UploadFile
+from starlette.responses import RedirectResponse, StreamingResponse
 from typing import List
 from pydantic import BaseModel
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from app.models.schemas import (
-    CompanyCreate, CompanyResponse, RepresentativeCreate,
-    RepresentativeResponse, MeetingMode
+    CompanyCreate, CompanyBulkImport, CompanyResponse, RepresentativeCreate,
+    RepresentativeBulkWrite, RepresentativeResponse, MeetingMode
 )
 from app.config.database import (
     get_company_collection, get_representative_collection,
     get_meeting_collection, get_conversation_collection
 )
-from app.services.scraper import scraper
+from app.services.company_enrichment_cache_service import company_enrichment_cache_service
+from app.services.company_enrichment_service import company_enrichment_service
+from app.services.company_import_service import build_company_document, company_import_service
 from app.services.openai_service import openai_service
 from app.services.url_validator_service import url_validator
+from app.services.conversation_metrics_service import conversation_metrics_service
 from app.utils.helpers import generate_id, current_timestamp, build_api_response
 
 router = APIRouter(prefix="/api/company", tags=["Company"])
 
+MAX_BATCH_VALIDATION_URLS = 1000
+
 
 # Request/Response models
 class URLValidationRequest(BaseModel):
     url: str
 
 
+class BatchURLValidationRequest(BaseModel):
+    urls: List[str]
+
+
 class URLValidationResponse(BaseModel):
     is_valid: bool
     authenticated_url: str = None
     is_reachable: bool
     status_code: int = None
     ssl_valid: bool
+    ssl_certificate: dict = None
     domain: str = None
     errors: list
     warnings: list
@@ -60,6 +73,8 @@ async def validate_company_url(request: URLValidationRequest):
                 "is_reachable": validation_result["is_reachable"],
                 "status_code": validation_result["status_code"],
                 "ssl_valid": validation_result["ssl_valid"],
+                "ssl_certificate": validation_result["ssl_certificate"],
+                "redirect_chain": validation_result["redirect_chain"],
                 "domain": validation_result["domain"],
                 "errors": validation_result["errors"],
                 "warnings": validation_result["warnings"],
@@ -71,6 +86,46 @@ async def validate_company_url(request: URLValidationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/validate-urls", response_model=dict)
+async def validate_company_urls(request: BatchURLValidationRequest):
+    """
+    Validate a batch of company URLs (e.g. before a bulk import).
+    Checks run with bounded concurrency and share the validation cache.
+    """
+    try:
+        if len(request.urls) > MAX_BATCH_VALIDATION_URLS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_BATCH_VALIDATION_URLS} URLs per request"
+            )
+
+        results = await url_validator.validate_many(request.urls)
+        items = [
+            {
+                "url": url,
+                "is_valid": result["is_valid"],
+                "authenticated_url": result["authenticated_url"],
+                "domain": result["domain"],
+                "errors": result["errors"],
+                "warnings": result["warnings"],
+                "cached": result["cached"]
+            }
+            for url, result in results.items()
+        ]
+        valid = sum(1 for item in items if item["is_valid"])
+
+        return build_api_response(
+            success=True,
+            data={"results": items, "total": len(items), "valid": valid, "invalid": len(items) - valid},
+            message=f"Validated {len(items)} URLs ({valid} valid)"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/redirect")
 async def redirect_to_authenticated_url(url: str = Query(..., description="The company URL to redirect to")):
     """
@@ -103,7 +158,7 @@ async def redirect_to_authenticated_url(url: str = Query(..., description="The c
 
 @router.post("/create", response_model=dict)
 async def create_company_data(company_data: CompanyCreate):
-    """Create company profile with AI-powered data extraction"""
+    """Create company profile; AI-powered data extraction runs as a background job"""
     
     try:
         # Validate and authenticate the URL first
@@ -126,28 +181,24 @@ async def create_company_data(company_data: CompanyCreate):
         
         company_id = generate_id()
         
+        collection = get_company_collection()
+
+        # Enrichment runs in the background; a fully cached domain is filled in right away
         scraped_data = {}
+        enrichment_status = "skipped"
         if company_data.auto_fetch:
-            scraped_data = await scraper.scrape_company_data(authenticated_url)
+            cached = None if company_data.refresh_cache else await company_enrichment_cache_service.cached(authenticated_url)
+            scraped_data = cached or {}
+            enrichment_status = "complete" if cached else "queued"
         
-        company_doc = {
-            "_id": company_id,
-            "salesperson_id": company_data.salesperson_id,
-            "company_url": authenticated_url,  # Store authenticated URL
-            "original_url": str(company_data.company_url),  # Store original input
-            "url_validation": {
-                "is_valid": validation_result["is_valid"],
-                "ssl_valid": validation_result["ssl_valid"],
-                "validated_at": current_timestamp(),
-                "domain": validation_result["domain"]
-            },
-            "company_data": scraped_data,
-            "created_at": current_timestamp(),
-            "last_updated": current_timestamp()
-        }
+        company_doc = build_company_document(
+            company_id, company_data.salesperson_id, str(company_data.company_url),
+            validation_result, scraped_data, enrichment_status
+        )
         
-        collection = get_company_collection()
         await collection.insert_one(company_doc)
+        if enrichment_status == "queued":
+            await company_enrichment_service.enqueue(company_id, authenticated_url, company_data.refresh_cache)
         
         return build_api_response(
             success=True,
@@ -156,6 +207,7 @@ async def create_company_data(company_data: CompanyCreate):
                 "salesperson_id": company_data.salesperson_id,
                 "company_url": authenticated_url,
                 "company_data": scraped_data,
+                "enrichment_status": enrichment_status,
                 "url_validation": {
                     "is_valid": validation_result["is_valid"],
                     "ssl_valid": validation_result["ssl_valid"],
@@ -163,8 +215,67 @@ async def create_company_data(company_data: CompanyCreate):
                     "warnings": validation_result["warnings"]
                 }
             },
-            message="Company data created successfully with authenticated URL"
+            message="Company created; data enrichment is running in the background"
+            if enrichment_status == "queued" else "Company data created successfully with authenticated URL"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _import_stream(salesperson_id: str, urls: List[str], auto_fetch: bool, refresh_cache: bool):
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs provided")
+    if len(urls) > company_import_service.max_rows:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {company_import_service.max_rows} URLs per import"
         )
+
+    async def lines():
+        async for event in company_import_service.run_import(salesperson_id, urls, auto_fetch, refresh_cache):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/bulk-import")
+async def bulk_import_companies(request: CompanyBulkImport):
+    """
+    Create many companies at once. Domains are deduplicated, URLs validated
+    concurrently, companies written in batches and enriched in the
+    background. Streams one NDJSON line per row, then a summary line.
+    """
+    return _import_stream(request.salesperson_id, request.urls, request.auto_fetch, request.refresh_cache)
+
+
+@router.post("/bulk-import/csv")
+async def bulk_import_companies_csv(
+    file: UploadFile = File(...),
+    salesperson_id: str = Form(...),
+    auto_fetch: bool = Form(True),
+    refresh_cache: bool = Form(False)
+):
+    """Bulk import from a CSV upload (company_url / url / website / domain column, else the first column)"""
+    
+    try:
+        urls = company_import_service.parse_csv((await file.read()).decode("utf-8-sig", errors="replace"))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read CSV: {e}")
+    return _import_stream(salesperson_id, urls, auto_fetch, refresh_cache)
+
+
+@router.get("/imports/{import_id}", response_model=dict)
+async def get_import_status(import_id: str):
+    """Enrichment progress of the companies created by a bulk import"""
+    
+    try:
+        status = await company_import_service.get_import_status(import_id)
+        if not status:
+            raise HTTPException(status_code=404, detail="Import not found")
+        return build_api_response(success=True, data=status)
     
     except HTTPException:
         raise
@@ -195,6 +306,34 @@ async def get_company_data(company_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{company_id}/enrichment", response_model=dict)
+async def get_company_enrichment(company_id: str):
+    """Enrichment progress: status, per-source results and the fields filled so far"""
+
+    try:
+        status = await company_enrichment_service.get_status(company_id)
+        if not status:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        return build_api_response(success=True, data=status)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{company_id}/enrichment/events")
+async def stream_company_enrichment(company_id: str):
+    """Server-sent events for enrichment progress (ends with a ``done`` event)"""
+
+    return StreamingResponse(
+        company_enrichment_service.stream_events(company_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # @router.post("/{company_id}/representatives", response_model=dict)
 # async def add_representative(
 #     company_id: str,
@@ -241,7 +380,16 @@ async def get_company_data(company_id: str):
 
 
 
-from typing import List
+def _representative_fields(representative: RepresentativeCreate) -> dict:
+    return {
+        "name": representative.name,
+        "role": representative.role,
+        "is_decision_maker": representative.is_decision_maker,
+        "linkedin_profile": str(representative.linkedin_profile) if representative.linkedin_profile else None,
+        "notes": representative.notes,
+        "voice_id": representative.voice_id
+    }
+
 
 @router.post("/{company_id}/representatives", response_model=dict)
 async def add_representatives(
@@ -258,29 +406,38 @@ async def add_representatives(
             raise HTTPException(status_code=404, detail="Company not found")
 
         rep_collection = get_representative_collection()
-        inserted_ids = []
-
-        for representative in representatives:
-            rep_id = generate_id()
-
-            rep_doc = {
-                "_id": rep_id,
+        rep_docs = [
+            {
+                "_id": generate_id(),
                 "company_id": company_id,
-                "name": representative.name,
-                "role": representative.role,
-                "is_decision_maker": representative.is_decision_maker,
-                "linkedin_profile": str(representative.linkedin_profile) if representative.linkedin_profile else None,
-                "notes": representative.notes,
-                "voice_id": representative.voice_id,
+                **_representative_fields(representative),
                 "created_at": current_timestamp()
             }
-
-            await rep_collection.insert_one(rep_doc)
-            inserted_ids.append(rep_id)
+            for representative in representatives
+        ]
+
+        # One ordered insert_many: on a failure the earlier documents are kept
+        # and the rest are reported as not inserted
+        try:
+            if rep_docs:
+                await rep_collection.insert_many(rep_docs, ordered=True)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            errors = {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+            results = [
+                {"index": i, "representative_id": doc["_id"], "status": "created"} if i < inserted
+                else {"index": i, "status": "failed", "error": errors.get(i, "not inserted: an earlier item failed")}
+                for i, doc in enumerate(rep_docs)
+            ]
+            return build_api_response(
+                success=False,
+                data={"representative_ids": [doc["_id"] for doc in rep_docs[:inserted]], "results": results},
+                message=f"Added {inserted} of {len(rep_docs)} representatives"
+            )
 
         return build_api_response(
             success=True,
-            data={"representative_ids": inserted_ids},
+            data={"representative_ids": [doc["_id"] for doc in rep_docs]},
             message="Representatives added successfully"
         )
 
@@ -290,6 +447,88 @@ async def add_representatives(
         raise HTTPException(status_code=500, detail=str(e))
     
 
+@router.post("/{company_id}/representatives/bulk", response_model=dict)
+async def bulk_write_representatives(company_id: str, request: RepresentativeBulkWrite):
+    """
+    Create, update and delete a company's representatives in one bulk_write.
+    Operations run unordered, so one failing item does not stop the others;
+    every item gets its own result.
+    """
+
+    try:
+        company = await get_company_collection().find_one({"_id": company_id}, {"_id": 1})
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        rep_collection = get_representative_collection()
+
+        # Updates and deletes are scoped to this company; ids that are not
+        # its representatives are reported instead of silently matching nothing
+        target_ids = [rep.id for rep in request.update] + request.delete
+        existing = set()
+        if target_ids:
+            async for rep in rep_collection.find({"_id": {"$in": target_ids}, "company_id": company_id}, {"_id": 1}):
+                existing.add(rep["_id"])
+
+        operations, op_items, results = [], [], []
+        for representative in request.create:
+            rep_id = generate_id()
+            operations.append(InsertOne({
+                "_id": rep_id,
+                "company_id": company_id,
+                **_representative_fields(representative),
+                "created_at": current_timestamp()
+            }))
+            op_items.append(len(results))
+            results.append({"op": "create", "representative_id": rep_id, "status": "created"})
+
+        for representative in request.update:
+            if representative.id not in existing:
+                results.append({"op": "update", "representative_id": representative.id,
+                                "status": "failed", "error": "Representative not found"})
+                continue
+            operations.append(UpdateOne(
+                {"_id": representative.id, "company_id": company_id},
+                {"$set": {**_representative_fields(representative), "updated_at": current_timestamp()}}
+            ))
+            op_items.append(len(results))
+            results.append({"op": "update", "representative_id": representative.id, "status": "updated"})
+
+        for rep_id in request.delete:
+            if rep_id not in existing:
+                results.append({"op": "delete", "representative_id": rep_id,
+                                "status": "failed", "error": "Representative not found"})
+                continue
+            operations.append(DeleteOne({"_id": rep_id, "company_id": company_id}))
+            op_items.append(len(results))
+            results.append({"op": "delete", "representative_id": rep_id, "status": "deleted"})
+
+        if not results:
+            raise HTTPException(status_code=400, detail="No operations provided")
+
+        if operations:
+            try:
+                await rep_collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    item = results[op_items[error["index"]]]
+                    item["status"] = "failed"
+                    item["error"] = error.get("errmsg", "write failed")
+
+        failed = sum(1 for item in results if item["status"] == "failed")
+        return build_api_response(
+            success=failed == 0,
+            data={"results": results, "failed": failed},
+            message="Representatives updated successfully" if not failed
+            else f"{len(results) - failed} of {len(results)} operations succeeded"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{company_id}/representatives", response_model=dict)
 async def get_company_representatives(company_id: str):
     """Get all representatives for a company"""
@@ -327,12 +566,7 @@ async def update_representative(
             raise HTTPException(status_code=404, detail="Representative not found")
         
         update_data = {
-            "name": representative.name,
-            "role": representative.role,
-            "is_decision_maker": representative.is_decision_maker,
-            "linkedin_profile": str(representative.linkedin_profile) if representative.linkedin_profile else None,
-            "notes": representative.notes,
-            "voice_id": representative.voice_id,
+            **_representative_fields(representative),
             "updated_at": current_timestamp()
         }
         
@@ -425,26 +659,21 @@ async def get_company_account_details(company_id: str):
 
             if conversation:
                 turns = conversation.get("turns", [])
-                sp_time = conversation.get("salesperson_talk_time", 0.0)
-                rep_time = conversation.get("representatives_talk_time", 0.0)
-                total_time = sp_time + rep_time
-
-                questions_asked = sum(
-                    1 for t in turns
-                    if t.get("speaker") == "salesperson" and "?" in t.get("text", "")
-                )
+                metrics = conversation_metrics_service.summarize(conversation)
 
-                ai_turns = [t for t in turns if t.get("speaker") != "salesperson"]
-                if ai_turns:
-                    last_ai_message = ai_turns[-1].get("text", "")
+                for t in reversed(turns):
+                    if t.get("speaker") != "salesperson":
+                        last_ai_message = t.get("text", "")
+                        break
 
                 analytics = {
                     "total_turns": conversation.get("total_turns", 0),
-                    "salesperson_talk_time": sp_time,
-                    "representatives_talk_time": rep_time,
-                    "total_duration": total_time,
-                    "salesperson_talk_ratio": round((sp_time / total_time * 100), 2) if total_time > 0 else 0,
-                    "questions_asked": questions_asked,
+                    "salesperson_talk_time": metrics["salesperson_talk_time"],
+                    "representatives_talk_time": metrics["representatives_talk_time"],
+                    "total_duration": metrics["total_duration"],
+                    "salesperson_talk_ratio": metrics["salesperson_talk_ratio"],
+                    "questions_asked": metrics["questions_asked"],
+                    "open_questions": metrics["open_questions"],
                 }
 
             session_id = conversation.get("session_id") if conversation else None
@@ -841,11 +841,17 @@ from app.config.database import (
     get_salesperson_collection, get_company_collection,
     get_representative_collection, get_methodology_prompt_collection
 )
-from app.services.openai_service import openai_service
+from app.services.openai_service import openai_service, EMPTY_RESPONSE_TEXT
 from app.services.elevenlabs_service import elevenlabs_service
 from app.services.s3_service import s3_service
 from app.services.whisper_service import whisper_service
 from app.services.audio_stream_service import audio_stream_service
+from app.services.audio_normalizer import audio_normalizer
+from app.utils.audio_duration import probe_duration
+from app.utils.audio_formats import format_info, negotiate_audio_format, to_storage_segment
+from app.services.job_queue_service import job_queue_service
+from app.services.session_registry_service import session_registry_service
+from app.services.conversation_metrics_service import conversation_metrics_service
 from app.utils.helpers import (
     generate_id, current_timestamp, build_api_response,
     format_duration, extract_speaker_from_message
@@ -854,6 +860,7 @@ import json
 import asyncio
 import base64
 import io
+import time
 from fastapi.responses import StreamingResponse
 
 router = APIRouter(prefix="/api/conversation", tags=["Conversation"])
@@ -867,11 +874,11 @@ async def _get_rep_voice_and_personality(rep: Dict) -> tuple:
     return voice_id, personality
 
 
-async def _generate_audio(text: str, voice_id: str, personality: str) -> bytes:
+async def _generate_audio(text: str, voice_id: str, personality: str, audio_format: str = "mp3") -> bytes:
     """Generate TTS audio, return bytes or empty"""
     try:
         audio = await elevenlabs_service.text_to_speech(
-            text=text, voice_id=voice_id, personality=personality
+            text=text, voice_id=voice_id, personality=personality, audio_format=audio_format
         )
         return audio if audio else b""
     except Exception as e:
@@ -879,7 +886,25 @@ async def _generate_audio(text: str, voice_id: str, personality: str) -> bytes:
         return b""
 
 
-async def _upload_audio(audio_bytes: bytes, meeting_id: str, turn_number: int, speaker_id: str) -> Optional[str]:
+def _audio_duration(audio_bytes: bytes) -> float:
+    """Exact duration from the audio headers (0.0 if there is no/unknown audio)"""
+    if not audio_bytes:
+        return 0.0
+    duration = probe_duration(audio_bytes)
+    if duration is None:
+        print(f"⚠️ Could not probe duration of {len(audio_bytes)} bytes of audio")
+        return 0.0
+    return round(duration, 2)
+
+
+async def _upload_audio(
+    audio_bytes: bytes,
+    meeting_id: str,
+    turn_number: int,
+    speaker_id: str,
+    content_type: str = "audio/mpeg",
+    extension: str = "mp3"
+) -> Optional[str]:
     """Upload audio to S3, return URL or None"""
     if not audio_bytes:
         return None
@@ -888,7 +913,9 @@ async def _upload_audio(audio_bytes: bytes, meeting_id: str, turn_number: int, s
             audio_bytes=audio_bytes,
             meeting_id=meeting_id,
             turn_number=turn_number,
-            speaker=speaker_id
+            speaker=speaker_id,
+            content_type=content_type,
+            extension=extension
         )
         return url
     except Exception as e:
@@ -943,7 +970,7 @@ async def send_message(
         if audio_data and audio_data.filename:
             ab = await audio_data.read()
             audio_url = await _upload_audio(ab, meeting_id, current_turn, speaker)
-            msg_duration = 5.0
+            msg_duration = _audio_duration(ab)
         
         salesperson_turn = {
             "turn_number": current_turn, "speaker": speaker, "speaker_name": speaker_name,
@@ -1000,7 +1027,7 @@ async def send_message(
             "speaker_name": primary_rep["name"], "text": primary_text,
             "audio_url": primary_audio_url,
             "timestamp": format_duration((len(conversation_history)) * 10),
-            "duration_seconds": 6.0, "created_at": current_timestamp()
+            "duration_seconds": _audio_duration(primary_audio), "created_at": current_timestamp()
         }
         
         # Secondary rep (optional)
@@ -1025,27 +1052,28 @@ async def send_message(
                 "speaker_name": secondary_rep["name"], "text": secondary_text,
                 "audio_url": secondary_audio_url,
                 "timestamp": format_duration((len(conversation_history) + 1) * 10),
-                "duration_seconds": 4.0, "created_at": current_timestamp()
+                "duration_seconds": _audio_duration(secondary_audio), "created_at": current_timestamp()
             }
         
         # Save all turns
         turns_to_save = [salesperson_turn, primary_turn]
-        total_ai_time = 6.0
+        total_ai_time = primary_turn["duration_seconds"]
         last_turn_number = primary_turn_number
         
         if secondary_turn:
             turns_to_save.append(secondary_turn)
-            total_ai_time += 4.0
+            total_ai_time += secondary_turn["duration_seconds"]
             last_turn_number = secondary_turn_number
         
-        await conversation_collection.update_one(
-            {"meeting_id": meeting_id},
-            {
-                "$inc": {"salesperson_talk_time": msg_duration, "representatives_talk_time": total_ai_time},
-                "$push": {"turns": {"$each": turns_to_save}},
-                "$set": {"total_turns": last_turn_number}
-            }
+        update = {
+            "$inc": {"salesperson_talk_time": msg_duration, "representatives_talk_time": total_ai_time},
+            "$push": {"turns": {"$each": turns_to_save}},
+            "$set": {"total_turns": last_turn_number}
+        }
+        conversation_metrics_service.merge_update(
+            update, conversation_metrics_service.build_update(turns_to_save)
         )
+        await conversation_collection.update_one({"meeting_id": meeting_id}, update)
         print(f"💾 Saved {len(turns_to_save)} turns")
         
         # Build response
@@ -1089,6 +1117,8 @@ async def get_meeting_sessions(meeting_id: str):
     try:
         col = get_conversation_collection()
         cursor = col.find({"meeting_id": meeting_id}, sort=[("attempt_number", -1)])
+        # Live sessions may be running on any worker — ask the shared registry
+        live = {s["_id"]: s["worker_id"] for s in await session_registry_service.list_active(meeting_id)}
         sessions = []
         async for doc in cursor:
             raw_s3_url = doc.get("recording_s3_url")
@@ -1104,6 +1134,8 @@ async def get_meeting_sessions(meeting_id: str):
                 "attempt_number":   doc.get("attempt_number", 1),
                 "total_turns":      doc.get("total_turns", 0),
                 "created_at":       doc.get("created_at"),
+                "is_live":          doc.get("session_id") in live,
+                "worker_id":        live.get(doc.get("session_id")),
                 # Pre-signed URL (valid 7 days). null until background task finishes.
                 "recording_s3_url": presigned_url,
                 # Fallback streaming endpoint (merges on-the-fly)
@@ -1136,8 +1168,9 @@ async def get_conversation_history(meeting_id: str, session_id: Optional[str] =
         analytics_data = conv.get("analytics", {})
         conv["summary"] = analytics_data.get("summary", "")
         conv["engagement_score"] = analytics_data.get("engagement_score", 0)
-        conv["questions_asked"] = analytics_data.get("questions_asked", 0)
-        conv["open_questions"] = analytics_data.get("open_questions", 0)
+        metrics = conversation_metrics_service.summarize(conv)
+        conv["questions_asked"] = metrics["questions_asked"]
+        conv["open_questions"] = metrics["open_questions"]
         conv["active_listening_grade"] = analytics_data.get("active_listening_grade", "N/A")
 
         # Convert stored raw S3 URL to a pre-signed URL (7 days)
@@ -1268,167 +1301,6 @@ async def get_conversation_analytics(meeting_id: str, session_id: Optional[str]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def _generate_and_save_analytics(session_id: str):
-    """Background task to generate and save AI analytics after a session ends."""
-    try:
-        conv_col = get_conversation_collection()
-        conv = await conv_col.find_one({"session_id": session_id})
-        if not conv or not conv.get("turns"):
-            print(f"⏭️ Skipping analytics for {session_id} - no conversation data")
-            return
-            
-        print(f"📊 Starting background AI analytics for session {session_id}...")
-        
-        try:
-            # Fetch related data for context
-            meeting_id = conv["meeting_id"]
-            meeting = await get_meeting_collection().find_one({"_id": meeting_id})
-            if meeting:
-                salesperson = await get_salesperson_collection().find_one({"_id": meeting["salesperson_id"]})
-                company = await get_company_collection().find_one({"_id": meeting["company_id"]})
-                
-                # Generate complex AI analytics
-                analytics_result = await openai_service.generate_conversation_analytics(
-                    conversation_history=conv["turns"],
-                    salesperson_data=salesperson or {},
-                    company_data=company or {}
-                )
-                
-                # Calculate talk time ratios
-                total_time = conv.get("salesperson_talk_time", 0) + conv.get("representatives_talk_time", 0)
-                sp_ratio = round(conv.get("salesperson_talk_time", 0) / total_time * 100, 2) if total_time else 0
-                ai_ratio = round(conv.get("representatives_talk_time", 0) / total_time * 100, 2) if total_time else 0
-                
-                # Combine basic stats with AI insights
-                analytics_result.update({
-                    "total_turns": conv.get("total_turns", 0),
-                    "salesperson_turns": len([t for t in conv["turns"] if t["speaker"] == "salesperson"]),
-                    "ai_turns": len([t for t in conv["turns"] if t["speaker"] != "salesperson"]),
-                    "salesperson_talk_time": conv.get("salesperson_talk_time", 0),
-                    "representatives_talk_time": conv.get("representatives_talk_time", 0),
-                    "total_duration": total_time,
-                    "salesperson_talk_ratio": sp_ratio,
-                    "representatives_talk_ratio": ai_ratio
-                })
-                
-                # Save analytics back to database
-                await conv_col.update_one(
-                    {"session_id": session_id},
-                    {"$set": {"analytics": analytics_result}}
-                )
-                print(f"✅ AI Analytics completed and saved for session {session_id}")
-        except Exception as e:
-            print(f"❌ Background analytics generation error for {session_id}: {e}")
-            import traceback; traceback.print_exc()
-
-    except Exception as e:
-        print(f"❌ Background analytics error for {session_id}: {e}")
-        import traceback; traceback.print_exc()
-
-    # ── Full recording upload (runs regardless of analytics success) ──────────
-    try:
-        conv = await conv_col.find_one({"session_id": session_id})
-        if not conv:
-            return
-
-        turns = conv.get("turns", [])
-        meeting_id = conv.get("meeting_id")
-        sorted_turns = sorted(turns, key=lambda t: t.get("turn_number", 0))
-        audio_urls = [t["audio_url"] for t in sorted_turns if t.get("audio_url")]
-
-        if not audio_urls:
-            print(f"⚠️ No audio URLs — skipping full recording upload for {session_id}")
-            return
-
-        print(f"🎞️ Extracting {len(audio_urls)} segments for full recording ({session_id})...")
-        import tempfile
-        import os
-        import subprocess
-        import imageio_ffmpeg
-        
-        temp_files = []
-        
-        try:
-            # Download chunks to temp files
-            for url in audio_urls:
-                chunk = await s3_service.download_file(url)
-                if chunk:
-                    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.tmp')
-                    tmp.write(chunk)
-                    tmp.close()
-                    temp_files.append(tmp.name)
-
-            if not temp_files:
-                print(f"⚠️ Could not download any audio segments — skipping full recording upload")
-                return
-
-            print(f"✅ Downloaded {len(temp_files)}/{len(audio_urls)} segments. Merging via FFMPEG...")
-            
-            ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-
-            # Step 1: Convert ALL files to mp3 first (handles mixed webm/mp3 formats)
-            converted_files = []
-            try:
-                for src in temp_files:
-                    dst = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3').name
-                    conv_cmd = [ffmpeg_exe, "-y", "-i", src, "-c:a", "libmp3lame", "-b:a", "128k", "-ar", "22050", "-ac", "1", dst]
-                    conv_res = subprocess.run(conv_cmd, capture_output=True, text=True)
-                    if conv_res.returncode == 0:
-                        converted_files.append(dst)
-                    else:
-                        print(f"⚠️ Could not convert segment, skipping: {conv_res.stderr[:200]}")
-
-                if not converted_files:
-                    raise Exception("No segments could be converted to mp3")
-
-                # Step 2: Merge all converted mp3 files
-                if len(converted_files) == 1:
-                    with open(converted_files[0], 'rb') as f:
-                        merged_bytes = f.read()
-                else:
-                    out_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3').name
-                    cmd = [ffmpeg_exe, "-y"]
-                    for f in converted_files:
-                        cmd.extend(["-i", f])
-                    filter_str = "".join([f"[{i}:a]" for i in range(len(converted_files))])
-                    filter_str += f"concat=n={len(converted_files)}:v=0:a=1[out]"
-                    cmd.extend(["-filter_complex", filter_str, "-map", "[out]", "-c:a", "libmp3lame", "-b:a", "128k", out_file])
-                    res = subprocess.run(cmd, capture_output=True, text=True)
-                    if res.returncode != 0:
-                        raise Exception(f"FFMPEG failed: {res.stderr}")
-                    with open(out_file, 'rb') as f:
-                        merged_bytes = f.read()
-                    os.remove(out_file)
-
-            finally:
-                for f in converted_files:
-                    if os.path.exists(f): os.remove(f)
-
-            print(f"✅ Merge successful — {len(merged_bytes)} bytes")
-
-        finally:
-            for f in temp_files:
-                if os.path.exists(f): os.remove(f)
-
-        recording_url = await s3_service.upload_full_meeting_audio(
-            audio_bytes=merged_bytes,
-            meeting_id=meeting_id
-        )
-
-        if recording_url:
-            await conv_col.update_one(
-                {"session_id": session_id},
-                {"$set": {"recording_s3_url": recording_url}}
-            )
-            print(f"✅ Full recording uploaded: {recording_url}")
-        else:
-            print(f"⚠️ S3 upload returned None for full recording ({session_id})")
-
-    except Exception as e:
-        print(f"❌ Full recording upload error for {session_id}: {e}")
-        import traceback; traceback.print_exc()
-
-
 @router.websocket("/ws/live-conversation/{meeting_id}")
 async def live_conversation(websocket: WebSocket, meeting_id: str):
     """
@@ -1501,6 +1373,20 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
         }
         await conv_col.insert_one(conversation)
         print(f"📋 New session #{attempt_number} created: {session_id}")
+        # Pinned to this worker for its lifetime; registered so any worker can list it
+        await session_registry_service.register(
+            session_id, meeting_id,
+            salesperson_id=meeting.get("salesperson_id"),
+            attempt_number=attempt_number
+        )
+
+        # TTS codec: client lists what it can play (?audio_formats=opus,mp3), we pick
+        requested_formats = websocket.query_params.get("audio_formats", "").split(",")
+        stream_format = negotiate_audio_format(
+            requested_formats, supported=elevenlabs_service.supported_audio_formats()
+        )
+        stream_format_info = format_info(stream_format)
+        print(f"🔊 TTS stream format: {stream_format}")
 
         await websocket.send_json({
             "type": "connected",
@@ -1508,6 +1394,8 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
             "meeting_id": meeting_id,
             "session_id": session_id,
             "attempt_number": attempt_number,
+            "worker_id": session_registry_service.worker_id,
+            "audio_format": stream_format_info,
             "representatives": [
                 {"id": r["id"], "name": r["name"], "role": r["role"],
                  "personality": r.get("personality_traits", [])}
@@ -1517,6 +1405,11 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
         
         audio_stream_service.start_stream(session_id)  # use session_id so streams don't collide
         print(f"✅ WS connected: {meeting_id} | session #{attempt_number} ({session_id})")
+
+        # Interruption tracking: the salesperson starting to talk before the
+        # last AI reply has finished playing on the client counts as one.
+        ai_playback_until = 0.0
+        salesperson_interrupted = False
         
         while True:
             try:
@@ -1530,6 +1423,8 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                 is_speaking = data.get("is_speaking", True)
                 
                 if is_speaking:
+                    if not audio_stream_service.is_speaking(session_id) and time.monotonic() < ai_playback_until:
+                        salesperson_interrupted = True
                     audio_stream_service.add_audio_chunk(session_id, data.get("data"))
                 else:
                     print("🎙️ User stopped, processing...")
@@ -1541,17 +1436,39 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                     # Combine raw audio bytes (used for both Whisper AND S3 upload)
                     combined_salesperson_audio = b"".join(chunks)
                     
-                    # Transcribe
+                    # Decode once to 16 kHz mono (trimmed) — feeds STT and talk time
+                    normalized_audio = await audio_normalizer.normalize(combined_salesperson_audio)
+                    if normalized_audio:
+                        salesperson_duration = normalized_audio.duration_seconds
+                    else:
+                        salesperson_duration = _audio_duration(combined_salesperson_audio)
+                    
+                    # Transcribe (silence / noise / hallucinations come back as "")
+                    gate_stats = {}
                     try:
-                        transcribed = await whisper_service.transcribe_audio_stream(chunks)
-                        if not transcribed or transcribed.strip() == "":
-                            transcribed = "I said something but it wasn't clear."
+                        transcribed = await whisper_service.transcribe_audio_stream(
+                            chunks, normalized=normalized_audio, stats=gate_stats
+                        )
                         print(f"✅ Transcription: {transcribed}")
                     except Exception as e:
                         print(f"❌ Whisper error: {e}")
                         await websocket.send_json({"type": "error", "message": f"Speech recognition failed: {str(e)}"})
                         transcribed = "Sorry, I couldn't understand that."
                     
+                    if not transcribed or transcribed.strip() == "":
+                        # Nothing was said — don't spend an LLM + TTS turn on it
+                        gate_stats.update({"turns_skipped": 1, "llm_calls_avoided": 1, "tts_calls_avoided": 1})
+                        try:
+                            await conv_col.update_one(
+                                {"session_id": session_id},
+                                {"$inc": {f"gate_stats.{k}": v for k, v in gate_stats.items()}}
+                            )
+                        except Exception as e:
+                            print(f"⚠️ Could not save gate stats: {e}")
+                        # no_audio: the client re-opens the mic, as after a finished reply
+                        await websocket.send_json({"type": "no_audio", "message": "No speech detected"})
+                        continue
+                    
                     await websocket.send_json({"type": "transcription", "text": transcribed, "speaker": "salesperson"})
                     await websocket.send_json({"type": "ai_thinking", "message": "AI is thinking..."})
                     
@@ -1572,8 +1489,10 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                         "speaker_name": "Salesperson", "text": transcribed,
                         "audio_url": salesperson_audio_url,
                         "timestamp": format_duration(len(conv_history) * 10),
-                        "duration_seconds": 5.0, "created_at": current_timestamp()
+                        "duration_seconds": round(salesperson_duration, 2), "interrupted": salesperson_interrupted,
+                        "created_at": current_timestamp()
                     }
+                    salesperson_interrupted = False
                     conv_history.append(salesperson_turn)
                     
                     # --- STREAMING PIPELINE START ---
@@ -1623,12 +1542,14 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                     audio_stream = elevenlabs_service.stream_tts_from_sentences(
                         sentences_stream=sentence_stream,
                         voice_id=v_id,
-                        personality=personality
+                        personality=personality,
+                        audio_format=stream_format
                     )
 
                     full_text = ""
                     full_audio_bytes = b""
                     chunk_no = 0
+                    first_audio_sent_at = None
 
                     print(f"🚀 Starting stream to frontend for {primary_rep['name']}...")
 
@@ -1650,11 +1571,14 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
 
                         # Send audio chunk
                         if audio_bytes:
+                            if first_audio_sent_at is None:
+                                first_audio_sent_at = time.monotonic()
                             import base64
                             await websocket.send_json({
                                 "type": "ai_audio_complete",
                                 "audio_data": base64.b64encode(audio_bytes).decode(),
-                                "audio_mime_type": "audio/mpeg",
+                                "audio_mime_type": stream_format_info["mime_type"],
+                                "audio_format": stream_format,
                                 "speaker_id": primary_rep["id"],
                                 "speaker_name": primary_rep["name"],
                                 "speaker_role": primary_rep["role"],
@@ -1665,7 +1589,25 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                     
                     full_text = full_text.strip()
                     if not full_text:
-                        full_text = "I understand. Could you tell me more about that?"
+                        full_text = EMPTY_RESPONSE_TEXT
+                        # Pre-rendered by the TTS phrase cache — plays without a synthesis round trip
+                        full_audio_bytes = await _generate_audio(full_text, v_id, personality, stream_format)
+                        if full_audio_bytes:
+                            if first_audio_sent_at is None:
+                                first_audio_sent_at = time.monotonic()
+                            import base64
+                            await websocket.send_json({
+                                "type": "ai_audio_complete",
+                                "audio_data": base64.b64encode(full_audio_bytes).decode(),
+                                "audio_mime_type": stream_format_info["mime_type"],
+                                "audio_format": stream_format,
+                                "speaker_id": primary_rep["id"],
+                                "speaker_name": primary_rep["name"],
+                                "speaker_role": primary_rep["role"],
+                                "is_primary": True,
+                                "is_final": False,
+                                "chunk_no": chunk_no + 1
+                            })
                         
                     # Final complete notification
                     await websocket.send_json({
@@ -1678,9 +1620,12 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                     # Upload full audio to S3
                     primary_turn_number = current_turn + 1
                     primary_audio_url = None
+                    stored_audio = b""
                     if full_audio_bytes:
+                        stored_audio, content_type, extension = to_storage_segment(full_audio_bytes, stream_format)
                         primary_audio_url = await _upload_audio(
-                            full_audio_bytes, meeting_id, primary_turn_number, primary_rep["id"]
+                            stored_audio, meeting_id, primary_turn_number, primary_rep["id"],
+                            content_type=content_type, extension=extension
                         )
                     
                     primary_turn = {
@@ -1690,25 +1635,29 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
                         "text": full_text,
                         "audio_url": primary_audio_url,
                         "timestamp": format_duration(len(conv_history) * 10),
-                        "duration_seconds": max(1.0, len(full_audio_bytes) / 32000), # approx duration 
+                        "duration_seconds": _audio_duration(stored_audio),
                         "created_at": current_timestamp()
                     }
                     
                     # Secondary Rep Removed for Low Latency Flow
                     
+                    if first_audio_sent_at is not None:
+                        ai_playback_until = first_audio_sent_at + primary_turn["duration_seconds"]
+
                     turns_to_save = [salesperson_turn, primary_turn]
                     total_ai_time = primary_turn["duration_seconds"]
                     last_turn_no = primary_turn_number
                     
                     try:
-                        await conv_col.update_one(
-                            {"session_id": session_id},
-                            {
-                                "$inc": {"salesperson_talk_time": 5.0, "representatives_talk_time": total_ai_time},
-                                "$push": {"turns": {"$each": turns_to_save}},
-                                "$set": {"total_turns": last_turn_no}
-                            }
+                        update = {
+                            "$inc": {"salesperson_talk_time": salesperson_turn["duration_seconds"], "representatives_talk_time": total_ai_time},
+                            "$push": {"turns": {"$each": turns_to_save}},
+                            "$set": {"total_turns": last_turn_no}
+                        }
+                        conversation_metrics_service.merge_update(
+                            update, conversation_metrics_service.build_update(turns_to_save)
                         )
+                        await conv_col.update_one({"session_id": session_id}, update)
                         print(f"💾 Saved {len(turns_to_save)} turns (up to #{last_turn_no})")
                         await websocket.send_json({
                             "type": "conversation_saved",
@@ -1744,8 +1693,16 @@ async def live_conversation(websocket: WebSocket, meeting_id: str):
             pass
     finally:
         audio_stream_service.clear_stream(session_id)
-        # Trigger AI Analytics in background after disconnect
-        asyncio.create_task(_generate_and_save_analytics(session_id))
+        await session_registry_service.unregister(session_id)
+        # Hand post-session work to the job worker — persisted, so it survives restarts
+        for job_type in ("session_analytics", "session_recording"):
+            try:
+                await job_queue_service.enqueue(
+                    job_type, {"session_id": session_id},
+                    dedupe_key=f"{job_type}:{session_id}"
+                )
+            except Exception as e:
+                print(f"❌ Could not enqueue {job_type} for {session_id}: {e}")
         print(f"🧹 Cleaned up session: {session_id} (meeting: {meeting_id})")
 
 
@@ -6,7 +6,7 @@ from app.config.database import (
     get_company_collection, get_representative_collection,
     get_conversation_collection
 )
-from app.services.openai_service import openai_service
+from app.services.question_cache_service import question_cache_service
 from app.utils.helpers import generate_id, current_timestamp, build_api_response
 
 router = APIRouter(prefix="/api/meeting", tags=["Meeting"])
@@ -61,11 +61,13 @@ async def create_meeting(meeting_data: MeetingCreate):
                 detail=f"Meeting mode {meeting_data.meeting_mode.value} requires {expected_count} representative(s)"
             )
         
-        # Generate top 5 questions using OpenAI
-        top_questions = await openai_service.generate_top_questions(
+        # Top 5 questions — served from the shared cache when the same
+        # product/company/goal was seen before
+        top_questions = await question_cache_service.get_or_generate(
             salesperson_data=salesperson,
             company_data=company,
-            meeting_goal=meeting_data.meeting_goal
+            meeting_goal=meeting_data.meeting_goal,
+            fresh=meeting_data.fresh_questions
         )
         
         # Create meeting document
@@ -8,6 +8,7 @@ from app.config.database import (
 )
 from app.services.openai_service import openai_service
 from app.services.s3_service import s3_service
+from app.services.conversation_metrics_service import conversation_metrics_service
 from app.utils.helpers import (
     generate_id, current_timestamp, validate_file_type,
     get_content_type, build_api_response
@@ -337,11 +338,10 @@ async def get_salesperson_ai_insights(salesperson_id: str):
                 
                 total_prep_score += analytics.get("preparation_score", 0)
                 
-                # Calculate talk ratio for this meeting
-                sales_time = conv.get("salesperson_talk_time", 0)
-                total_dur = conv.get("total_duration", 0)
-                if total_dur > 0:
-                    ratio = (sales_time / total_dur) * 100
+                # Talk ratio and question counts from the local metrics engine
+                metrics = conversation_metrics_service.summarize(conv)
+                if metrics["total_duration"] > 0:
+                    ratio = metrics["salesperson_talk_ratio"]
                     total_talk_ratio += ratio
                     
                     if m_type in talk_ratio_by_type:
@@ -353,8 +353,8 @@ async def get_salesperson_ai_insights(salesperson_id: str):
                     "meeting_goal": meeting.get("meeting_goal"),
                     "type": m_type,
                     "score": score,
-                    "questions_asked": analytics.get("questions_asked", 0),
-                    "open_questions": analytics.get("open_questions", 0),
+                    "questions_asked": metrics["questions_asked"],
+                    "open_questions": metrics["open_questions"],
                     "engagement_score": analytics.get("engagement_score", 0)
                 })
 
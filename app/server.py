@@ -0,0 +1,41 @@
+"""
+Production entry point: one uvicorn worker process per CPU core.
+
+Run:
+    python -m app.server                  # WEB_CONCURRENCY=0 → os.cpu_count() workers
+    WEB_CONCURRENCY=4 python -m app.server
+
+Each live conversation WebSocket stays on the worker that accepted it;
+the shared session registry (``live_sessions``) records which worker owns
+which session, so admin endpoints on any worker see all of them. For
+several nodes behind a load balancer, set NODE_URL per node.
+"""
+
+import os
+
+import uvicorn
+
+from app.config.settings import settings
+
+
+def worker_count() -> int:
+    return settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+
+def main():
+    workers = worker_count()
+    if workers > 1 and settings.SESSION_REGISTRY_BACKEND != "mongo":
+        print("⚠️ SESSION_REGISTRY_BACKEND=memory only sees this process's sessions")
+    print(f"🚀 Starting {workers} worker(s) on {settings.HOST}:{settings.PORT}")
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Analytics backfill through the OpenAI Batch API.
+
+Finds conversations that ended without ``analytics`` (errors, restarts, old
+data), submits one chat-completion request per session as a JSONL batch,
+polls until the batch finishes and bulk-writes the results. Batch requests
+are billed at a discount and run on separate capacity from live sessions.
+Failed sessions are counted in ``analytics_backfill.attempts`` and are no
+longer picked up after ANALYTICS_BACKFILL_MAX_ATTEMPTS.
+"""
+
+import asyncio
+import io
+import json
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from app.config.database import (
+    get_conversation_collection, get_meeting_collection,
+    get_salesperson_collection, get_company_collection
+)
+from app.config.settings import settings
+from app.services.openai_service import openai_service, client as openai_client
+from app.services.session_jobs import attach_session_stats
+from app.utils.helpers import current_timestamp
+
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+class OpenAIBatchClient:
+    """Thin wrapper over the OpenAI Files + Batches endpoints."""
+
+    async def submit(self, jsonl: str) -> str:
+        upload = io.BytesIO(jsonl.encode("utf-8"))
+        upload.name = "analytics_backfill.jsonl"
+        batch_file = await openai_client.files.create(file=upload, purpose="batch")
+        batch = await openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"purpose": "analytics_backfill"}
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        batch = await openai_client.batches.retrieve(batch_id)
+        return {
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "error_file_id": batch.error_file_id
+        }
+
+    async def fetch_output(self, file_id: str) -> str:
+        content = await openai_client.files.content(file_id)
+        return content.text
+
+
+class LocalBatchClient:
+    """
+    In-process stand-in for the Batch API (tests and local runs).
+
+    Each request body is passed to ``responder``, which returns the assistant
+    message content. Defaults to a regular chat-completion call.
+    """
+
+    def __init__(self, responder: Optional[Callable[[Dict[str, Any]], Awaitable[str]]] = None):
+        self.responder = responder or self._chat_completion
+        self._outputs: Dict[str, str] = {}
+
+    @staticmethod
+    async def _chat_completion(body: Dict[str, Any]) -> str:
+        response = await openai_client.chat.completions.create(**body)
+        return response.choices[0].message.content
+
+    async def submit(self, jsonl: str) -> str:
+        lines = []
+        for line in jsonl.splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            try:
+                content = await self.responder(request["body"])
+                lines.append({
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}
+                    },
+                    "error": None
+                })
+            except Exception as e:
+                lines.append({"custom_id": request["custom_id"], "response": None,
+                              "error": {"message": str(e)}})
+
+        batch_id = f"local_batch_{len(self._outputs) + 1}"
+        self._outputs[batch_id] = "\n".join(json.dumps(l) for l in lines)
+        return batch_id
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        return {"status": "completed", "output_file_id": batch_id, "error_file_id": None}
+
+    async def fetch_output(self, file_id: str) -> str:
+        return self._outputs[file_id]
+
+
+class AnalyticsBackfillService:
+    """Backfill missing conversation analytics in batches."""
+
+    def __init__(self, batch_client=None):
+        self.batch_client = batch_client or OpenAIBatchClient()
+        self.batch_size = settings.ANALYTICS_BACKFILL_BATCH_SIZE
+        self.poll_interval = settings.ANALYTICS_BACKFILL_POLL_SECONDS
+        self.max_attempts = settings.ANALYTICS_BACKFILL_MAX_ATTEMPTS
+
+    async def find_pending_sessions(self, limit: int, older_than_minutes: int) -> List[Dict[str, Any]]:
+        """
+        Finished sessions with turns but no analytics (skips possibly-live
+        ones and sessions that already failed ``max_attempts`` times).
+        """
+        cutoff = current_timestamp() - timedelta(minutes=older_than_minutes)
+        cursor = get_conversation_collection().find(
+            {
+                "analytics": {"$exists": False},
+                "session_id": {"$exists": True},
+                "turns.0": {"$exists": True},
+                "created_at": {"$lt": cutoff},
+                "analytics_backfill.attempts": {"$not": {"$gte": self.max_attempts}}
+            },
+            sort=[("created_at", 1)],
+            limit=limit
+        )
+        return [conv async for conv in cursor]
+
+    async def build_batch_lines(self, conversations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One Batch API request per session, keyed by session_id."""
+        meeting_col = get_meeting_collection()
+        salesperson_col = get_salesperson_collection()
+        company_col = get_company_collection()
+        meetings: Dict[str, Any] = {}
+        salespeople: Dict[str, Any] = {}
+        companies: Dict[str, Any] = {}
+
+        lines = []
+        for conv in conversations:
+            meeting_id = conv.get("meeting_id")
+            if meeting_id not in meetings:
+                meetings[meeting_id] = await meeting_col.find_one({"_id": meeting_id})
+            meeting = meetings[meeting_id]
+            if not meeting:
+                continue
+
+            sp_id, company_id = meeting.get("salesperson_id"), meeting.get("company_id")
+            if sp_id not in salespeople:
+                salespeople[sp_id] = await salesperson_col.find_one({"_id": sp_id})
+            if company_id not in companies:
+                companies[company_id] = await company_col.find_one({"_id": company_id})
+
+            messages = openai_service.build_analytics_messages(
+                conv["turns"], salespeople[sp_id] or {}, companies[company_id] or {}
+            )
+            if not messages:
+                continue
+
+            lines.append({
+                "custom_id": conv["session_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": openai_service.model,
+                    "messages": messages,
+                    "temperature": 0.3,
+                    "response_format": {"type": "json_object"}
+                }
+            })
+        return lines
+
+    @staticmethod
+    def parse_batch_output(output_jsonl: str) -> Dict[str, str]:
+        """Map custom_id → assistant content for successful requests."""
+        results = {}
+        for line in output_jsonl.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                print(f"⚠️ Batch request failed for {item.get('custom_id')}: {item.get('error')}")
+                continue
+            try:
+                results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                print(f"⚠️ Malformed batch response for {item.get('custom_id')}")
+        return results
+
+    async def _wait_for_batch(self, batch_id: str) -> Dict[str, Any]:
+        while True:
+            status = await self.batch_client.status(batch_id)
+            if status["status"] in BATCH_TERMINAL_STATES:
+                return status
+            print(f"⏳ Batch {batch_id}: {status['status']}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _record_failures(self, errors: Dict[str, str]):
+        """Count a failed attempt on each session so it stops blocking the queue."""
+        if not errors:
+            return
+        now = current_timestamp()
+        try:
+            await get_conversation_collection().bulk_write([
+                UpdateOne(
+                    {"session_id": session_id},
+                    {
+                        "$inc": {"analytics_backfill.attempts": 1},
+                        "$set": {"analytics_backfill.last_error": error, "analytics_backfill.last_attempt_at": now}
+                    }
+                )
+                for session_id, error in errors.items()
+            ], ordered=False)
+        except Exception as e:
+            print(f"⚠️ Could not record backfill failures: {e}")
+
+    async def _process_chunk(self, conversations: List[Dict[str, Any]], dry_run: bool) -> Dict[str, int]:
+        lines = await self.build_batch_lines(conversations)
+        if dry_run:
+            return {"submitted": len(lines), "written": 0, "failed": 0}
+
+        submitted = {line["custom_id"] for line in lines}
+        errors = {
+            c["session_id"]: "No meeting or transcript to analyze"
+            for c in conversations if c["session_id"] not in submitted
+        }
+        if not lines:
+            await self._record_failures(errors)
+            return {"submitted": 0, "written": 0, "failed": 0}
+
+        batch_id = await self.batch_client.submit("\n".join(json.dumps(l) for l in lines))
+        print(f"📤 Submitted analytics batch {batch_id} ({len(lines)} sessions)")
+
+        status = await self._wait_for_batch(batch_id)
+        if status["status"] != "completed" or not status.get("output_file_id"):
+            print(f"❌ Batch {batch_id} ended with status {status['status']}")
+            errors.update({session_id: f"Batch {status['status']}" for session_id in submitted})
+            await self._record_failures(errors)
+            return {"submitted": len(lines), "written": 0, "failed": len(lines)}
+
+        contents = self.parse_batch_output(await self.batch_client.fetch_output(status["output_file_id"]))
+        conv_by_session = {c["session_id"]: c for c in conversations}
+
+        errors.update({session_id: "Batch request failed" for session_id in submitted - set(contents)})
+        operations = []
+        for session_id, content in contents.items():
+            conv = conv_by_session.get(session_id)
+            if not conv:
+                continue
+            try:
+                analytics = openai_service.parse_analytics_content(content, strict=True)
+            except ValueError as e:
+                # Left without analytics, so a later run retries it (up to max_attempts)
+                print(f"⚠️ Unparseable analytics for {session_id} — leaving it pending")
+                errors[session_id] = str(e)
+                continue
+            analytics = attach_session_stats(analytics, conv)
+            operations.append(UpdateOne(
+                # never overwrite analytics written by the live path meanwhile
+                {"session_id": session_id, "analytics": {"$exists": False}},
+                {"$set": {"analytics": analytics}}
+            ))
+
+        written = 0
+        if operations:
+            result = await get_conversation_collection().bulk_write(operations, ordered=False)
+            written = result.modified_count
+        await self._record_failures(errors)
+        failed = len(lines) - len(operations)
+        print(f"💾 Batch {batch_id}: wrote analytics for {written}/{len(lines)} sessions ({failed} failed)")
+        return {"submitted": len(lines), "written": written, "failed": failed}
+
+    async def run(
+        self,
+        limit: int = 1000,
+        older_than_minutes: int = 60,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        conversations = await self.find_pending_sessions(limit, older_than_minutes)
+        summary = {"found": len(conversations), "submitted": 0, "written": 0, "failed": 0, "dry_run": dry_run}
+        print(f"🔎 Found {len(conversations)} sessions without analytics")
+
+        for i in range(0, len(conversations), self.batch_size):
+            counts = await self._process_chunk(conversations[i:i + self.batch_size], dry_run)
+            summary["submitted"] += counts["submitted"]
+            summary["written"] += counts["written"]
+            summary["failed"] += counts["failed"]
+
+        return summary
+
+    async def run_job(self, payload: Dict[str, Any]):
+        """Job ``analytics_backfill`` handler."""
+        summary = await self.run(
+            limit=payload.get("limit", 1000),
+            older_than_minutes=payload.get("older_than_minutes", 60),
+            dry_run=payload.get("dry_run", False)
+        )
+        print(f"✅ Analytics backfill finished: {summary}")
+
+
+analytics_backfill_service = AnalyticsBackfillService()
@@ -0,0 +1,150 @@
+"""
+Audio normalization stage.
+
+Decodes whatever the browser sent (webm/opus, ogg, mp3, wav...) once into
+16 kHz mono signed 16-bit PCM and trims leading/trailing silence. The
+result feeds both speech-to-text (as a small WAV) and talk-time accounting.
+
+Samples are kept in an ``array('h')`` — a plain buffer, so
+``numpy.frombuffer(audio.samples, dtype=numpy.int16)`` works without a copy.
+"""
+
+import asyncio
+import math
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.audio_formats import pcm_to_wav
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+NOISE_FLOOR_RATIO = 3.0
+
+
+class NormalizedAudio:
+    """16 kHz mono PCM after decoding and silence trimming."""
+
+    def __init__(self, samples: array, sample_rate: int, original_samples: int, speech_seconds: float = 0.0):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.original_samples = original_samples
+        self.speech_seconds = speech_seconds  # voiced frames only (silence gate input)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Duration of the trimmed (speech) audio."""
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def original_duration_seconds(self) -> float:
+        """Duration of the decoded audio before trimming."""
+        return self.original_samples / self.sample_rate
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.samples) == 0
+
+    def to_pcm_bytes(self) -> bytes:
+        samples = self.samples
+        if sys.byteorder != "little":
+            samples = array("h", samples)
+            samples.byteswap()
+        return samples.tobytes()
+
+    def to_wav(self) -> bytes:
+        return pcm_to_wav(self.to_pcm_bytes(), self.sample_rate)
+
+
+def frame_rms(samples: array, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS) -> List[float]:
+    """RMS energy of consecutive ``frame_ms`` frames."""
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    energies = []
+    for start in range(0, len(samples), frame_len):
+        frame = samples[start:start + frame_len]
+        energies.append(math.sqrt(sum(s * s for s in frame) / len(frame)))
+    return energies
+
+
+class AudioNormalizer:
+    """Decode → downmix → resample to 16 kHz mono → trim silence."""
+
+    def __init__(self):
+        self.sample_rate = SAMPLE_RATE
+        self.silence_rms = settings.AUDIO_SILENCE_RMS
+        self.trim_padding_ms = settings.AUDIO_TRIM_PADDING_MS
+        self._ffmpeg_exe: Optional[str] = None
+
+    def _ffmpeg(self) -> str:
+        if self._ffmpeg_exe is None:
+            import imageio_ffmpeg
+            self._ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
+        return self._ffmpeg_exe
+
+    async def decode(self, audio_bytes: bytes) -> array:
+        """Decode any container ffmpeg understands to 16 kHz mono int16 samples."""
+        process = await asyncio.create_subprocess_exec(
+            self._ffmpeg(), "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(self.sample_rate),
+            "-f", "s16le", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        pcm, stderr = await process.communicate(audio_bytes)
+        if process.returncode != 0 and not pcm:
+            raise ValueError(f"Could not decode audio: {stderr.decode(errors='ignore')[:200]}")
+
+        samples = array("h")
+        samples.frombytes(pcm[:len(pcm) - len(pcm) % 2])
+        if sys.byteorder != "little":
+            samples.byteswap()
+        return samples
+
+    def voiced_threshold(self, energies: List[float]) -> float:
+        """Fixed floor, raised for noisy rooms to a multiple of the quietest frames' energy."""
+        if not energies:
+            return float(self.silence_rms)
+        noise_floor = sorted(energies)[len(energies) // 10]
+        return max(float(self.silence_rms), noise_floor * NOISE_FLOOR_RATIO)
+
+    def trim_silence(self, samples: array) -> Tuple[array, float]:
+        """
+        Drop leading/trailing frames below the voiced threshold (keeps some padding).
+        Returns the trimmed samples and the total voiced duration in seconds.
+        """
+        energies = frame_rms(samples, self.sample_rate)
+        threshold = self.voiced_threshold(energies)
+        voiced = [i for i, e in enumerate(energies) if e >= threshold]
+        if not voiced:
+            return array("h"), 0.0
+
+        frame_len = self.sample_rate * FRAME_MS // 1000
+        pad = self.sample_rate * self.trim_padding_ms // 1000
+        start = max(0, voiced[0] * frame_len - pad)
+        end = min(len(samples), (voiced[-1] + 1) * frame_len + pad)
+        return samples[start:end], len(voiced) * FRAME_MS / 1000
+
+    async def normalize(self, audio_bytes: bytes) -> Optional[NormalizedAudio]:
+        """
+        Returns None if the bytes cannot be decoded (malformed fragment).
+        An all-silent clip returns an empty ``NormalizedAudio``.
+        """
+        if not audio_bytes:
+            return None
+        try:
+            samples = await self.decode(audio_bytes)
+        except Exception as e:
+            print(f"⚠️ Audio normalization failed: {e}")
+            return None
+
+        trimmed, speech_seconds = await asyncio.to_thread(self.trim_silence, samples)
+        audio = NormalizedAudio(trimmed, self.sample_rate, len(samples), speech_seconds)
+        print(f"🎚️ Normalized audio: {audio.original_duration_seconds:.2f}s decoded → "
+              f"{audio.duration_seconds:.2f}s trimmed, {speech_seconds:.2f}s voiced "
+              f"({len(audio_bytes)} → {len(trimmed) * 2} bytes PCM)")
+        return audio
+
+
+audio_normalizer = AudioNormalizer()
@@ -0,0 +1,198 @@
+import copy
+import re
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.config.database import get_company_enrichment_collection
+from app.config.settings import settings
+from app.services.scraper import scraper
+from app.utils.helpers import current_timestamp
+
+# Field → TTL setting. Firmographics barely move; news and hiring go stale in a day.
+FIELD_TTLS = {
+    "tech_stack": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "wappalyzer_tech_stack": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "founded_year": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "headquarters": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "social_links": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "product_documentation": "COMPANY_CACHE_SLOW_TTL_SECONDS",
+    "company_size": "COMPANY_CACHE_MEDIUM_TTL_SECONDS",
+    "revenue": "COMPANY_CACHE_MEDIUM_TTL_SECONDS",
+    "industry": "COMPANY_CACHE_MEDIUM_TTL_SECONDS",
+    "description": "COMPANY_CACHE_MEDIUM_TTL_SECONDS",
+    "financial_statements": "COMPANY_CACHE_MEDIUM_TTL_SECONDS",
+    "latest_news": "COMPANY_CACHE_FAST_TTL_SECONDS",
+    "hiring_data": "COMPANY_CACHE_FAST_TTL_SECONDS",
+    "open_positions": "COMPANY_CACHE_FAST_TTL_SECONDS",
+    "customer_reviews": "COMPANY_CACHE_FAST_TTL_SECONDS",
+}
+
+# PageSpeed only yields tech_stack; every other field comes from the text sources + extraction
+PAGESPEED_FIELDS = {"tech_stack"}
+TEXT_SOURCES = {"website", "wikipedia", "ai_search"}
+
+
+class CompanyEnrichmentCacheService:
+    """
+    Shared cache of scraped company data, keyed by normalized domain.
+
+    One document per domain in ``company_enrichment_cache`` holds the
+    merged data, a fetched-at time per field and the website's HTTP
+    validators. Each field expires on its own TTL (FIELD_TTLS); a lookup
+    only re-runs the sources that feed stale fields, and the website is
+    revalidated with ETag / Last-Modified. A fully fresh entry is served
+    without any remote call.
+    """
+
+    @staticmethod
+    def normalize_domain(company_url: str) -> str:
+        """``https://WWW.Acme.com:443/about`` → ``acme.com``"""
+        url = company_url.strip().lower()
+        if "://" not in url:
+            url = f"https://{url}"
+        host = urlparse(url).hostname or ""
+        return re.sub(r"^www\.", "", host).rstrip(".")
+
+    @staticmethod
+    def stale_fields(doc: Optional[Dict[str, Any]], now=None) -> List[str]:
+        now = now or current_timestamp()
+        fetched = (doc or {}).get("field_fetched_at") or {}
+        stale = []
+        for field, ttl_setting in FIELD_TTLS.items():
+            fetched_at = fetched.get(field)
+            if fetched_at is None or now - fetched_at >= timedelta(seconds=getattr(settings, ttl_setting)):
+                stale.append(field)
+        return stale
+
+    @staticmethod
+    def sources_for(stale: List[str]) -> set:
+        sources = set()
+        if PAGESPEED_FIELDS & set(stale):
+            sources.add("pagespeed")
+        if set(stale) - PAGESPEED_FIELDS:
+            sources |= TEXT_SOURCES
+        return sources
+
+    @staticmethod
+    def merge(cached: Dict[str, Any], scraped: Dict[str, Any], refreshed: List[str]) -> Dict[str, Any]:
+        """Refreshed fields take the new value; a now-empty result keeps the last known one."""
+        data = copy.deepcopy(cached)
+        for field in refreshed:
+            if scraped.get(field) or field not in data:
+                data[field] = scraped.get(field)
+        sources = list(data.get("data_sources") or [])
+        data["data_sources"] = sources + [s for s in scraped.get("data_sources", []) if s not in sources]
+        data["data_source_timings"] = scraped.get("data_source_timings", {})
+        return data
+
+    async def cached(self, company_url: str) -> Optional[Dict[str, Any]]:
+        """The cached data if every field is still fresh, else None (never scrapes)."""
+        try:
+            doc = await get_company_enrichment_collection().find_one({"_id": self.normalize_domain(company_url)})
+        except Exception as e:
+            print(f"⚠️ Enrichment cache lookup failed: {e}")
+            return None
+        if doc and not self.stale_fields(doc):
+            return copy.deepcopy(doc["data"])
+        return None
+
+    async def get_or_scrape(
+        self,
+        company_url: str,
+        on_late_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        fresh: bool = False,
+        on_progress: Optional[Callable[[str, Dict[str, Any], Any], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Company data for this URL's domain: cached fields that are still
+        fresh, re-scraped ones that are not. ``fresh=True`` refetches all.
+        Cache failures fall back to a plain scrape.
+        """
+        domain = self.normalize_domain(company_url)
+        col = get_company_enrichment_collection()
+        try:
+            doc = None if fresh else await col.find_one({"_id": domain})
+        except Exception as e:
+            print(f"⚠️ Enrichment cache lookup failed: {e}")
+            return await scraper.scrape_company_data(
+                company_url, on_late_result=on_late_result, on_progress=on_progress
+            )
+
+        now = current_timestamp()
+        stale = list(FIELD_TTLS) if fresh else self.stale_fields(doc, now)
+        if doc and not stale:
+            print(f"⚡ Enrichment cache hit: {domain}")
+            try:
+                await col.update_one({"_id": domain}, {"$inc": {"hits": 1}, "$set": {"last_used_at": now}})
+            except Exception as e:
+                print(f"⚠️ Enrichment cache write failed: {e}")
+            return copy.deepcopy(doc["data"])
+
+        sources = self.sources_for(stale)
+        print(f"🔄 Enrichment cache {'refresh' if doc else 'miss'}: {domain} | "
+              f"{len(stale)} stale fields → {', '.join(sorted(sources))}")
+
+        async def merge_late(update: Dict[str, Any]):
+            # Keep the cache in step with a source that finished after the response;
+            # upsert, as on a miss it can land before the main document is written
+            if update.get("tech_stack"):
+                late_at = current_timestamp()
+                try:
+                    await col.update_one(
+                        {"_id": domain},
+                        {
+                            "$set": {"data.tech_stack": update["tech_stack"], "field_fetched_at.tech_stack": late_at},
+                            "$addToSet": {"data.data_sources": {"$each": update.get("data_sources", [])}},
+                            "$setOnInsert": {"created_at": late_at, "hits": 0}
+                        },
+                        upsert=True
+                    )
+                except Exception as e:
+                    print(f"⚠️ Enrichment cache write failed: {e}")
+            if on_late_result:
+                await on_late_result(update)
+
+        website_cache = dict((doc or {}).get("website") or {})
+        scraped = await scraper.scrape_company_data(
+            company_url,
+            on_late_result=merge_late,
+            sources=sources,
+            website_cache=website_cache,
+            on_progress=on_progress
+        )
+
+        # A source that was dropped or failed leaves its fields stale for the next lookup
+        timings = scraped.get("data_source_timings", {})
+        delivered = {name for name, t in timings.items() if t["status"] in ("ok", "empty")}
+        refreshed = [
+            field for field in stale
+            if (field in PAGESPEED_FIELDS and "pagespeed" in delivered)
+            or (field not in PAGESPEED_FIELDS and delivered & TEXT_SOURCES)
+        ]
+        data = self.merge((doc or {}).get("data") or {}, scraped, refreshed)
+
+        # Only the refreshed paths: replacing ``data`` would undo a late result written meanwhile
+        try:
+            await col.update_one(
+                {"_id": domain},
+                {
+                    "$set": {
+                        **{f"data.{field}": data.get(field) for field in refreshed},
+                        "data.data_source_timings": data["data_source_timings"],
+                        "website": website_cache,
+                        "last_used_at": now,
+                        "updated_at": now,
+                        **{f"field_fetched_at.{field}": now for field in refreshed}
+                    },
+                    "$addToSet": {"data.data_sources": {"$each": data["data_sources"]}},
+                    "$setOnInsert": {"created_at": now, "hits": 0}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠️ Enrichment cache write failed: {e}")
+        return data
+
+
+company_enrichment_cache_service = CompanyEnrichmentCacheService()
@@ -0,0 +1,157 @@
+"""
+Background company enrichment.
+
+``/api/company/create`` stores the company with ``enrichment_status: queued``
+and returns. A ``company_enrichment`` job then scrapes the company (through
+the enrichment cache) and writes into the company document as it goes:
+per-source status as each source finishes, PageSpeed's tech stack as soon
+as it arrives, and the extracted fields at the end. A failed attempt is
+``retrying`` until the queue gives up, which marks the company ``failed``.
+Clients poll ``GET /api/company/{id}/enrichment`` or follow its SSE stream.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config.database import get_company_collection
+from app.config.settings import settings
+from app.services.company_enrichment_cache_service import company_enrichment_cache_service
+from app.services.job_queue_service import job_queue_service
+from app.services.scraper import SOURCE_LABELS
+from app.utils.helpers import current_timestamp
+
+TERMINAL_STATES = {"complete", "failed", "skipped"}
+
+
+class CompanyEnrichmentService:
+    """Runs enrichment jobs, at most COMPANY_ENRICHMENT_CONCURRENCY at once per process."""
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, settings.COMPANY_ENRICHMENT_CONCURRENCY))
+        return self._semaphore
+
+    async def enqueue(self, company_id: str, company_url: str, refresh_cache: bool = False) -> str:
+        return await job_queue_service.enqueue(
+            "company_enrichment",
+            {"company_id": company_id, "company_url": company_url, "refresh_cache": refresh_cache},
+            dedupe_key=f"company_enrichment:{company_id}"
+        )
+
+    async def enqueue_many(self, companies: List[Tuple[str, str]], refresh_cache: bool = False) -> List[str]:
+        """Queue ``(company_id, company_url)`` pairs in one write (bulk import)."""
+        return await job_queue_service.enqueue_many("company_enrichment", [
+            (
+                {"company_id": company_id, "company_url": company_url, "refresh_cache": refresh_cache},
+                f"company_enrichment:{company_id}"
+            )
+            for company_id, company_url in companies
+        ])
+
+    async def _update(self, company_id: str, update: Dict[str, Any]):
+        update.setdefault("$set", {})["last_updated"] = current_timestamp()
+        await get_company_collection().update_one({"_id": company_id}, update)
+
+    async def run_job(self, payload: Dict[str, Any]):
+        """``company_enrichment`` job handler. Raises on failure so the queue retries."""
+        company_id = payload["company_id"]
+        async with self.semaphore:
+            await self._update(company_id, {"$set": {
+                "enrichment_status": "running",
+                "enrichment.started_at": current_timestamp(),
+                "enrichment.error": None
+            }})
+
+            async def on_progress(name: str, timing: Dict[str, Any], value: Any):
+                update: Dict[str, Any] = {"$set": {f"enrichment.sources.{name}": timing}}
+                tech_stack = (value or {}).get("tech_stack") if name == "pagespeed" else None
+                if tech_stack:
+                    update["$set"]["company_data.tech_stack"] = tech_stack
+                    update["$addToSet"] = {"company_data.data_sources": SOURCE_LABELS["pagespeed"]}
+                await self._update(company_id, update)
+
+            async def on_late_result(update: Dict[str, Any]):
+                await self._update(company_id, {
+                    "$set": {
+                        "company_data.tech_stack": update["tech_stack"],
+                        "company_data.data_source_timings": update["data_source_timings"],
+                        "enrichment.sources": update["data_source_timings"]
+                    },
+                    "$addToSet": {"company_data.data_sources": {"$each": update.get("data_sources", [])}}
+                })
+
+            try:
+                data = await company_enrichment_cache_service.get_or_scrape(
+                    payload["company_url"],
+                    on_late_result=on_late_result,
+                    fresh=payload.get("refresh_cache", False),
+                    on_progress=on_progress
+                )
+            except Exception as e:
+                # Not terminal: the queue retries, and mark_failed runs once it gives up
+                await self._update(company_id, {"$set": {
+                    "enrichment_status": "retrying",
+                    "enrichment.error": f"{type(e).__name__}: {e}"
+                }})
+                raise
+
+            # Field by field, so a tech stack written by on_progress is not replaced by an empty one
+            fields = {f"company_data.{key}": value for key, value in data.items()
+                      if value or key not in ("tech_stack", "data_sources")}
+            await self._update(company_id, {"$set": {
+                **fields,
+                "enrichment_status": "complete",
+                "enrichment.finished_at": current_timestamp()
+            }})
+            print(f"🏢 Company {company_id} enriched")
+
+    async def mark_failed(self, payload: Dict[str, Any], error: str):
+        """Failure handler for ``company_enrichment``: the queue will not retry."""
+        await self._update(payload["company_id"], {"$set": {
+            "enrichment_status": "failed",
+            "enrichment.error": error,
+            "enrichment.finished_at": current_timestamp()
+        }})
+        print(f"💀 Enrichment of company {payload['company_id']} failed: {error}")
+
+    async def get_status(self, company_id: str) -> Optional[Dict[str, Any]]:
+        company = await get_company_collection().find_one(
+            {"_id": company_id},
+            {"enrichment_status": 1, "enrichment": 1, "company_data": 1, "last_updated": 1}
+        )
+        if not company:
+            return None
+        return {
+            "company_id": company_id,
+            "enrichment_status": company.get("enrichment_status", "complete"),
+            "enrichment": company.get("enrichment", {}),
+            "company_data": company.get("company_data", {}),
+            "last_updated": company.get("last_updated"),
+        }
+
+    async def stream_events(self, company_id: str) -> AsyncIterator[str]:
+        """Server-sent events: a ``progress`` event per change, then ``done``."""
+        last_seen = None
+        deadline = asyncio.get_running_loop().time() + settings.COMPANY_ENRICHMENT_STREAM_MAX_SECONDS
+        while True:
+            status = await self.get_status(company_id)
+            if status is None:
+                yield "event: error\ndata: {\"detail\": \"Company not found\"}\n\n"
+                return
+            finished = status["enrichment_status"] in TERMINAL_STATES
+            if status["last_updated"] != last_seen or finished:
+                last_seen = status["last_updated"]
+                event = "done" if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(status, default=str)}\n\n"
+            if finished or asyncio.get_running_loop().time() > deadline:
+                return
+            await asyncio.sleep(settings.COMPANY_ENRICHMENT_POLL_SECONDS)
+
+
+company_enrichment_service = CompanyEnrichmentService()
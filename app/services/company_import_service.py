@@ -0,0 +1,278 @@
+"""
+Bulk company import.
+
+Takes a list of URLs (JSON or CSV), drops duplicate domains (within the
+import and against the salesperson's existing companies), validates the
+rest with bounded concurrency, writes companies with ``insert_many`` in
+batches and queues enrichment for them in one write per batch. Progress
+is yielded per row so the route can stream it as NDJSON.
+"""
+
+import asyncio
+import csv
+import io
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from app.config.database import get_company_collection
+from app.config.settings import settings
+from app.services.company_enrichment_cache_service import company_enrichment_cache_service
+from app.services.company_enrichment_service import company_enrichment_service
+from app.services.url_validator_service import url_validator
+from app.utils.helpers import current_timestamp, generate_id
+
+URL_COLUMNS = ("company_url", "url", "website", "domain")
+
+
+def build_company_document(
+    company_id: str,
+    salesperson_id: str,
+    original_url: str,
+    validation_result: Dict[str, Any],
+    company_data: Dict[str, Any],
+    enrichment_status: str,
+    **extra
+) -> Dict[str, Any]:
+    """The stored company document (shared by /create and bulk import)."""
+    return {
+        "_id": company_id,
+        "salesperson_id": salesperson_id,
+        "company_url": validation_result["authenticated_url"],  # Store authenticated URL
+        "original_url": original_url,  # Store original input
+        "url_validation": {
+            "is_valid": validation_result["is_valid"],
+            "ssl_valid": validation_result["ssl_valid"],
+            "ssl_certificate": validation_result["ssl_certificate"],
+            "validated_at": current_timestamp(),
+            "domain": validation_result["domain"]
+        },
+        "company_data": company_data,
+        "enrichment_status": enrichment_status,
+        "enrichment": {"sources": {}},
+        "created_at": current_timestamp(),
+        "last_updated": current_timestamp(),
+        **extra
+    }
+
+
+class CompanyImportService:
+    """Bulk company creation with deduplication, bounded validation and batched writes."""
+
+    def __init__(self):
+        self.max_rows = settings.COMPANY_IMPORT_MAX_ROWS
+        self.insert_batch_size = settings.COMPANY_IMPORT_INSERT_BATCH
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        col = get_company_collection()
+        await col.create_index([("salesperson_id", ASCENDING)])
+        await col.create_index([("import_id", ASCENDING)], sparse=True)
+        self._indexes_ready = True
+
+    @staticmethod
+    def parse_csv(text: str) -> List[str]:
+        """URLs from a CSV: the company_url / url / website / domain column, else the first column."""
+        rows = list(csv.reader(io.StringIO(text.lstrip("﻿"))))
+        if not rows:
+            return []
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = next((header.index(name) for name in URL_COLUMNS if name in header), None)
+        if column is None:
+            column, data = 0, rows  # no header row
+        else:
+            data = rows[1:]
+        return [row[column].strip() for row in data if len(row) > column and row[column].strip()]
+
+    async def _existing_domains(self, salesperson_id: str) -> Dict[str, str]:
+        existing = {}
+        cursor = get_company_collection().find({"salesperson_id": salesperson_id}, {"company_url": 1})
+        async for company in cursor:
+            domain = company_enrichment_cache_service.normalize_domain(company.get("company_url") or "")
+            if domain:
+                existing.setdefault(domain, company["_id"])
+        return existing
+
+    async def _write_batch(
+        self,
+        batch: List[Tuple[int, str, Dict[str, Any]]],
+        refresh_cache: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        insert_many (unordered) + one enrichment enqueue; returns a row event
+        per document. Never raises: a failed write or enqueue becomes
+        "failed" rows, so the stream always reaches its summary.
+        """
+        failed: Dict[int, str] = {}
+        try:
+            await get_company_collection().insert_many([doc for _, _, doc in batch], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = error.get("errmsg", "write failed")
+        except Exception as e:
+            print(f"❌ Import batch write failed: {e}")
+            failed = {i: f"Write failed: {e}" for i in range(len(batch))}
+
+        written = [doc for i, (_, _, doc) in enumerate(batch) if i not in failed]
+        queued = [(doc["_id"], doc["company_url"]) for doc in written if doc["enrichment_status"] == "queued"]
+        enqueue_error = None
+        if queued:
+            try:
+                await company_enrichment_service.enqueue_many(queued, refresh_cache)
+            except Exception as e:
+                print(f"❌ Could not queue enrichment for an import batch: {e}")
+                enqueue_error = f"Company saved but enrichment could not be queued: {e}"
+                try:
+                    await get_company_collection().update_many(
+                        {"_id": {"$in": [company_id for company_id, _ in queued]}},
+                        {"$set": {"enrichment_status": "failed", "enrichment.error": enqueue_error}}
+                    )
+                except Exception as e:
+                    print(f"⚠️ Could not mark enrichment as failed: {e}")
+
+        events = []
+        for i, (row, url, doc) in enumerate(batch):
+            if i in failed:
+                events.append({"type": "row", "row": row, "url": url, "status": "failed", "errors": [failed[i]]})
+            elif enqueue_error and doc["enrichment_status"] == "queued":
+                events.append({
+                    "type": "row", "row": row, "url": url, "status": "failed",
+                    "company_id": doc["_id"], "company_url": doc["company_url"],
+                    "enrichment_status": "failed", "errors": [enqueue_error]
+                })
+            else:
+                events.append({
+                    "type": "row", "row": row, "url": url, "status": "created",
+                    "company_id": doc["_id"], "company_url": doc["company_url"],
+                    "enrichment_status": doc["enrichment_status"]
+                })
+        return events
+
+    async def run_import(
+        self,
+        salesperson_id: str,
+        urls: List[str],
+        auto_fetch: bool = True,
+        refresh_cache: bool = False,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields ``{"type": "start"}``, one ``{"type": "row", "status": ...}``
+        per input row (created / duplicate / invalid / failed), then
+        ``{"type": "summary"}``. Companies are created as soon as their batch
+        is full; enrichment runs in the background job worker. The summary is
+        always sent: if the import stops early it carries the ``error`` and
+        how many rows were left ``unprocessed``.
+        """
+        import_id = generate_id()
+        started = time.perf_counter()
+        counts = {"created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+        error = None
+        yield {"type": "start", "import_id": import_id, "total": len(urls)}
+
+        try:
+            async for event in self._import_rows(import_id, salesperson_id, urls, auto_fetch, refresh_cache, concurrency):
+                counts[event["status"]] += 1
+                yield event
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"❌ Import {import_id} stopped: {error}")
+
+        elapsed = time.perf_counter() - started
+        print(f"📦 Import {import_id}: {counts['created']} created, {counts['duplicate']} duplicate, "
+              f"{counts['invalid']} invalid, {counts['failed']} failed in {elapsed:.1f}s")
+        summary = {"type": "summary", "import_id": import_id, "total": len(urls), **counts,
+                   "elapsed_seconds": round(elapsed, 2)}
+        if error:
+            summary.update({"error": error, "unprocessed": len(urls) - sum(counts.values())})
+        yield summary
+
+    async def _import_rows(
+        self,
+        import_id: str,
+        salesperson_id: str,
+        urls: List[str],
+        auto_fetch: bool,
+        refresh_cache: bool,
+        concurrency: Optional[int]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Deduplicate by domain before any network work
+        existing = await self._existing_domains(salesperson_id)
+        first_row: Dict[str, int] = {}
+        pending: List[Tuple[int, str]] = []
+        for row, url in enumerate(urls):
+            domain = company_enrichment_cache_service.normalize_domain(url) if url else ""
+            if not domain:
+                yield {"type": "row", "row": row, "url": url, "status": "invalid", "errors": ["Invalid URL format"]}
+            elif domain in existing:
+                yield {"type": "row", "row": row, "url": url, "status": "duplicate",
+                       "company_id": existing[domain], "reason": "Company already exists"}
+            elif domain in first_row:
+                yield {"type": "row", "row": row, "url": url, "status": "duplicate",
+                       "duplicate_of_row": first_row[domain], "reason": "Duplicate domain in import"}
+            else:
+                first_row[domain] = row
+                pending.append((row, url))
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.URL_VALIDATION_BATCH_CONCURRENCY))
+
+        async def validate(row: int, url: str):
+            async with semaphore:
+                try:
+                    return row, url, await url_validator.validate_and_authenticate_url(url)
+                except Exception as e:
+                    return row, url, {"is_valid": False, "errors": [f"Validation failed: {e}"], "warnings": []}
+
+        batch: List[Tuple[int, str, Dict[str, Any]]] = []
+        for next_result in asyncio.as_completed([validate(row, url) for row, url in pending]):
+            row, url, result = await next_result
+            if not result["is_valid"]:
+                yield {"type": "row", "row": row, "url": url, "status": "invalid",
+                       "errors": result["errors"], "warnings": result["warnings"]}
+                continue
+
+            company_data, enrichment_status = {}, "skipped"
+            if auto_fetch:
+                cached = None if refresh_cache else await company_enrichment_cache_service.cached(
+                    result["authenticated_url"]
+                )
+                company_data, enrichment_status = (cached, "complete") if cached else ({}, "queued")
+            batch.append((row, url, build_company_document(
+                generate_id(), salesperson_id, url, result, company_data, enrichment_status, import_id=import_id
+            )))
+
+            if len(batch) >= self.insert_batch_size:
+                for event in await self._write_batch(batch, refresh_cache):
+                    yield event
+                batch = []
+
+        if batch:
+            for event in await self._write_batch(batch, refresh_cache):
+                yield event
+
+    async def get_import_status(self, import_id: str) -> Optional[Dict[str, Any]]:
+        """Enrichment progress of an import's companies."""
+        companies = []
+        by_status: Dict[str, int] = {}
+        cursor = get_company_collection().find(
+            {"import_id": import_id},
+            {"company_url": 1, "enrichment_status": 1, "created_at": 1}
+        )
+        async for company in cursor:
+            status = company.get("enrichment_status", "complete")
+            by_status[status] = by_status.get(status, 0) + 1
+            companies.append({
+                "company_id": company["_id"],
+                "company_url": company.get("company_url"),
+                "enrichment_status": status
+            })
+        if not companies:
+            return None
+        return {"import_id": import_id, "total": len(companies), "enrichment": by_status, "companies": companies}
+
+
+company_import_service = CompanyImportService()
@@ -0,0 +1,180 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Lead words for question detection / classification (lowercase)
+OPEN_QUESTION_LEADS = (
+    "what", "why", "how", "tell me", "describe", "explain", "walk me through",
+    "help me understand", "in what way", "talk me through",
+)
+CLOSED_QUESTION_LEADS = (
+    "do", "does", "did", "is", "are", "was", "were", "can", "could", "will", "would",
+    "should", "shall", "have", "has", "had", "may", "might", "am", "when", "where",
+    "who", "which", "whose", "how many", "how much", "how long", "how often",
+    "isn't", "aren't", "don't", "doesn't", "didn't", "won't", "wouldn't", "can't", "couldn't",
+)
+
+_SENTENCE_RE = re.compile(r"[^.?!]+[.?!]*")
+_WORD_RE = re.compile(r"[A-Za-z0-9']+")
+
+
+class ConversationMetricsService:
+    """
+    Deterministic conversation metrics computed locally, per turn.
+
+    Counters are stored under ``metrics`` on the conversation document and
+    updated with ``$inc``/``$max`` in the same write that saves the turns,
+    so reading them never requires scanning the turn array or an LLM call.
+    """
+
+    # ── Lexical rules ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _starts_with(sentence: str, leads) -> Optional[str]:
+        lowered = sentence.lower().rstrip("?.! ")
+        for lead in sorted(leads, key=len, reverse=True):
+            if lowered == lead or lowered.startswith(lead + " ") or lowered.startswith(lead + ","):
+                return lead
+        return None
+
+    def classify_question(self, sentence: str) -> Optional[str]:
+        """Return "open", "closed" or None if the sentence is not a question."""
+        sentence = sentence.strip().strip('"\'')
+        if not sentence:
+            return None
+
+        # "how many/much/long" are closed even though "how" is an open lead
+        closed_lead = self._starts_with(sentence, CLOSED_QUESTION_LEADS)
+        open_lead = self._starts_with(sentence, OPEN_QUESTION_LEADS)
+        # A lead word only counts when the sentence has no other terminal
+        # punctuation: "Have a great day!" / "Tell me more." are not questions
+        is_question = sentence.endswith("?") or bool(closed_lead or open_lead) and sentence[-1] not in ".!"
+
+        if not is_question:
+            return None
+        if open_lead and not (closed_lead and len(closed_lead) > len(open_lead)):
+            return "open"
+        return "closed"
+
+    def split_sentences(self, text: str) -> List[str]:
+        return [s.strip() for s in _SENTENCE_RE.findall(text or "") if s.strip()]
+
+    def count_words(self, text: str) -> int:
+        return len(_WORD_RE.findall(text or ""))
+
+    # ── Per-turn metrics ─────────────────────────────────────────────────────
+
+    def turn_metrics(self, turn: Dict[str, Any]) -> Dict[str, Any]:
+        """Metrics for a single turn."""
+        text = turn.get("text", "")
+        open_q = closed_q = 0
+        if turn.get("speaker") == "salesperson":
+            for sentence in self.split_sentences(text):
+                kind = self.classify_question(sentence)
+                if kind == "open":
+                    open_q += 1
+                elif kind == "closed":
+                    closed_q += 1
+
+        return {
+            "words": self.count_words(text),
+            "duration_seconds": float(turn.get("duration_seconds") or 0.0),
+            "open_questions": open_q,
+            "closed_questions": closed_q,
+            "interrupted": bool(turn.get("interrupted")),
+        }
+
+    def build_update(self, turns: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Mongo update operators that fold ``turns`` into ``metrics``.
+        Merge into the turn-saving update with ``merge_update``.
+        """
+        inc: Dict[str, Any] = {}
+        maxes: Dict[str, Any] = {}
+
+        def add(field, value):
+            if value:
+                inc[f"metrics.{field}"] = inc.get(f"metrics.{field}", 0) + value
+
+        for turn in turns:
+            m = self.turn_metrics(turn)
+            if turn.get("speaker") == "salesperson":
+                add("salesperson_turns", 1)
+                add("salesperson_words", m["words"])
+                add("salesperson_speech_seconds", m["duration_seconds"])
+                add("questions_asked", m["open_questions"] + m["closed_questions"])
+                add("open_questions", m["open_questions"])
+                add("closed_questions", m["closed_questions"])
+                add("interruptions", 1 if m["interrupted"] else 0)
+                key = "metrics.longest_monologue_seconds"
+                maxes[key] = max(maxes.get(key, 0.0), m["duration_seconds"])
+                key = "metrics.longest_monologue_words"
+                maxes[key] = max(maxes.get(key, 0), m["words"])
+            else:
+                add("representative_turns", 1)
+                add("representative_words", m["words"])
+                add("representative_speech_seconds", m["duration_seconds"])
+
+        update: Dict[str, Dict[str, Any]] = {}
+        if inc:
+            update["$inc"] = inc
+        if maxes:
+            update["$max"] = maxes
+        return update
+
+    @staticmethod
+    def merge_update(update: Dict[str, Any], metrics_update: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge metrics operators into an existing update document (in place)."""
+        for op, fields in metrics_update.items():
+            update.setdefault(op, {}).update(fields)
+        return update
+
+    # ── Read side ────────────────────────────────────────────────────────────
+
+    def compute_from_turns(self, turns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rebuild stored counters from a turn list (sessions saved before metrics existed)."""
+        metrics: Dict[str, Any] = {}
+        update = self.build_update(turns)
+        for field, value in update.get("$inc", {}).items():
+            metrics[field.split(".", 1)[1]] = value
+        for field, value in update.get("$max", {}).items():
+            metrics[field.split(".", 1)[1]] = value
+        return metrics
+
+    def summarize(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        """Counters plus derived rates (WPM, talk ratio) for a conversation document."""
+        metrics = conversation.get("metrics")
+        if metrics is None:
+            metrics = self.compute_from_turns(conversation.get("turns", []))
+
+        sp_time = float(conversation.get("salesperson_talk_time", 0) or 0)
+        rep_time = float(conversation.get("representatives_talk_time", 0) or 0)
+        total_time = sp_time + rep_time
+        sp_speech = metrics.get("salesperson_speech_seconds", 0) or 0
+        rep_speech = metrics.get("representative_speech_seconds", 0) or 0
+        sp_turns = metrics.get("salesperson_turns", 0)
+        questions = metrics.get("questions_asked", 0)
+
+        return {
+            "questions_asked": questions,
+            "open_questions": metrics.get("open_questions", 0),
+            "closed_questions": metrics.get("closed_questions", 0),
+            "open_question_ratio": round(metrics.get("open_questions", 0) / questions * 100, 2) if questions else 0,
+            "salesperson_turns": sp_turns,
+            "representative_turns": metrics.get("representative_turns", 0),
+            "salesperson_words": metrics.get("salesperson_words", 0),
+            "representative_words": metrics.get("representative_words", 0),
+            "salesperson_wpm": round(metrics.get("salesperson_words", 0) / sp_speech * 60, 1) if sp_speech else 0,
+            "representative_wpm": round(metrics.get("representative_words", 0) / rep_speech * 60, 1) if rep_speech else 0,
+            "avg_salesperson_turn_seconds": round(sp_speech / sp_turns, 2) if sp_turns else 0,
+            "longest_monologue_seconds": round(metrics.get("longest_monologue_seconds", 0), 2),
+            "longest_monologue_words": metrics.get("longest_monologue_words", 0),
+            "interruptions": metrics.get("interruptions", 0),
+            "salesperson_talk_time": sp_time,
+            "representatives_talk_time": rep_time,
+            "total_duration": total_time,
+            "salesperson_talk_ratio": round(sp_time / total_time * 100, 2) if total_time else 0,
+            "representatives_talk_ratio": round(rep_time / total_time * 100, 2) if total_time else 0,
+        }
+
+
+conversation_metrics_service = ConversationMetricsService()
@@ -313,6 +313,9 @@ import logging
 from typing import Optional, Dict, Any
 
 from app.config.settings import settings
+from app.services.service_container import container
+from app.utils.audio_formats import AUDIO_FORMATS
+from app.services.tts_cache_service import tts_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -358,7 +361,8 @@ try:
     VoiceSettings = _VoiceSettings
     Voice = _Voice
 
-    client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+    # HTTP client is built on first use (or at startup) — not at import
+    client = container.register("elevenlabs", lambda: ElevenLabs(api_key=settings.ELEVENLABS_API_KEY))
     CLIENT_MODE = "new"
     logger.info("✅ Using ElevenLabs NEW SDK")
     print("✅ Using ElevenLabs NEW SDK")
@@ -393,6 +397,17 @@ except Exception as new_sdk_error:
         CLIENT_MODE = "none"
 
 
+# Used until the voice catalog has loaded (and when it can't be fetched)
+DEFAULT_VOICES = {
+    "voice_0": "21m00Tcm4TlvDq8ikWAM",
+    "voice_1": "AZnzlk1XvdvUeBnXmlld",
+    "voice_2": "EXAVITQu4vr4xnSDxMaL",
+    "voice_3": "ErXwobaYiN019PkySvjV",
+    "voice_4": "MF3mGyEYCl7XYWbV9V6O",
+    "voice_5": "TxGEqnHWrfWFTfGW9XjX",
+}
+
+
 # =====================================================
 # ElevenLabs Service
 # =====================================================
@@ -401,7 +416,8 @@ class ElevenLabsService:
     """Unified ElevenLabs TTS Service (NEW + OLD SDK supported)"""
 
     def __init__(self):
-        self.available_voices: Dict[str, str] = {}
+        # voice_N aliases; replaced from the voice catalog cache after startup
+        self.available_voices: Dict[str, str] = dict(DEFAULT_VOICES)
         self.default_voice_id = "21m00Tcm4TlvDq8ikWAM"
         self.api_key = settings.ELEVENLABS_API_KEY or ""
         # WebSocket streaming enabled only if we have API key and websockets package
@@ -411,32 +427,33 @@ class ElevenLabsService:
         except ImportError:
             print("⚠️ websockets package not found - install with: pip install websockets")
             self.enabled_ws = False
-        self._load_voices()
 
-    def _load_voices(self):
-        try:
-            if CLIENT_MODE == "new" and client:
-                all_voices = client.voices.get_all()
-                for i, v in enumerate(all_voices.voices[:10]):
-                    self.available_voices[f"voice_{i}"] = v.voice_id
-
-            elif CLIENT_MODE == "old" and voices:
-                all_voices = voices()
-                for i, v in enumerate(all_voices[:10]):
-                    self.available_voices[f"voice_{i}"] = v.voice_id
-
-        except Exception:
-            logger.warning("⚠️ Voice loading failed, using defaults")
-
-        if not self.available_voices:
-            self.available_voices = {
-                "voice_0": "21m00Tcm4TlvDq8ikWAM",
-                "voice_1": "AZnzlk1XvdvUeBnXmlld",
-                "voice_2": "EXAVITQu4vr4xnSDxMaL",
-                "voice_3": "ErXwobaYiN019PkySvjV",
-                "voice_4": "MF3mGyEYCl7XYWbV9V6O",
-                "voice_5": "TxGEqnHWrfWFTfGW9XjX",
-            }
+    def set_voice_catalog(self, catalog: list):
+        """Point the voice_N aliases at the first 10 catalog voices."""
+        aliases = {f"voice_{i}": v["voice_id"] for i, v in enumerate(catalog[:10]) if v.get("voice_id")}
+        self.available_voices = aliases or dict(DEFAULT_VOICES)
+
+    async def fetch_voices(self) -> list:
+        """Voice metadata straight from ElevenLabs (network call, run off the event loop)."""
+        if CLIENT_MODE == "new" and client:
+            result = await asyncio.to_thread(client.voices.get_all)
+            raw = result.voices
+        elif CLIENT_MODE == "old" and voices:
+            raw = await asyncio.to_thread(voices)
+        else:
+            return []
+
+        catalog = []
+        for v in raw:
+            labels = getattr(v, "labels", None) or {}
+            catalog.append({
+                "voice_id": v.voice_id,
+                "name": getattr(v, "name", None),
+                "category": getattr(v, "category", None),
+                "labels": dict(labels) if isinstance(labels, dict) else {},
+                "preview_url": getattr(v, "preview_url", None),
+            })
+        return catalog
 
     def _get_voice_settings(self, personality: str) -> VoiceSettings:
         """Get voice settings based on personality"""
@@ -488,16 +505,30 @@ class ElevenLabsService:
 
         return presets.get(personality.lower(), presets["neutral"])
 
+    @staticmethod
+    def _settings_key(settings_obj) -> Any:
+        """VoiceSettings as a plain dict (cache key component)."""
+        for method in ("model_dump", "dict"):
+            if callable(getattr(settings_obj, method, None)):
+                return getattr(settings_obj, method)()
+        return vars(settings_obj) if hasattr(settings_obj, "__dict__") else settings_obj
+
+    def supported_audio_formats(self) -> list:
+        """Output formats this SDK can produce (the old SDK only returns mp3)."""
+        return list(AUDIO_FORMATS) if CLIENT_MODE == "new" else ["mp3"]
+
     async def text_to_speech(
         self,
         text: str,
         voice_id: Optional[str] = None,
         personality: str = "neutral",
+        audio_format: str = "mp3",
     ) -> bytes:
         """
         Convert text to speech using ElevenLabs.
         ✅ Uses eleven_turbo_v2 for faster generation.
         ✅ Returns complete bytes in one call — no chunking.
+        ✅ ``audio_format``: "mp3", "opus" (Ogg) or "pcm" (raw s16le 16 kHz), see AUDIO_FORMATS.
         """
 
         if not text or not text.strip():
@@ -515,6 +546,18 @@ class ElevenLabsService:
 
         settings_obj = self._get_voice_settings(personality)
 
+        # Fixed fallback/filler lines come from the phrase cache
+        cache_key = None
+        if tts_cache_service.is_cacheable(text):
+            model_id = "eleven_turbo_v2_5" if CLIENT_MODE == "new" else "eleven_turbo_v2"
+            cache_key = tts_cache_service.build_key(
+                text, resolved_voice, model_id, self._settings_key(settings_obj), audio_format
+            )
+            cached = await tts_cache_service.get(cache_key)
+            if cached:
+                print(f"⚡ TTS cache hit: '{text[:40]}' | voice={resolved_voice}")
+                return cached
+
         print(f"🔊 TTS: '{text[:60]}...' | voice={resolved_voice} | personality={personality}")
 
         try:
@@ -529,7 +572,7 @@ class ElevenLabsService:
                     text=text,
                     voice_id=resolved_voice,
                     model_id="eleven_turbo_v2_5",
-                    output_format="mp3_22050_32",
+                    output_format=AUDIO_FORMATS[audio_format]["elevenlabs"],
                     voice_settings=settings_obj
                 )
 
@@ -562,6 +605,8 @@ class ElevenLabsService:
                 raise RuntimeError("ElevenLabs returned empty audio")
 
             print(f"✅ TTS complete: {len(audio_bytes)} bytes")
+            if cache_key:
+                await tts_cache_service.set(cache_key, audio_bytes, audio_format)
             return audio_bytes
 
         except Exception as e:
@@ -586,18 +631,10 @@ class ElevenLabsService:
         """Speech to text - Use OpenAI Whisper instead"""
         raise NotImplementedError("Use OpenAI Whisper for STT")
 
-    async def get_available_voices(self):
-        """Fetch all available voices from ElevenLabs"""
-        try:
-            if CLIENT_MODE == "new" and client:
-                result = await asyncio.to_thread(client.voices.get_all)
-                return result.voices
-            elif CLIENT_MODE == "old" and voices:
-                return await asyncio.to_thread(voices)
-            return []
-        except Exception as e:
-            logger.error(f"❌ Failed to fetch voices: {e}")
-            return []
+    async def get_available_voices(self) -> list:
+        """Voice metadata from the voice catalog cache (see voice_catalog_service)."""
+        from app.services.voice_catalog_service import voice_catalog_service
+        return await voice_catalog_service.get_voices()
             
     from typing import AsyncGenerator
     
@@ -606,6 +643,7 @@ class ElevenLabsService:
         sentences_stream,
         voice_id: Optional[str] = None,
         personality: str = "neutral",
+        audio_format: str = "mp3",
     ):
         """
         Consumes an async generator of sentences and yields audio chunks.
@@ -616,7 +654,8 @@ class ElevenLabsService:
                 audio_bytes = await self.text_to_speech(
                     text=sentence,
                     voice_id=voice_id,
-                    personality=personality
+                    personality=personality,
+                    audio_format=audio_format
                 )
                 if audio_bytes:
                     yield (sentence, audio_bytes)
@@ -629,6 +668,7 @@ class ElevenLabsService:
         token_stream,
         voice_id: Optional[str] = None,
         personality: str = "neutral",
+        audio_format: str = "mp3",
     ):
         """
         Ultra-low latency TTS using ElevenLabs WebSocket input streaming.
@@ -647,7 +687,8 @@ class ElevenLabsService:
             # Fallback to sentence-based TTS
             from app.utils.stream_helpers import sentence_buffer
             async for item in self.stream_tts_from_sentences(
-                sentence_buffer(token_stream), voice_id=voice_id, personality=personality
+                sentence_buffer(token_stream), voice_id=voice_id, personality=personality,
+                audio_format=audio_format
             ):
                 yield item
             return
@@ -663,7 +704,7 @@ class ElevenLabsService:
 
         uri = (
             f"wss://api.elevenlabs.io/v1/text-to-speech/{resolved_voice}"
-            f"/stream-input?model_id={model_id}&output_format=mp3_22050_32"
+            f"/stream-input?model_id={model_id}&output_format={AUDIO_FORMATS[audio_format]['elevenlabs']}"
         )
 
         full_text = ""
@@ -741,7 +782,8 @@ class ElevenLabsService:
                 audio_bytes = await self.text_to_speech(
                     text=full_text or "I understand.",
                     voice_id=voice_id,
-                    personality=personality
+                    personality=personality,
+                    audio_format=audio_format
                 )
                 if audio_bytes:
                     yield (full_text, audio_bytes)
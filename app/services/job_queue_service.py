@@ -0,0 +1,182 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config.database import get_job_collection
+from app.config.settings import settings
+from app.utils.helpers import generate_id, current_timestamp
+
+
+class JobQueueService:
+    """
+    Persistent job queue backed by the ``jobs`` MongoDB collection.
+
+    Lifecycle: queued → running (leased to one worker) → done | failed.
+    A running job whose lease expires (worker crashed or was redeployed)
+    becomes claimable again, so no job is lost. Failures are retried with
+    exponential backoff up to JOB_MAX_ATTEMPTS.
+    """
+
+    def __init__(self):
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+        self.retry_base_seconds = settings.JOB_RETRY_BASE_SECONDS
+        self.retry_max_seconds = settings.JOB_RETRY_MAX_SECONDS
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        col = get_job_collection()
+        await col.create_index([("status", ASCENDING), ("run_after", ASCENDING)])
+        await col.create_index([("status", ASCENDING), ("lease_until", ASCENDING)])
+        self._indexes_ready = True
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        delay_seconds: float = 0
+    ) -> str:
+        """
+        Add a job to the queue and return its id.
+        With ``dedupe_key`` the key becomes the job id, so enqueueing the
+        same work twice is a no-op.
+        """
+        job_doc = self._job_doc(job_type, payload, dedupe_key, delay_seconds)
+        job_id = job_doc["_id"]
+        try:
+            await get_job_collection().insert_one(job_doc)
+            print(f"📥 Enqueued job {job_type} ({job_id})")
+        except DuplicateKeyError:
+            print(f"⏭️ Job already queued: {job_id}")
+        return job_id
+
+    async def enqueue_many(self, job_type: str, jobs: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[str]:
+        """
+        Enqueue ``(payload, dedupe_key)`` pairs in one unordered ``insert_many``.
+        Keys that are already queued are skipped, as with ``enqueue``.
+        """
+        if not jobs:
+            return []
+        docs = [self._job_doc(job_type, payload, dedupe_key) for payload, dedupe_key in jobs]
+        try:
+            await get_job_collection().insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+        print(f"📥 Enqueued {len(docs)} {job_type} jobs")
+        return [doc["_id"] for doc in docs]
+
+    def _job_doc(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        delay_seconds: float = 0
+    ) -> Dict[str, Any]:
+        now = current_timestamp()
+        return {
+            "_id": dedupe_key or generate_id(),
+            "type": job_type,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "run_after": now + timedelta(seconds=delay_seconds),
+            "lease_until": None,
+            "worker_id": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None
+        }
+
+    async def claim(self, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically lease the next due job (or one whose lease expired)."""
+        now = current_timestamp()
+        query: Dict[str, Any] = {
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {"status": "running", "lease_until": {"$lt": now}},
+            ]
+        }
+        if job_types:
+            query["type"] = {"$in": job_types}
+
+        return await get_job_collection().find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_after", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def extend_lease(self, job_id: str, worker_id: str) -> bool:
+        """Heartbeat for long jobs. Returns False if the lease was lost."""
+        now = current_timestamp()
+        result = await get_job_collection().update_one(
+            {"_id": job_id, "status": "running", "worker_id": worker_id},
+            {"$set": {
+                "lease_until": now + timedelta(seconds=self.lease_seconds),
+                "updated_at": now
+            }}
+        )
+        return result.modified_count == 1
+
+    async def ack(self, job_id: str, worker_id: str):
+        now = current_timestamp()
+        await get_job_collection().update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {"$set": {
+                "status": "done",
+                "lease_until": None,
+                "finished_at": now,
+                "updated_at": now
+            }}
+        )
+
+    async def fail(self, job: Dict[str, Any], worker_id: str, error: str) -> bool:
+        """
+        Requeue with exponential backoff, or mark failed after max attempts.
+        Returns True when the job failed permanently (no retry follows).
+        """
+        now = current_timestamp()
+        attempts = job.get("attempts", 1)
+        permanent = attempts >= job.get("max_attempts", self.max_attempts)
+        update: Dict[str, Any] = {
+            "lease_until": None,
+            "last_error": error[:2000],
+            "updated_at": now
+        }
+
+        if permanent:
+            update.update({"status": "failed", "finished_at": now})
+            print(f"💀 Job {job['type']} ({job['_id']}) failed permanently after {attempts} attempts")
+        else:
+            backoff = self.backoff_seconds(attempts)
+            update.update({"status": "queued", "run_after": now + timedelta(seconds=backoff)})
+            print(f"🔁 Job {job['type']} ({job['_id']}) retry #{attempts} in {backoff:.0f}s")
+
+        await get_job_collection().update_one(
+            {"_id": job["_id"], "worker_id": worker_id},
+            {"$set": update}
+        )
+        return permanent
+
+    def backoff_seconds(self, attempts: int) -> float:
+        """Delay before retry number ``attempts`` (1-based)."""
+        return min(self.retry_base_seconds * (2 ** max(attempts - 1, 0)), self.retry_max_seconds)
+
+
+job_queue_service = JobQueueService()
@@ -372,13 +372,38 @@
 
 
 
-from openai import AsyncOpenAI
 from app.config.settings import settings
+from app.services.service_container import openai_client
 from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import re
 
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+client = openai_client  # built on first use
+
+# Returned when question generation fails — callers can compare against this
+# to avoid persisting a fallback as if it were a real generation.
+FALLBACK_TOP_QUESTIONS = [
+    "What are your biggest challenges?", "How does your current solution work?",
+    "What would success look like?", "What's your implementation timeline?",
+    "Who else needs to be part of this decision?"
+]
+
+# Fixed lines spoken when generation fails or comes back empty. They are
+# pre-rendered per voice by the TTS phrase cache (tts_cache_service).
+FALLBACK_RESPONSES = {
+    "angry": "Get to the point. What's the value here?",
+    "arrogant": "I've heard better pitches. What's actually different?",
+    "soft": "That sounds interesting. Could you tell us more?",
+    "cold_hearted": "Give me the numbers. That's all I need.",
+    "nice": "Thank you for sharing that. What else should we know?",
+    "analytical": "Can you provide specific metrics to support that?",
+    "neutral": "I see. Could you elaborate further?"
+}
+FALLBACK_DEFAULT_RESPONSE = "That's interesting. Please continue."
+FALLBACK_NO_REP_RESPONSE = "I understand. Could you elaborate?"
+STREAM_ERROR_RESPONSE = "That's an interesting point. Could you tell us more?"
+EMPTY_RESPONSE_TEXT = "I understand. Could you tell me more about that?"
 
 
 class OpenAIService:
@@ -573,7 +598,7 @@ CRITICAL CONVERSATION RULES:
 
         except Exception as e:
             print(f"❌ OpenAI stream error: {e}")
-            yield "That's an interesting point. Could you tell us more?"
+            yield STREAM_ERROR_RESPONSE
     
     def _validate_response(self, result: Dict[str, Any], representatives: List[Dict[str, Any]]) -> Dict[str, Any]:
         def find_rep(rep_id, rep_name):
@@ -596,7 +621,7 @@ CRITICAL CONVERSATION RULES:
             result["primary_rep_name"] = primary.get("name")
         
         if not result.get("primary_response"):
-            result["primary_response"] = "That's an interesting point. Could you tell us more?"
+            result["primary_response"] = STREAM_ERROR_RESPONSE
         
         secondary = find_rep(result.get("secondary_rep_id"), result.get("secondary_rep_name"))
         if secondary and secondary.get("id") == result.get("primary_rep_id"):
@@ -625,7 +650,7 @@ CRITICAL CONVERSATION RULES:
         if not representatives:
             return {
                 "primary_rep_id": "fallback", "primary_rep_name": "Representative",
-                "primary_response": "I understand. Could you elaborate?",
+                "primary_response": FALLBACK_NO_REP_RESPONSE,
                 "secondary_rep_id": None, "secondary_rep_name": None, "secondary_response": None,
                 "reasoning": "Fallback"
             }
@@ -641,19 +666,9 @@ CRITICAL CONVERSATION RULES:
         traits = primary.get("personality_traits", [])
         personality = traits[0].lower() if traits and isinstance(traits[0], str) else "neutral"
         
-        fallback_texts = {
-            "angry": "Get to the point. What's the value here?",
-            "arrogant": "I've heard better pitches. What's actually different?",
-            "soft": "That sounds interesting. Could you tell us more?",
-            "cold_hearted": "Give me the numbers. That's all I need.",
-            "nice": "Thank you for sharing that. What else should we know?",
-            "analytical": "Can you provide specific metrics to support that?",
-            "neutral": "I see. Could you elaborate further?"
-        }
-        
         return {
             "primary_rep_id": primary.get("id"), "primary_rep_name": primary.get("name"),
-            "primary_response": fallback_texts.get(personality, "That's interesting. Please continue."),
+            "primary_response": FALLBACK_RESPONSES.get(personality, FALLBACK_DEFAULT_RESPONSE),
             "secondary_rep_id": None, "secondary_rep_name": None, "secondary_response": None,
             "reasoning": f"Fallback — {personality}"
         }
@@ -735,30 +750,88 @@ Return ONLY valid JSON format: {{"questions": ["q1","q2","q3","q4","q5"]}}"""
             return questions[:5]
         except Exception as e:
             print(f"❌ Error generating questions: {e}")
-            return ["What are your biggest challenges?", "How does your current solution work?",
-                    "What would success look like?", "What's your implementation timeline?",
-                    "Who else needs to be part of this decision?"]
+            return list(FALLBACK_TOP_QUESTIONS)
 
     async def generate_conversation_analytics(
         self,
         conversation_history: List[Dict[str, Any]],
         salesperson_data: Dict[str, Any],
-        company_data: Dict[str, Any]
+        company_data: Dict[str, Any],
+        mode: str = "auto",
+        raise_errors: bool = False
     ) -> Dict[str, Any]:
-        """Generate comprehensive post-meeting analytics from the transcript."""
+        """
+        Generate comprehensive post-meeting analytics from the transcript.
+
+        mode: "single" sends the whole transcript in one request,
+              "map_reduce" analyzes token-bounded windows concurrently and merges them,
+              "auto" picks map_reduce once the transcript exceeds ANALYTICS_MAP_REDUCE_MIN_TOKENS.
+        raise_errors: raise on API or parse failures instead of returning empty
+              analytics (job handlers, so the queue retries).
+        """
         try:
-            # Build transcript string
-            transcript = "\n".join([
-                f"[{t.get('speaker_name', 'Unknown')}]: {t.get('text', '')}"
-                for t in conversation_history
-            ])
-            
-            if not transcript.strip():
+            lines = self._transcript_lines(conversation_history)
+            if mode == "map_reduce" or (
+                mode == "auto"
+                and self._estimate_tokens("\n".join(lines)) > settings.ANALYTICS_MAP_REDUCE_MIN_TOKENS
+            ):
+                return await self._map_reduce_analytics(lines, salesperson_data, company_data, raise_errors)
+
+            messages = self.build_analytics_messages(conversation_history, salesperson_data, company_data)
+            if not messages:
                 return self._empty_analytics()
 
-            system_prompt = f"""
+            print("🤖 Calling OpenAI for comprehensive analytics...")
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.3, # low temp for consistent analysis
+                response_format={"type": "json_object"}
+            )
+            
+            return self.parse_analytics_content(response.choices[0].message.content, strict=raise_errors)
+                
+        except Exception as e:
+            print(f"❌ Error generating analytics: {e}")
+            import traceback
+            traceback.print_exc()
+            if raise_errors:
+                raise
+            return self._empty_analytics()
+
+    def build_analytics_messages(
+        self,
+        conversation_history: List[Dict[str, Any]],
+        salesperson_data: Dict[str, Any],
+        company_data: Dict[str, Any]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Chat messages for the analytics request, or None for an empty transcript.
+        Shared by the live path and the Batch API backfill."""
+        transcript = "\n".join(self._transcript_lines(conversation_history))
+        
+        if not transcript.strip():
+            return None
+
+        return [
+            {"role": "system", "content": self._analytics_system_prompt(salesperson_data, company_data)},
+            {"role": "user", "content": f"TRANSCRIPT:\n\n{transcript}"}
+        ]
+
+    def _transcript_lines(self, conversation_history: List[Dict[str, Any]]) -> List[str]:
+        return [
+            f"[{t.get('speaker_name', 'Unknown')}]: {t.get('text', '')}"
+            for t in conversation_history
+        ]
+
+    def _analytics_system_prompt(
+        self,
+        salesperson_data: Dict[str, Any],
+        company_data: Dict[str, Any],
+        task: str = "Analyze the following sales conversation transcript."
+    ) -> str:
+        return f"""
 You are an expert Sales Manager and Conversation Analyst.
-Analyze the following sales conversation transcript.
+{task}
 
 SALESPERSON: {salesperson_data.get('name', 'Unknown')} selling {salesperson_data.get('product_name', 'Product')}
 COMPANY: {company_data.get('company_data', {}).get('industry', 'Unknown Industry')}
@@ -789,8 +862,6 @@ Return ONLY a valid JSON object matching exactly this structure:
     "sentiment": "Positive", // "Positive", "Neutral", "Negative"
     "sentiment_suggestion": "...", // Brief advice based on sentiment
     "active_listening_grade": "A+", // "A+", "A", "A-", "B+", "B", "C", "D"
-    "questions_asked": 18, // Total number of questions the salesperson asked
-    "open_questions": 14, // Number of open-ended questions the salesperson asked out of the total
     "topics_discussed": [
         "Pricing", "Implementation"
     ],
@@ -807,35 +878,142 @@ Return ONLY a valid JSON object matching exactly this structure:
     }}
 }}
 """
-            messages = [
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Cheap token estimate (~4 chars/token for English) — no tokenizer dependency."""
+        return len(text) // 4 + 1
+
+    def _split_transcript_windows(self, lines: List[str], window_tokens: int) -> List[str]:
+        """Greedily pack whole turns into windows of at most ``window_tokens``."""
+        windows, current, current_tokens = [], [], 0
+        for line in lines:
+            line_tokens = self._estimate_tokens(line)
+            if current and current_tokens + line_tokens > window_tokens:
+                windows.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += line_tokens
+        if current:
+            windows.append("\n".join(current))
+        return windows
+
+    async def _analyze_window(
+        self,
+        window: str,
+        index: int,
+        total: int,
+        salesperson_data: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Optional[Dict[str, Any]]:
+        """Map step: partial analysis of one transcript window with the cheaper model (None on failure)."""
+        prompt = f"""You are analyzing part {index + 1} of {total} of a sales conversation transcript.
+The salesperson is selling {salesperson_data.get('product_name', 'a product')}.
+Only report what is evidenced in THIS part.
+
+Return ONLY valid JSON:
+{{
+    "meddic": {{
+        "metrics": "evidence or null",
+        "economic_buyer": "evidence or null",
+        "decision_criteria": "evidence or null",
+        "decision_process": "evidence or null",
+        "identify_pain": "evidence or null",
+        "champion": "evidence or null"
+    }},
+    "sentiment": "Positive", // "Positive", "Neutral", "Negative"
+    "key_points": ["..."],
+    "topics_discussed": ["..."],
+    "risks": ["..."],
+    "opportunities": ["..."],
+    "next_steps": ["..."],
+    "salesperson_strengths": ["..."],
+    "salesperson_weaknesses": ["..."]
+}}"""
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(
+                    model=settings.ANALYTICS_MAP_MODEL,
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": f"TRANSCRIPT PART {index + 1}/{total}:\n\n{window}"}
+                    ],
+                    temperature=0.2,
+                    response_format={"type": "json_object"}
+                )
+                return json.loads(response.choices[0].message.content)
+            except Exception as e:
+                print(f"⚠️ Analytics window {index + 1}/{total} failed: {e}")
+                return None
+
+    async def _map_reduce_analytics(
+        self,
+        lines: List[str],
+        salesperson_data: Dict[str, Any],
+        company_data: Dict[str, Any],
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        windows = self._split_transcript_windows(lines, settings.ANALYTICS_WINDOW_TOKENS)
+        if not windows:
+            return self._empty_analytics()
+
+        print(f"🤖 Map-reduce analytics over {len(windows)} windows...")
+        semaphore = asyncio.Semaphore(settings.ANALYTICS_MAP_CONCURRENCY)
+        partials = await asyncio.gather(*[
+            self._analyze_window(w, i, len(windows), salesperson_data, semaphore)
+            for i, w in enumerate(windows)
+        ])
+        windows_failed = sum(1 for p in partials if p is None)
+        partials = [p for p in partials if p is not None]
+        if not partials:
+            if raise_errors:
+                raise Exception(f"All {len(windows)} analytics windows failed")
+            return self._empty_analytics()
+
+        system_prompt = self._analytics_system_prompt(
+            salesperson_data, company_data,
+            task=("You are given partial analyses of consecutive parts of ONE sales conversation, "
+                  "in order. Merge them into a single analysis of the whole conversation.")
+        )
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=[
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"TRANSCRIPT:\n\n{transcript}"}
-            ]
-            
-            print("🤖 Calling OpenAI for comprehensive analytics...")
-            response = await client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.3, # low temp for consistent analysis
-                response_format={"type": "json_object"}
-            )
-            
-            raw_content = response.choices[0].message.content
-            
+                {"role": "user", "content": f"PARTIAL ANALYSES:\n\n{json.dumps(partials, ensure_ascii=False)}"}
+            ],
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+        analytics = self.parse_analytics_content(response.choices[0].message.content, strict=raise_errors)
+        # The merge only saw the windows that succeeded: say so instead of passing it off as complete
+        analytics.update({
+            "windows_total": len(windows),
+            "windows_failed": windows_failed,
+            "partial": windows_failed > 0
+        })
+        if windows_failed:
+            print(f"⚠️ Analytics merged from {len(partials)}/{len(windows)} windows")
+        return analytics
+
+    def parse_analytics_content(self, raw_content: str, strict: bool = False) -> Dict[str, Any]:
+        """
+        Parse the model's JSON analytics, tolerating fenced code blocks.
+        Unparseable content gives empty analytics, or raises ValueError when
+        ``strict`` (callers that can retry instead of saving nothing).
+        """
+        try:
+            parsed = json.loads(raw_content)
+        except (json.JSONDecodeError, TypeError):
+            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_content or "", re.DOTALL)
             try:
-                result = json.loads(raw_content)
-                return result
+                parsed = json.loads(json_match.group(1)) if json_match else None
             except json.JSONDecodeError:
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_content, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(1))
-                return self._empty_analytics()
-                
-        except Exception as e:
-            print(f"❌ Error generating analytics: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._empty_analytics()
+                parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        if strict:
+            raise ValueError("Analytics response is not a JSON object")
+        return self._empty_analytics()
 
     def _empty_analytics(self) -> Dict[str, Any]:
         return {
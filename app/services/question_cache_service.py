@@ -0,0 +1,150 @@
+import hashlib
+import json
+import re
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING
+
+from app.config.database import get_question_cache_collection
+from app.config.settings import settings
+from app.services.openai_service import openai_service, FALLBACK_TOP_QUESTIONS
+from app.utils.helpers import current_timestamp
+
+
+class QuestionCacheService:
+    """
+    Shared cache for generated top-5 meeting questions.
+
+    Entries live in MongoDB so every worker sees the same cache. Each entry
+    expires after QUESTION_CACHE_TTL_SECONDS (TTL index on ``expires_at``) and
+    the collection is trimmed to QUESTION_CACHE_MAX_ENTRIES by evicting the
+    least recently used entries.
+    """
+
+    def __init__(self):
+        self.ttl_seconds = settings.QUESTION_CACHE_TTL_SECONDS
+        self.max_entries = settings.QUESTION_CACHE_MAX_ENTRIES
+        self._indexes_ready = False
+
+    @staticmethod
+    def _normalize(value: Any) -> str:
+        """Lowercase and collapse whitespace so trivial edits still hit."""
+        if value is None:
+            return ""
+        return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+    def build_cache_key(
+        self,
+        salesperson_data: Dict[str, Any],
+        company_data: Dict[str, Any],
+        meeting_goal: str
+    ) -> str:
+        """Hash of (product_name, description, industry, company_size, meeting_goal)"""
+        salesperson_data = salesperson_data or {}
+        company_info = (company_data or {}).get("company_data") or {}
+
+        key_fields = [
+            self._normalize(salesperson_data.get("product_name")),
+            self._normalize(salesperson_data.get("description")),
+            self._normalize(company_info.get("industry")),
+            self._normalize(company_info.get("company_size")),
+            self._normalize(meeting_goal),
+        ]
+        raw = json.dumps(key_fields, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def ensure_indexes(self):
+        """Create the TTL and LRU indexes once per process."""
+        if self._indexes_ready:
+            return
+        col = get_question_cache_collection()
+        await col.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        await col.create_index([("last_used_at", ASCENDING)])
+        self._indexes_ready = True
+
+    async def get(self, cache_key: str) -> Optional[List[str]]:
+        """Return cached questions (and bump recency) or None on a miss."""
+        now = current_timestamp()
+        col = get_question_cache_collection()
+        doc = await col.find_one_and_update(
+            # TTL monitor only runs every ~60s, so filter expired entries too
+            {"_id": cache_key, "expires_at": {"$gt": now}},
+            {"$set": {"last_used_at": now}, "$inc": {"hits": 1}}
+        )
+        if not doc:
+            return None
+        return doc.get("questions")
+
+    async def set(self, cache_key: str, questions: List[str]):
+        now = current_timestamp()
+        col = get_question_cache_collection()
+        await col.update_one(
+            {"_id": cache_key},
+            {
+                "$set": {
+                    "questions": questions,
+                    "last_used_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+        await self._evict_overflow()
+
+    async def _evict_overflow(self):
+        """Drop least recently used entries beyond max_entries."""
+        col = get_question_cache_collection()
+        overflow = await col.estimated_document_count() - self.max_entries
+        if overflow <= 0:
+            return
+
+        stale_ids = [
+            doc["_id"]
+            async for doc in col.find({}, {"_id": 1}).sort("last_used_at", ASCENDING).limit(overflow)
+        ]
+        if stale_ids:
+            await col.delete_many({"_id": {"$in": stale_ids}})
+            print(f"🧹 Question cache evicted {len(stale_ids)} entries")
+
+    async def get_or_generate(
+        self,
+        salesperson_data: Dict[str, Any],
+        company_data: Dict[str, Any],
+        meeting_goal: str,
+        fresh: bool = False
+    ) -> List[str]:
+        """
+        Return top questions for this meeting context, generating on a miss.
+        ``fresh=True`` skips the lookup but still refreshes the cached entry.
+        Cache failures never block meeting creation.
+        """
+        cache_key = self.build_cache_key(salesperson_data, company_data, meeting_goal)
+
+        if not fresh:
+            try:
+                cached = await self.get(cache_key)
+                if cached:
+                    print(f"⚡ Question cache hit: {cache_key[:12]}")
+                    return cached
+            except Exception as e:
+                print(f"⚠️ Question cache lookup failed: {e}")
+
+        questions = await openai_service.generate_top_questions(
+            salesperson_data=salesperson_data,
+            company_data=company_data,
+            meeting_goal=meeting_goal
+        )
+
+        # Don't cache the hard-coded fallback returned on OpenAI errors
+        if questions and questions != FALLBACK_TOP_QUESTIONS:
+            try:
+                await self.set(cache_key, questions)
+            except Exception as e:
+                print(f"⚠️ Question cache write failed: {e}")
+
+        return questions
+
+
+question_cache_service = QuestionCacheService()
@@ -442,10 +442,11 @@
 
 
 
-import boto3
 from botocore.exceptions import ClientError
 from app.config.settings import settings
+from app.services.service_container import container
 from typing import Optional
+import asyncio
 import uuid
 from datetime import datetime
 import io
@@ -456,36 +457,48 @@ class S3Service:
     """Handle file uploads/downloads to AWS S3"""
     
     def __init__(self):
-        self.enabled = False
-        self.s3_client = None
         self.bucket_name = settings.S3_BUCKET_NAME
-        
-        # Only initialize if credentials exist
-        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-            try:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION
-                )
-                # Test connection
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                self.enabled = True
-                print(f"✅ S3 Service initialized - Bucket: {self.bucket_name}")
-            except Exception as e:
-                print(f"⚠️ S3 Service initialization failed: {e}")
-                print(f"⚠️ Audio will NOT be saved to S3")
-                self.enabled = False
-        else:
+        # Client + head_bucket check run on first use (or at startup), not at import
+        self._client = container.register("s3", self._connect, required=False)
+    
+    def _connect(self):
+        """boto3 client after a bucket check, or None if S3 is not usable."""
+        if not (settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY):
             print("⚠️ S3 credentials not found - audio will not be saved to S3")
+            return None
+        try:
+            import boto3
+            s3_client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION
+            )
+            # Test connection
+            s3_client.head_bucket(Bucket=self.bucket_name)
+            print(f"✅ S3 Service initialized - Bucket: {self.bucket_name}")
+            return s3_client
+        except Exception as e:
+            print(f"⚠️ S3 Service initialization failed: {e}")
+            print(f"⚠️ Audio will NOT be saved to S3")
+            return None
+    
+    @property
+    def s3_client(self):
+        return self._client.get()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.s3_client is not None
     
     async def upload_audio(
         self,
         audio_bytes: bytes,
         meeting_id: str,
         turn_number: int,
-        speaker: str
+        speaker: str,
+        content_type: str = 'audio/mpeg',
+        extension: str = 'mp3'
     ) -> Optional[str]:
         
         if not self.enabled:
@@ -493,14 +506,14 @@ class S3Service:
             return None
         
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"meetings/{meeting_id}/turns/turn_{turn_number:04d}_{speaker}_{timestamp}.mp3"
+        filename = f"meetings/{meeting_id}/turns/turn_{turn_number:04d}_{speaker}_{timestamp}.{extension}"
         
         try:
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=filename,
                 Body=audio_bytes,
-                ContentType='audio/mpeg',
+                ContentType=content_type,
                 Metadata={
                     'meeting_id': meeting_id,
                     'turn_number': str(turn_number),
@@ -560,7 +573,9 @@ class S3Service:
     async def upload_full_meeting_audio(
         self,
         audio_bytes: bytes,
-        meeting_id: str
+        meeting_id: str,
+        content_type: str = 'audio/mpeg',
+        extension: str = 'mp3'
     ) -> Optional[str]:
         
         if not self.enabled:
@@ -568,14 +583,14 @@ class S3Service:
             return None
         
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"meetings/{meeting_id}/full_meeting_{timestamp}.mp3"
+        filename = f"meetings/{meeting_id}/full_meeting_{timestamp}.{extension}"
         
         try:
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=filename,
                 Body=audio_bytes,
-                ContentType='audio/mpeg',
+                ContentType=content_type,
                 Metadata={
                     'meeting_id': meeting_id,
                     'type': 'full_recording'
@@ -590,6 +605,35 @@ class S3Service:
             print(f"❌ Error uploading full meeting audio: {e}")
             return None
     
+    async def put_object_bytes(self, key: str, data: bytes, content_type: str) -> bool:
+        """Store bytes under a fixed key (cache objects). Runs off the event loop."""
+        if not self.enabled:
+            return False
+        try:
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.bucket_name, Key=key, Body=data, ContentType=content_type
+            )
+            return True
+        except ClientError as e:
+            print(f"❌ Error writing {key} to S3: {e}")
+            return False
+    
+    async def get_object_bytes(self, key: str) -> Optional[bytes]:
+        """Bytes stored under ``key``, or None if missing / S3 disabled."""
+        if not self.enabled:
+            return None
+        
+        def _get():
+            return self.s3_client.get_object(Bucket=self.bucket_name, Key=key)['Body'].read()
+        
+        try:
+            return await asyncio.to_thread(_get)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                print(f"❌ Error reading {key} from S3: {e}")
+            return None
+    
     async def download_file(self, s3_url: str) -> Optional[bytes]:
         
         if not self.enabled:
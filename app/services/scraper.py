@@ -1,21 +1,56 @@
 
+import asyncio
 import os
+import time
 import httpx
-from bs4 import BeautifulSoup
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 import re
 import json
 from app.config.settings import settings
-from openai import AsyncOpenAI
+from app.utils.html_text import extract_visible_text
+from app.services.site_crawler import site_crawler
+from app.services.service_container import openai_client
+
+SOURCE_LABELS = {
+    "website": "Company Website",
+    "pagespeed": "PageSpeed API",
+    "wikipedia": "Wikipedia",
+    "ai_search": "OpenAI Web Search",
+}
 
 
 class CompanyScraper:
     """AI-powered company data scraper (OpenAI Web Search Version)"""
 
     def __init__(self):
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+        self.openai_client = openai_client if settings.OPENAI_API_KEY else None
+        # The loop only keeps weak references to tasks: hold late deliveries until they finish
+        self._late_tasks: Set[asyncio.Task] = set()
 
-    async def scrape_company_data(self, company_url: str) -> Dict[str, Any]:
+    async def scrape_company_data(
+        self,
+        company_url: str,
+        on_late_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        sources: Optional[Set[str]] = None,
+        website_cache: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[str, Dict[str, Any], Any], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch all sources concurrently and extract company data.
+
+        Latency is bounded by the slowest text source (website, Wikipedia,
+        web search — each capped by its SCRAPER_*_TIMEOUT) and by
+        SCRAPER_TOTAL_BUDGET_SECONDS overall. PageSpeed is not needed for
+        extraction: if it is still running at the end it is handed to
+        ``on_late_result`` (called with the fields to merge) or dropped.
+        Per-source status and timing are returned in ``data_source_timings``.
+
+        ``sources`` limits which sources run (default: all, see SOURCE_LABELS).
+        ``website_cache`` holds the previous fetch's validators and text; the
+        website is then fetched conditionally and the dict updated in place.
+        ``on_progress(name, timing, value)`` is awaited as each source finishes.
+        """
+        sources = set(SOURCE_LABELS) if sources is None else sources
 
         domain = company_url.replace("https://", "").replace("http://", "").split("/")[0]
         company_name = self._extract_company_name(domain)
@@ -37,30 +72,42 @@ class CompanyScraper:
         print(f"🔍 Scraping: {domain} ({company_name})")
         print(f"{'='*60}\n")
 
-        # Step 1: Website scraping
-        print("📌 Step 1: Scraping website content...")
-        raw_content = await self._scrape_website_content(company_url)
-
-        if raw_content:
-            company_data["data_sources"].append("Company Website")
-
-        # Step 2: Tech stack
-        print("\n📌 Step 2: Fetching tech stack...")
-        tech_data = await self._fetch_from_pagespeed(company_url)
-        company_data["tech_stack"] = tech_data.get("tech_stack", [])
-        if company_data["tech_stack"]:
-            company_data["data_sources"].append("PageSpeed API")
-
-        # Step 3: Wikipedia + OpenAI Web Search
-        print("\n📌 Step 3: Wikipedia + OpenAI Web Search...")
-
-        wiki_content = await self._fetch_wikipedia(company_name)
-        if wiki_content:
-            company_data["data_sources"].append("Wikipedia")
-
-        ai_search_results = await self._fetch_ai_search_results(company_name, domain)
-        if ai_search_results:
-            company_data["data_sources"].append("OpenAI Web Search")
+        # Steps 1-3: independent sources fetched concurrently, each with its own deadline
+        print("📌 Steps 1-3: Website, PageSpeed, Wikipedia and OpenAI Web Search (concurrent)...")
+        timings: Dict[str, Dict[str, Any]] = {}
+        fetchers = {
+            "website": lambda: self._scrape_website_content(company_url, website_cache),
+            "pagespeed": lambda: self._fetch_from_pagespeed(company_url),
+            "wikipedia": lambda: self._fetch_wikipedia(company_name),
+            "ai_search": lambda: self._fetch_ai_search_results(company_name, domain),
+        }
+        tasks = {
+            name: asyncio.create_task(self._run_source(name, fetch(), timings, on_progress))
+            for name, fetch in fetchers.items() if name in sources
+        }
+        company_data["data_source_timings"] = timings
+
+        # Extraction needs the text sources; PageSpeed only feeds tech_stack
+        text_sources = [tasks[name] for name in ("website", "wikipedia", "ai_search") if name in tasks]
+        late = set()
+        if text_sources:
+            _, late = await asyncio.wait(text_sources, timeout=settings.SCRAPER_TOTAL_BUDGET_SECONDS)
+        for name, task in tasks.items():
+            if task in late:
+                task.cancel()
+                timings[name] = self._timing(name, "dropped", settings.SCRAPER_TOTAL_BUDGET_SECONDS)
+                print(f"  ⏱️ {SOURCE_LABELS[name]} dropped (over {settings.SCRAPER_TOTAL_BUDGET_SECONDS:.0f}s budget)")
+
+        def result(name):
+            task = tasks.get(name)
+            return task.result() if task and task.done() and not task.cancelled() else None
+
+        raw_content = result("website") or ""
+        wiki_content = result("wikipedia") or ""
+        ai_search_results = result("ai_search") or ""
+        for name, content in (("website", raw_content), ("wikipedia", wiki_content), ("ai_search", ai_search_results)):
+            if content:
+                company_data["data_sources"].append(SOURCE_LABELS[name])
 
         # Step 4: AI extraction
         if self.openai_client and (raw_content or ai_search_results or wiki_content):
@@ -85,6 +132,19 @@ class CompanyScraper:
             basic_data = await self._basic_extraction(raw_content)
             self._merge_data(company_data, basic_data, "Basic Extraction")
 
+        # PageSpeed usually finishes during extraction; if not, merge it later or drop it
+        pagespeed = tasks.get("pagespeed")
+        if pagespeed and pagespeed.done():
+            self._apply_pagespeed(company_data, pagespeed.result() if not pagespeed.cancelled() else None)
+        elif pagespeed and on_late_result:
+            timings["pagespeed"] = self._timing("pagespeed", "pending", None)
+            late = asyncio.create_task(self._deliver_late("pagespeed", pagespeed, timings, on_late_result))
+            self._late_tasks.add(late)
+            late.add_done_callback(self._late_tasks.discard)
+        elif pagespeed:
+            pagespeed.cancel()
+            timings["pagespeed"] = self._timing("pagespeed", "dropped", None)
+
         print(f"\n{'='*60}")
         print(f"✅ Data Collection Complete!")
         print(f"📊 Sources: {', '.join(company_data['data_sources'])}")
@@ -93,6 +153,52 @@ class CompanyScraper:
 
         return company_data
 
+    @staticmethod
+    def _timing(name: str, status: str, elapsed: Optional[float]) -> Dict[str, Any]:
+        return {
+            "source": SOURCE_LABELS[name],
+            "status": status,
+            "elapsed_ms": round(elapsed * 1000) if elapsed is not None else None
+        }
+
+    async def _run_source(self, name: str, coro, timings: Dict[str, Dict[str, Any]], on_progress=None):
+        """Await one source under its own deadline; never raises (None on failure)."""
+        started = time.perf_counter()
+        timeout = getattr(settings, f"SCRAPER_{name.upper()}_TIMEOUT_SECONDS")
+        try:
+            value = await asyncio.wait_for(coro, timeout=timeout)
+            status = "ok" if value and (not isinstance(value, dict) or value.get("tech_stack")) else "empty"
+        except asyncio.TimeoutError:
+            value, status = None, "timeout"
+            print(f"  ⏱️ {SOURCE_LABELS[name]} timed out after {timeout:.0f}s")
+        except Exception as e:
+            value, status = None, "error"
+            print(f"  ⚠️ {SOURCE_LABELS[name]} failed: {e}")
+        timings[name] = self._timing(name, status, time.perf_counter() - started)
+        if on_progress:
+            try:
+                await on_progress(name, timings[name], value)
+            except Exception as e:
+                print(f"  ⚠️ Progress update for {SOURCE_LABELS[name]} failed: {e}")
+        return value
+
+    def _apply_pagespeed(self, company_data: Dict[str, Any], tech_data: Optional[Dict[str, Any]]):
+        company_data["tech_stack"] = (tech_data or {}).get("tech_stack", [])
+        if company_data["tech_stack"]:
+            company_data["data_sources"].append(SOURCE_LABELS["pagespeed"])
+
+    async def _deliver_late(self, name, task, timings, on_late_result):
+        tech_data = await task
+        tech_stack = (tech_data or {}).get("tech_stack", [])
+        update = {"data_source_timings": timings, "tech_stack": tech_stack}
+        if tech_stack:
+            update["data_sources"] = [SOURCE_LABELS[name]]
+        try:
+            await on_late_result(update)
+            print(f"  🔁 {SOURCE_LABELS[name]} merged late ({len(tech_stack)} technologies)")
+        except Exception as e:
+            print(f"  ⚠️ Could not merge late {SOURCE_LABELS[name]} result: {e}")
+
     def _extract_company_name(self, domain: str) -> str:
         name = domain.replace("www.", "").split(".")[0]
         return name.title()
@@ -114,24 +220,42 @@ class CompanyScraper:
         filled = sum(1 for field in fields if data.get(field))
         return round((filled / len(fields)) * 100)
 
-    async def _scrape_website_content(self, company_url: str) -> str:
+    async def _scrape_website_content(self, company_url: str, website_cache: Optional[Dict[str, Any]] = None) -> str:
+        headers = {"User-Agent": "Mozilla/5.0"}
+        # Conditional revalidation: an unchanged page costs a 304, not a download + parse
+        if website_cache and website_cache.get("content"):
+            if website_cache.get("etag"):
+                headers["If-None-Match"] = website_cache["etag"]
+            if website_cache.get("last_modified"):
+                headers["If-Modified-Since"] = website_cache["last_modified"]
         try:
             async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(
-                    company_url,
-                    headers={"User-Agent": "Mozilla/5.0"}
-                )
+                async with client.stream("GET", company_url, headers=headers) as response:
+                    if response.status_code == 304 and website_cache:
+                        print("  📄 Website unchanged (304) — reusing cached content")
+                        return website_cache["content"]
+
+                    if response.status_code == 200:
+                        # Stops reading once enough visible text is collected
+                        links: List[str] = []
+                        content = await extract_visible_text(
+                            response.aiter_bytes(),
+                            content_type=response.headers.get("content-type"),
+                            max_chars=3000,
+                            max_bytes=settings.SCRAPER_WEBSITE_MAX_BYTES,
+                            links=links
+                        )
+                        etag = response.headers.get("etag")
+                        last_modified = response.headers.get("last-modified")
+                        base_url = str(response.url)
 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-
-                    for tag in soup(["script", "style", "noscript", "nav", "footer"]):
-                        tag.decompose()
-
-                    text_content = soup.get_text(separator=" ", strip=True)
-                    content = text_content[:3000]
-
                     print(f"  📄 Extracted {len(content)} characters from website")
+                    # About / careers / pricing / press pages feed the extraction too
+                    pages = await site_crawler.crawl(client, base_url, links)
+                    content = site_crawler.combine(content, pages)
+                    if website_cache is not None:
+                        website_cache.update({"etag": etag, "last_modified": last_modified, "content": content})
                     return content
 
         except Exception as e:
@@ -218,7 +342,7 @@ Return a detailed plain text summary.
         try:
             combined_content = f"""
 Website Content:
-{website_content[:2000]}
+{website_content[:6000]}
 
 Wikipedia Content:
 {wiki_content[:1500]}
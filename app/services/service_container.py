@@ -0,0 +1,131 @@
+"""
+Lazily built external clients.
+
+Importing a service module must not construct vendor clients or touch
+the network. Each client is registered here with a factory; it is built
+on first attribute access, or all at once in parallel by ``container.start()``
+during app startup (lifespan). ``container.readiness()`` backs /health/ready.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from openai import AsyncOpenAI
+
+from app.config.settings import settings
+
+_MISSING = object()
+
+
+class LazyService:
+    """Proxy that builds the wrapped client on first use (thread-safe, built once)."""
+
+    def __init__(self, name: str, factory: Callable[[], Any], required: bool = True):
+        self._name = name
+        self._factory = factory
+        self._required = required
+        self._value = _MISSING
+        self._error: Optional[str] = None
+        self._init_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._value is not _MISSING
+
+    def get(self) -> Any:
+        if self._value is _MISSING:
+            with self._lock:
+                if self._value is _MISSING:
+                    started = time.perf_counter()
+                    try:
+                        self._value = self._factory()
+                        self._error = None
+                    except Exception as e:
+                        self._error = f"{type(e).__name__}: {e}"
+                        raise
+                    finally:
+                        self._init_seconds = time.perf_counter() - started
+        return self._value
+
+    def __getattr__(self, item):
+        return getattr(self.get(), item)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.built,
+            "available": self.built and self._value is not None,
+            "required": self._required,
+            "init_ms": round(self._init_seconds * 1000, 1) if self._init_seconds is not None else None,
+            "error": self._error,
+        }
+
+
+class ServiceContainer:
+    """Registry of lazily built clients plus async warm-up hooks."""
+
+    def __init__(self):
+        self.services: Dict[str, LazyService] = {}
+        self.warmups: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.warmup_tasks: Dict[str, asyncio.Task] = {}
+        self.started = False
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = True) -> LazyService:
+        """Register a client factory (idempotent: the first registration wins)."""
+        if name not in self.services:
+            self.services[name] = LazyService(name, factory, required)
+        return self.services[name]
+
+    def register_warmup(self, name: str, hook: Callable[[], Awaitable[Any]]):
+        """Async hook run in the background after startup (model loads, cache fills)."""
+        self.warmups[name] = hook
+
+    async def start(self):
+        """Build every registered client in parallel; failures are recorded, not raised."""
+        async def build(service: LazyService):
+            try:
+                await asyncio.to_thread(service.get)
+            except Exception as e:
+                print(f"⚠️ Could not initialise {service._name}: {e}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(build(s) for s in self.services.values()))
+        self.started = True
+        print(f"🧩 Services ready in {time.perf_counter() - started:.2f}s: {', '.join(self.services)}")
+
+    def start_warmups(self):
+        for name, hook in self.warmups.items():
+            self.warmup_tasks[name] = asyncio.create_task(hook())
+
+    async def stop_warmups(self):
+        for task in self.warmup_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.warmup_tasks.values(), return_exceptions=True)
+
+    def _warmup_state(self, name: str) -> str:
+        task = self.warmup_tasks.get(name)
+        if task is None:
+            return "pending"
+        if not task.done():
+            return "running"
+        if task.cancelled() or task.exception() is not None:
+            return "failed"
+        return "done"
+
+    def readiness(self) -> Dict[str, Any]:
+        """Required clients gate readiness; warm-ups (caches, models) are informational."""
+        statuses = {name: service.status() for name, service in self.services.items()}
+        ready = self.started and all(s["ready"] for s in statuses.values() if s["required"])
+        return {
+            "ready": ready,
+            "services": statuses,
+            "warmups": {name: self._warmup_state(name) for name in self.warmups},
+        }
+
+
+container = ServiceContainer()
+
+# Shared by the conversation service, hosted STT and the scraper (one connection pool)
+openai_client = container.register("openai", lambda: AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
@@ -0,0 +1,193 @@
+"""
+Post-session background jobs.
+
+These run in the job worker (app/workers/job_worker.py), not in the API
+process. Handlers raise on failure so the job queue can retry them.
+"""
+
+import asyncio
+import os
+import subprocess
+import tempfile
+from typing import Any, Dict
+
+from app.config.database import (
+    get_conversation_collection, get_meeting_collection,
+    get_salesperson_collection, get_company_collection
+)
+from app.services.conversation_metrics_service import conversation_metrics_service
+from app.services.openai_service import openai_service
+from app.services.s3_service import s3_service
+from app.config.settings import settings
+from app.utils.audio_formats import ARCHIVE_FORMATS
+
+
+def attach_session_stats(analytics: Dict[str, Any], conv: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine AI analytics (qualitative fields) with the deterministic metrics
+    of a session — question counts, talk ratios, WPM, monologues.
+    """
+    metrics = conversation_metrics_service.summarize(conv)
+    analytics.update(metrics)
+    analytics.update({
+        "total_turns": conv.get("total_turns", 0),
+        "ai_turns": metrics["representative_turns"],
+    })
+    return analytics
+
+
+async def generate_and_save_analytics(payload: Dict[str, Any]):
+    """Job ``session_analytics``: generate and save AI analytics for a session."""
+    session_id = payload["session_id"]
+    conv_col = get_conversation_collection()
+    conv = await conv_col.find_one({"session_id": session_id})
+    if not conv or not conv.get("turns"):
+        print(f"⏭️ Skipping analytics for {session_id} - no conversation data")
+        return
+    if "analytics" in conv:
+        print(f"⏭️ Analytics already saved for {session_id}")
+        return
+
+    meeting = await get_meeting_collection().find_one({"_id": conv["meeting_id"]})
+    if not meeting:
+        print(f"⏭️ Skipping analytics for {session_id} - meeting not found")
+        return
+
+    print(f"📊 Starting AI analytics for session {session_id}...")
+    salesperson = await get_salesperson_collection().find_one({"_id": meeting["salesperson_id"]})
+    company = await get_company_collection().find_one({"_id": meeting["company_id"]})
+
+    analytics_result = await openai_service.generate_conversation_analytics(
+        conversation_history=conv["turns"],
+        salesperson_data=salesperson or {},
+        company_data=company or {},
+        raise_errors=True  # a failed call is retried by the queue, never saved as empty analytics
+    )
+    attach_session_stats(analytics_result, conv)
+
+    await conv_col.update_one(
+        {"session_id": session_id},
+        {"$set": {"analytics": analytics_result}}
+    )
+    print(f"✅ AI Analytics completed and saved for session {session_id}")
+
+
+def _merge_segments_ffmpeg(segment_files: list, archive_format: str = "mp3") -> bytes:
+    """
+    Convert every segment to the archive format (handles mixed webm/mp3/ogg/wav
+    turns, whatever each client streamed) and concatenate.
+    """
+    import imageio_ffmpeg
+
+    ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
+    archive = ARCHIVE_FORMATS[archive_format]
+    suffix = f".{archive['extension']}"
+    sample_rate = "48000" if archive_format == "opus" else "22050"
+    converted_files = []
+    try:
+        for src in segment_files:
+            dst = tempfile.NamedTemporaryFile(delete=False, suffix=suffix).name
+            conv_cmd = [ffmpeg_exe, "-y", "-i", src, *archive["codec_args"], "-ar", sample_rate, "-ac", "1", dst]
+            conv_res = subprocess.run(conv_cmd, capture_output=True, text=True)
+            if conv_res.returncode == 0:
+                converted_files.append(dst)
+            else:
+                os.remove(dst)
+                print(f"⚠️ Could not convert segment, skipping: {conv_res.stderr[:200]}")
+
+        if not converted_files:
+            raise Exception(f"No segments could be converted to {archive_format}")
+
+        if len(converted_files) == 1:
+            with open(converted_files[0], 'rb') as f:
+                return f.read()
+
+        out_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix).name
+        try:
+            cmd = [ffmpeg_exe, "-y"]
+            for f in converted_files:
+                cmd.extend(["-i", f])
+            filter_str = "".join([f"[{i}:a]" for i in range(len(converted_files))])
+            filter_str += f"concat=n={len(converted_files)}:v=0:a=1[out]"
+            cmd.extend(["-filter_complex", filter_str, "-map", "[out]", *archive["codec_args"], out_file])
+            res = subprocess.run(cmd, capture_output=True, text=True)
+            if res.returncode != 0:
+                raise Exception(f"FFMPEG failed: {res.stderr}")
+            with open(out_file, 'rb') as f:
+                return f.read()
+        finally:
+            if os.path.exists(out_file): os.remove(out_file)
+
+    finally:
+        for f in converted_files:
+            if os.path.exists(f): os.remove(f)
+
+
+async def assemble_session_recording(payload: Dict[str, Any]):
+    """Job ``session_recording``: merge turn audio into one file and upload it."""
+    session_id = payload["session_id"]
+    conv_col = get_conversation_collection()
+    conv = await conv_col.find_one({"session_id": session_id})
+    if not conv:
+        return
+    if conv.get("recording_s3_url"):
+        print(f"⏭️ Full recording already uploaded for {session_id}")
+        return
+    if not s3_service.enabled:
+        print(f"⚠️ S3 disabled — skipping full recording upload for {session_id}")
+        return
+
+    turns = conv.get("turns", [])
+    meeting_id = conv.get("meeting_id")
+    sorted_turns = sorted(turns, key=lambda t: t.get("turn_number", 0))
+    audio_urls = [t["audio_url"] for t in sorted_turns if t.get("audio_url")]
+
+    if not audio_urls:
+        print(f"⚠️ No audio URLs — skipping full recording upload for {session_id}")
+        return
+
+    archive_format = settings.RECORDING_ARCHIVE_FORMAT
+    print(f"🎞️ Extracting {len(audio_urls)} segments for full recording ({session_id}, {archive_format})...")
+    temp_files = []
+    try:
+        for url in audio_urls:
+            chunk = await s3_service.download_file(url)
+            if chunk:
+                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.tmp')
+                tmp.write(chunk)
+                tmp.close()
+                temp_files.append(tmp.name)
+
+        if not temp_files:
+            raise Exception("Could not download any audio segments")
+
+        print(f"✅ Downloaded {len(temp_files)}/{len(audio_urls)} segments. Merging via FFMPEG...")
+        # ffmpeg is blocking — keep it off the worker's event loop
+        merged_bytes = await asyncio.to_thread(_merge_segments_ffmpeg, temp_files, archive_format)
+        print(f"✅ Merge successful — {len(merged_bytes)} bytes")
+
+    finally:
+        for f in temp_files:
+            if os.path.exists(f): os.remove(f)
+
+    recording_url = await s3_service.upload_full_meeting_audio(
+        audio_bytes=merged_bytes,
+        meeting_id=meeting_id,
+        content_type=ARCHIVE_FORMATS[archive_format]["mime_type"],
+        extension=ARCHIVE_FORMATS[archive_format]["extension"]
+    )
+    if not recording_url:
+        raise Exception(f"S3 upload returned None for full recording ({session_id})")
+
+    await conv_col.update_one(
+        {"session_id": session_id},
+        {"$set": {"recording_s3_url": recording_url}}
+    )
+    print(f"✅ Full recording uploaded: {recording_url}")
+
+
+# job type → async handler(payload)
+JOB_HANDLERS = {
+    "session_analytics": generate_and_save_analytics,
+    "session_recording": assemble_session_recording,
+}
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import socket
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING
+
+from app.config.database import get_live_session_collection
+from app.config.settings import settings
+from app.utils.helpers import current_timestamp
+
+# One id per API process — the unit that owns a live WebSocket session
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SessionRegistryService:
+    """
+    Cluster-wide registry of live conversation sessions.
+
+    A live session is a WebSocket, so it is pinned to the API worker that
+    accepted it; its in-process state (audio buffers, playback clock) never
+    has to move. The registry records which worker owns which session so
+    admin/analytics endpoints on any worker can list every active session.
+
+    Backends: ``mongo`` (shared ``live_sessions`` collection, one document per
+    session) or ``memory`` (single-process stand-in for development). Each
+    worker heartbeats its sessions; a crashed worker's entries expire after
+    SESSION_TTL_SECONDS through a TTL index.
+    """
+
+    def __init__(self):
+        self.backend = settings.SESSION_REGISTRY_BACKEND
+        self.heartbeat_seconds = settings.SESSION_HEARTBEAT_SECONDS
+        self.ttl_seconds = settings.SESSION_TTL_SECONDS
+        self.worker_id = WORKER_ID
+        self.node_url = settings.NODE_URL or None
+        self.local_sessions: Dict[str, Dict[str, Any]] = {}
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        if self._indexes_ready or self.backend != "mongo":
+            return
+        col = get_live_session_collection()
+        await col.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        await col.create_index([("meeting_id", ASCENDING)])
+        self._indexes_ready = True
+
+    def _expiry(self):
+        return current_timestamp() + timedelta(seconds=self.ttl_seconds)
+
+    async def register(self, session_id: str, meeting_id: str, **info) -> Dict[str, Any]:
+        now = current_timestamp()
+        entry = {
+            "_id": session_id,
+            "meeting_id": meeting_id,
+            "worker_id": self.worker_id,
+            "node_url": self.node_url,
+            "started_at": now,
+            "heartbeat_at": now,
+            "expires_at": self._expiry(),
+            **info
+        }
+        self.local_sessions[session_id] = entry
+        if self.backend == "mongo":
+            try:
+                await get_live_session_collection().replace_one({"_id": session_id}, entry, upsert=True)
+            except Exception as e:
+                print(f"⚠️ Session registry write failed for {session_id}: {e}")
+        return entry
+
+    async def unregister(self, session_id: str):
+        self.local_sessions.pop(session_id, None)
+        if self.backend == "mongo":
+            try:
+                await get_live_session_collection().delete_one({"_id": session_id, "worker_id": self.worker_id})
+            except Exception as e:
+                print(f"⚠️ Session registry delete failed for {session_id}: {e}")
+
+    async def heartbeat(self):
+        """Extend the lease on every session this worker owns (one write per beat)."""
+        if self.backend != "mongo" or not self.local_sessions:
+            return
+        await get_live_session_collection().update_many(
+            {"_id": {"$in": list(self.local_sessions)}},
+            {"$set": {"heartbeat_at": current_timestamp(), "expires_at": self._expiry()}}
+        )
+
+    async def run_heartbeat(self):
+        """Background loop started in the app lifespan."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                print(f"⚠️ Session heartbeat failed: {e}")
+
+    async def release_worker(self):
+        """Graceful shutdown: drop this worker's entries instead of waiting for the TTL."""
+        if self.backend == "mongo" and self.local_sessions:
+            try:
+                await get_live_session_collection().delete_many({"worker_id": self.worker_id})
+            except Exception as e:
+                print(f"⚠️ Session registry cleanup failed: {e}")
+        self.local_sessions.clear()
+
+    async def list_active(self, meeting_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Active sessions across all workers (TTL monitor lags ~60s, so filter expired too)."""
+        if self.backend != "mongo":
+            sessions = [dict(s) for s in self.local_sessions.values()]
+            return [s for s in sessions if not meeting_id or s["meeting_id"] == meeting_id]
+
+        query: Dict[str, Any] = {"expires_at": {"$gt": current_timestamp()}}
+        if meeting_id:
+            query["meeting_id"] = meeting_id
+        return [doc async for doc in get_live_session_collection().find(query).sort("started_at", ASCENDING)]
+
+    async def owner(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if session_id in self.local_sessions:
+            return self.local_sessions[session_id]
+        if self.backend != "mongo":
+            return None
+        return await get_live_session_collection().find_one(
+            {"_id": session_id, "expires_at": {"$gt": current_timestamp()}}
+        )
+
+
+session_registry_service = SessionRegistryService()
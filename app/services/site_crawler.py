@@ -0,0 +1,187 @@
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from app.config.settings import settings
+from app.utils.html_text import extract_visible_text
+
+USER_AGENT = "Mozilla/5.0"
+
+# Path keyword → section label, in priority order (first pages to be dropped are the last ones)
+PAGE_KEYWORDS = [
+    ("about", "About"),
+    ("company", "About"),
+    ("careers", "Careers"),
+    ("jobs", "Careers"),
+    ("pricing", "Pricing"),
+    ("press", "Press"),
+    ("newsroom", "Press"),
+    ("news", "Press"),
+]
+# Tried when the homepage links to none of the above (e.g. a JS-rendered menu)
+FALLBACK_PATHS = [("/about", "About"), ("/careers", "Careers"), ("/pricing", "Pricing"), ("/press", "Press")]
+
+
+def _host(url: str) -> str:
+    return re.sub(r"^www\.", "", (urlparse(url).hostname or "").lower())
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form for the visited set: no fragment, default port or trailing slash."""
+    parts = urlparse(url)
+    netloc = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        netloc = f"{netloc}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunparse((parts.scheme.lower(), netloc, path, "", parts.query, ""))
+
+
+class SiteCrawler:
+    """
+    Bounded crawl of a company site's informative pages.
+
+    Starting from the homepage's links (or FALLBACK_PATHS), fetches up to
+    SCRAPER_CRAWL_MAX_PAGES same-site pages whose path names an about /
+    careers / pricing / press section. robots.txt is honoured, each host
+    gets at most SCRAPER_CRAWL_PER_HOST_CONCURRENCY requests in flight, all
+    pages share one SCRAPER_CRAWL_MAX_TOTAL_BYTES budget, and whatever is
+    not done after SCRAPER_CRAWL_BUDGET_SECONDS is dropped.
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        page_chars: Optional[int] = None,
+        budget_seconds: Optional[float] = None
+    ):
+        self.max_pages = settings.SCRAPER_CRAWL_MAX_PAGES if max_pages is None else max_pages
+        self.per_host_concurrency = per_host_concurrency or settings.SCRAPER_CRAWL_PER_HOST_CONCURRENCY
+        self.max_total_bytes = max_total_bytes or settings.SCRAPER_CRAWL_MAX_TOTAL_BYTES
+        self.page_chars = page_chars or settings.SCRAPER_CRAWL_PAGE_CHARS
+        self.budget_seconds = budget_seconds or settings.SCRAPER_CRAWL_BUDGET_SECONDS
+
+    def candidate_pages(self, base_url: str, links: List[str], visited: set) -> List[Tuple[str, str]]:
+        """(label, url) pairs to fetch: same site, matching PAGE_KEYWORDS, deduplicated."""
+        site = _host(base_url)
+        ranked = []
+        for href in links:
+            url = urljoin(base_url, href.strip())
+            parts = urlparse(url)
+            if parts.scheme not in ("http", "https") or _host(url) != site:
+                continue
+            segments = [s for s in parts.path.lower().split("/") if s]
+            for rank, (keyword, label) in enumerate(PAGE_KEYWORDS):
+                # Section pages only ("/about", "/company/team"), not every news article
+                if segments and len(segments) <= 2 and re.split(r"[-_.]", segments[0])[0] == keyword:
+                    ranked.append((rank, label, url))
+                    break
+
+        pages, labels = [], set()
+        for _, label, url in sorted(ranked, key=lambda r: r[0]):
+            key = normalize_url(url)
+            if key in visited or label in labels:
+                continue
+            visited.add(key)
+            labels.add(label)
+            pages.append((label, url))
+
+        if not pages:
+            for path, label in FALLBACK_PATHS:
+                url = urljoin(base_url, path)
+                if normalize_url(url) not in visited:
+                    visited.add(normalize_url(url))
+                    pages.append((label, url))
+        return pages[:self.max_pages]
+
+    async def _robots(self, client: httpx.AsyncClient, base_url: str) -> RobotFileParser:
+        robots = RobotFileParser()
+        try:
+            response = await client.get(urljoin(base_url, "/robots.txt"), headers={"User-Agent": USER_AGENT})
+        except Exception:
+            robots.disallow_all = True  # unreachable: assume the site does not want crawling
+            return robots
+        # Same rules as RobotFileParser.read(): 401/403 forbid everything, other 4xx allow everything
+        if response.status_code in (401, 403) or response.status_code >= 500:
+            robots.disallow_all = True
+        elif response.status_code >= 400:
+            robots.allow_all = True
+        else:
+            robots.parse(response.text.splitlines())
+        return robots
+
+    async def crawl(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        links: List[str]
+    ) -> List[Dict[str, str]]:
+        """Fetch the candidate pages; returns ``[{"label", "url", "text"}]`` for pages with text."""
+        if self.max_pages <= 0:
+            return []
+        started = time.perf_counter()
+        visited = {normalize_url(base_url)}
+        try:
+            robots = await asyncio.wait_for(self._robots(client, base_url), timeout=self.budget_seconds)
+        except asyncio.TimeoutError:
+            print("  ⏱️ robots.txt timed out — skipping the crawl")
+            return []
+        pages = [(label, url) for label, url in self.candidate_pages(base_url, links, visited)
+                 if robots.can_fetch(USER_AGENT, url)]
+        if not pages:
+            return []
+
+        slots: Dict[str, asyncio.Semaphore] = {}
+        bytes_read = 0
+
+        async def budgeted(chunks):
+            nonlocal bytes_read
+            async for chunk in chunks:
+                if bytes_read >= self.max_total_bytes:
+                    return
+                bytes_read += len(chunk)
+                yield chunk
+
+        async def fetch(label: str, url: str) -> Optional[Dict[str, str]]:
+            slot = slots.setdefault(_host(url), asyncio.Semaphore(self.per_host_concurrency))
+            async with slot:
+                if bytes_read >= self.max_total_bytes:
+                    return None
+                try:
+                    async with client.stream("GET", url, headers={"User-Agent": USER_AGENT}) as response:
+                        if response.status_code != 200 or "html" not in response.headers.get("content-type", "html"):
+                            return None
+                        text = await extract_visible_text(
+                            budgeted(response.aiter_bytes()),
+                            content_type=response.headers.get("content-type"),
+                            max_chars=self.page_chars,
+                            max_bytes=self.max_total_bytes
+                        )
+                except Exception as e:
+                    print(f"  ⚠️ Crawl of {url} failed: {e}")
+                    return None
+            return {"label": label, "url": url, "text": text} if text else None
+
+        tasks = [asyncio.create_task(fetch(label, url)) for label, url in pages]
+        remaining = max(self.budget_seconds - (time.perf_counter() - started), 0.1)
+        done, late = await asyncio.wait(tasks, timeout=remaining)
+        for task in late:
+            task.cancel()
+        results = [task.result() for task in tasks if task in done and task.result()]
+        print(f"  🕸️ Crawled {len(results)}/{len(pages)} pages ({bytes_read} bytes, "
+              f"{time.perf_counter() - started:.1f}s){f', {len(late)} over budget' if late else ''}")
+        return results
+
+    @staticmethod
+    def combine(homepage_text: str, pages: List[Dict[str, str]]) -> str:
+        sections = [homepage_text] + [f"[{page['label']}] {page['text']}" for page in pages]
+        return "\n\n".join(s for s in sections if s)
+
+
+site_crawler = SiteCrawler()
@@ -0,0 +1,244 @@
+"""
+Speech-to-text engines.
+
+``WhisperService`` picks one of these per utterance:
+
+* ``HostedWhisperEngine`` — OpenAI ``whisper-1`` over HTTPS.
+* ``LocalWhisperEngine``  — faster-whisper (CTranslate2) on CPU, model loaded
+  once per process and run in a thread pool sized to the machine's cores.
+  Optional: only used when ``faster-whisper`` is installed.
+"""
+
+import asyncio
+import io
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+from app.services.service_container import openai_client
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # optional dependency
+    WhisperModel = None
+
+client = openai_client
+
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+
+class LatencyStats:
+    """Rolling latency stats (last ``window`` calls), lifetime counters and a histogram."""
+
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.total_seconds = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def record(self, seconds: float, ok: bool = True, cancelled: bool = False):
+        """
+        ``cancelled`` marks a censored sample: the call was abandoned (e.g. a
+        hedge won) after ``seconds``, so its real latency was at least that.
+        Keeping it stops the percentiles from only seeing the fast calls.
+        """
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+            return
+        if cancelled:
+            self.cancelled += 1
+        self.samples.append(seconds)
+        self.total_seconds += seconds
+        self.histogram[bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        ok_calls = self.calls - self.errors
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "avg_ms": round(self.total_seconds / ok_calls * 1000, 1) if ok_calls else None,
+            "p50_ms": round(self.percentile(50) * 1000, 1) if self.samples else None,
+            "p95_ms": round(self.percentile(95) * 1000, 1) if self.samples else None,
+            "p99_ms": round(self.percentile(99) * 1000, 1) if self.samples else None,
+            "histogram": {
+                (f"le_{bound}s" if i < len(HISTOGRAM_BUCKETS) else f"gt_{HISTOGRAM_BUCKETS[-1]}s"): count
+                for i, (bound, count) in enumerate(zip(HISTOGRAM_BUCKETS + (None,), self.histogram))
+            },
+        }
+
+
+class Transcript:
+    """STT output with Whisper's confidence signals (None when the engine has none)."""
+
+    def __init__(self, text: str, avg_logprob: Optional[float] = None, no_speech_prob: Optional[float] = None):
+        self.text = text
+        self.avg_logprob = avg_logprob
+        self.no_speech_prob = no_speech_prob
+
+    @classmethod
+    def from_segments(cls, text: str, segments) -> "Transcript":
+        """Average per-segment confidence (segments may be objects or dicts)."""
+        def values(field):
+            out = []
+            for seg in segments or []:
+                value = seg.get(field) if isinstance(seg, dict) else getattr(seg, field, None)
+                if value is not None:
+                    out.append(float(value))
+            return out
+
+        logprobs, no_speech = values("avg_logprob"), values("no_speech_prob")
+        return cls(
+            text=text.strip() if text else "",
+            avg_logprob=sum(logprobs) / len(logprobs) if logprobs else None,
+            no_speech_prob=sum(no_speech) / len(no_speech) if no_speech else None
+        )
+
+
+class STTEngine:
+    """Base class: subclasses implement ``_transcribe``."""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = LatencyStats()
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    async def warm_up(self):
+        """Load models / open connections ahead of the first request."""
+
+    async def transcribe(self, audio_bytes: bytes, filename: str, language: str = "en") -> Transcript:
+        started = time.perf_counter()
+        try:
+            result = await self._transcribe(audio_bytes, filename, language)
+        except asyncio.CancelledError:
+            self.stats.record(time.perf_counter() - started, cancelled=True)
+            raise
+        except Exception:
+            self.stats.record(time.perf_counter() - started, ok=False)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return result
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: str) -> Transcript:
+        raise NotImplementedError
+
+
+class HostedWhisperEngine(STTEngine):
+    """OpenAI hosted Whisper."""
+
+    name = "hosted"
+
+    def __init__(self, model: str = "whisper-1", timeout: float = settings.STT_TIMEOUT_SECONDS):
+        super().__init__()
+        self.model = model
+        self.timeout = timeout
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: str) -> Transcript:
+        audio_file = io.BytesIO(audio_bytes)
+        audio_file.name = filename
+        try:
+            transcript = await asyncio.wait_for(
+                client.audio.transcriptions.create(
+                    model=self.model,
+                    file=audio_file,
+                    language=language,
+                    response_format="verbose_json"  # includes per-segment confidence
+                ),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"❌ Whisper API timeout ({self.timeout:.0f}s)")
+            raise Exception("Transcription timeout - audio might be too long")
+        if isinstance(transcript, str):
+            return Transcript(transcript.strip())
+        return Transcript.from_segments(transcript.text, getattr(transcript, "segments", None))
+
+
+class LocalWhisperEngine(STTEngine):
+    """faster-whisper on CPU. The model is loaded once and shared by the pool threads."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        model_size: str = settings.STT_LOCAL_MODEL,
+        compute_type: str = settings.STT_LOCAL_COMPUTE_TYPE,
+        workers: int = settings.STT_LOCAL_WORKERS
+    ):
+        super().__init__()
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.workers = workers or os.cpu_count() or 1
+        self._model = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        return WhisperModel is not None
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def _load_model(self):
+        # CTranslate2 parallelises inside one call too; split cores between the pool threads
+        cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        return WhisperModel(
+            self.model_size, device="cpu", compute_type=self.compute_type,
+            cpu_threads=cpu_threads, num_workers=self.workers
+        )
+
+    async def warm_up(self):
+        if not self.available:
+            print("⚠️ faster-whisper not installed — local STT disabled")
+            return
+        async with self._load_lock:
+            if self._model is not None:
+                return
+            started = time.perf_counter()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt")
+            loop = asyncio.get_running_loop()
+            self._model = await loop.run_in_executor(self._executor, self._load_model)
+            print(f"✅ Local STT model '{self.model_size}' ({self.compute_type}) loaded in "
+                  f"{time.perf_counter() - started:.1f}s | {self.workers} workers")
+
+    def _run(self, audio_bytes: bytes, language: str) -> Transcript:
+        segments, _ = self._model.transcribe(
+            io.BytesIO(audio_bytes), language=language, beam_size=1, vad_filter=False
+        )
+        segments = list(segments)  # generator — decoding happens here, in the pool thread
+        text = " ".join(segment.text.strip() for segment in segments)
+        return Transcript.from_segments(text, segments)
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: str) -> Transcript:
+        if self._model is None:
+            await self.warm_up()
+        if self._model is None:
+            raise Exception("Local STT engine is not available")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, audio_bytes, language)
@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.config.database import get_representative_collection
+from app.config.settings import settings
+from app.services.openai_service import (
+    EMPTY_RESPONSE_TEXT,
+    FALLBACK_DEFAULT_RESPONSE,
+    FALLBACK_NO_REP_RESPONSE,
+    FALLBACK_RESPONSES,
+    STREAM_ERROR_RESPONSE,
+)
+from app.services.s3_service import s3_service
+from app.utils.audio_formats import AUDIO_FORMATS
+
+# Same split as app.utils.stream_helpers.sentence_buffer, so a streamed
+# fallback line hits the cache sentence by sentence
+SENTENCE_END = re.compile(r'(?<=[.?!])\s+')
+
+GENERIC_PHRASES = [STREAM_ERROR_RESPONSE, EMPTY_RESPONSE_TEXT, FALLBACK_DEFAULT_RESPONSE, FALLBACK_NO_REP_RESPONSE]
+
+
+def _with_sentences(lines: List[str]) -> List[str]:
+    out = []
+    for line in lines:
+        for text in [line] + SENTENCE_END.split(line):
+            if text and text not in out:
+                out.append(text)
+    return out
+
+
+class TTSCacheService:
+    """
+    Content-addressed cache for synthesized fixed phrases.
+
+    Keyed by sha256 of (text, voice_id, model, voice_settings, output_format),
+    so a change to any of them is simply a different entry. Two tiers: an
+    in-process LRU bounded by TTS_CACHE_MEMORY_MB, backed by S3 so renders
+    survive restarts and are shared between workers. Only the fixed
+    fallback/filler lines are cached — generated replies are never repeated.
+    """
+
+    def __init__(self):
+        self.enabled = settings.TTS_CACHE_ENABLED
+        self.max_bytes = settings.TTS_CACHE_MEMORY_MB * 1024 * 1024
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self.phrases: Set[str] = set(self.phrases_for(None))
+        for personality in FALLBACK_RESPONSES:
+            self.phrases.update(self.phrases_for(personality))
+        self.stats = {"memory_hits": 0, "storage_hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def phrases_for(personality: Optional[str]) -> List[str]:
+        """Lines a rep with this personality can fall back to (and their sentences)."""
+        lines = list(GENERIC_PHRASES)
+        if personality and personality.lower() in FALLBACK_RESPONSES:
+            lines.append(FALLBACK_RESPONSES[personality.lower()])
+        return _with_sentences(lines)
+
+    def is_cacheable(self, text: str) -> bool:
+        return self.enabled and bool(text) and text.strip() in self.phrases
+
+    @staticmethod
+    def build_key(text: str, voice_id: str, model: str, voice_settings: Any, audio_format: str) -> str:
+        raw = json.dumps(
+            [text.strip(), voice_id, model, voice_settings, audio_format],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, audio: bytes):
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Memory first, then S3 (promoted into memory on a hit)."""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return audio
+        try:
+            audio = await s3_service.get_object_bytes(f"tts-cache/{key}")
+        except Exception as e:
+            print(f"⚠️ TTS cache storage read failed: {e}")
+            audio = None
+        if audio:
+            self.stats["storage_hits"] += 1
+            self._remember(key, audio)
+            return audio
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, audio: bytes, audio_format: str = "mp3"):
+        if not audio:
+            return
+        self._remember(key, audio)
+        self.stats["stores"] += 1
+        try:
+            await s3_service.put_object_bytes(f"tts-cache/{key}", audio, AUDIO_FORMATS[audio_format]["mime_type"])
+        except Exception as e:
+            print(f"⚠️ TTS cache storage write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "storage_enabled": s3_service.enabled,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_limit_bytes": self.max_bytes,
+        }
+
+    async def voices_in_use(self) -> List[Tuple[Optional[str], str]]:
+        """Distinct (voice_id, personality) pairs across representatives, plus the default voice."""
+        pairs = {(None, "neutral")}
+        async for rep in get_representative_collection().find({}, {"voice_id": 1, "personality_traits": 1}):
+            traits = rep.get("personality_traits") or []
+            personality = traits[0] if traits and isinstance(traits[0], str) else "neutral"
+            pairs.add((rep.get("voice_id"), personality))
+        return sorted(pairs, key=lambda p: (p[0] or "", p[1]))
+
+    async def warm_up(self, formats: Optional[List[str]] = None):
+        """
+        Render every fixed phrase for every voice in use. Entries already in
+        S3 are only loaded into memory, so after the first deploy this costs
+        no synthesis. Without S3 nothing would persist and every process
+        start (one per core under app.server) would pay for the renders
+        again, so it is skipped.
+        """
+        if not self.enabled:
+            return
+        if not s3_service.enabled:
+            print("⏭️ TTS cache warm-up skipped: S3 storage is not configured")
+            return
+        from app.services.elevenlabs_service import elevenlabs_service
+
+        supported = elevenlabs_service.supported_audio_formats()
+        if formats is None:
+            formats = [f.strip() for f in settings.TTS_CACHE_WARMUP_FORMATS.split(",")]
+        formats = [f for f in formats if f in supported]
+
+        try:
+            voices = await self.voices_in_use()
+        except Exception as e:
+            print(f"⚠️ TTS cache warm-up could not list voices: {e}")
+            voices = [(None, "neutral")]
+
+        semaphore = asyncio.Semaphore(max(1, settings.TTS_CACHE_WARMUP_CONCURRENCY))
+        failures = 0
+
+        async def render(text, voice_id, personality, audio_format):
+            nonlocal failures
+            async with semaphore:
+                try:
+                    await elevenlabs_service.text_to_speech(
+                        text=text, voice_id=voice_id, personality=personality, audio_format=audio_format
+                    )
+                except Exception as e:
+                    failures += 1
+                    print(f"⚠️ TTS cache warm-up failed for '{text[:30]}': {e}")
+
+        jobs = [
+            render(text, voice_id, personality, audio_format)
+            for voice_id, personality in voices
+            for text in self.phrases_for(personality)
+            for audio_format in formats
+        ]
+        await asyncio.gather(*jobs)
+        print(f"🔥 TTS cache warm: {len(jobs) - failures}/{len(jobs)} phrases for {len(voices)} voices "
+              f"({len(self._memory)} in memory)")
+
+
+tts_cache_service = TTSCacheService()
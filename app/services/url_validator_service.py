@@ -1,20 +1,38 @@
+import asyncio
+import copy
 import httpx
 import ssl
-import socket
-from typing import Dict, Any, Optional
-from urllib.parse import urlparse, urljoin
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, urljoin, urlunparse
 import re
 
+from app.config.settings import settings
+from app.utils.helpers import current_timestamp
+
 
 class URLValidator:
     """Service to validate and authenticate company URLs"""
 
     def __init__(self):
         self.timeout = 15.0
-
-    async def validate_and_authenticate_url(self, url: str) -> Dict[str, Any]:
+        self.ssl_timeout = 10.0
+        self.ssl_context = ssl.create_default_context()
+        self.cache_ttl = settings.URL_VALIDATION_CACHE_TTL_SECONDS
+        self.negative_cache_ttl = settings.URL_VALIDATION_NEGATIVE_TTL_SECONDS
+        self.cache_max_entries = settings.URL_VALIDATION_CACHE_MAX_ENTRIES
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.cache_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    async def validate_and_authenticate_url(self, url: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Comprehensive URL validation and authentication check
+
+        Results are cached per normalized URL (failures for a shorter time),
+        and concurrent validations of the same URL share one in-flight check.
         
         Returns:
             {
@@ -23,21 +41,87 @@ class URLValidator:
                 "is_reachable": bool,
                 "status_code": int,
                 "ssl_valid": bool,
+                "ssl_certificate": {valid, issuer, subject, expires_at, days_until_expiry, error},
+                "redirect_chain": [every URL requested, final one last],
                 "domain": str,
                 "errors": [list of issues],
-                "warnings": [list of warnings]
+                "warnings": [list of warnings],
+                "cached": bool
             }
         """
+        normalized_url = self._normalize_url(url)
+        if not normalized_url or not use_cache:
+            return {**await self._validate(url), "cached": False}
+
+        key = self._cache_key(normalized_url)
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.cache_stats["hits"] += 1
+            return {**copy.deepcopy(entry[1]), "cached": True}
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.cache_stats["misses"] += 1
+            task = asyncio.ensure_future(self._validate(url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        else:
+            self.cache_stats["coalesced"] += 1
+        # Shielded so one caller disconnecting does not cancel the shared check
+        result = await asyncio.shield(task)
+        return {**copy.deepcopy(result), "cached": False}
+
+    def _cache_key(self, normalized_url: str) -> str:
+        parsed = urlparse(normalized_url)
+        return urlunparse((parsed.scheme, parsed.netloc.lower(), parsed.path.rstrip("/"), "", parsed.query, ""))
+
+    def _store(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        ttl = self.cache_ttl if result["is_valid"] else self.negative_cache_ttl
+        self._cache[key] = (time.monotonic() + ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {**self.cache_stats, "entries": len(self._cache), "in_flight": len(self._inflight)}
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def validate_many(self, urls: List[str], concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate a batch of URLs (bulk imports) with at most ``concurrency``
+        checks in flight. Returns results keyed by the input URL; duplicates
+        are validated once through the cache.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.URL_VALIDATION_BATCH_CONCURRENCY))
+
+        async def validate(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.validate_and_authenticate_url(url)
+
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(validate(url) for url in unique))
+        return dict(zip(unique, results))
+
+    async def _validate(self, url: str) -> Dict[str, Any]:
         result = {
             "is_valid": False,
             "authenticated_url": None,
             "is_reachable": False,
             "status_code": None,
             "ssl_valid": False,
+            "ssl_certificate": None,
             "domain": None,
             "errors": [],
             "warnings": [],
-            "response_headers": {}
+            "response_headers": {},
+            "redirect_chain": []
         }
 
         try:
@@ -54,26 +138,29 @@ class URLValidator:
             domain = parsed.netloc
             result["domain"] = domain
 
-            # Step 3: Check SSL certificate validity
-            ssl_valid = await self._check_ssl_certificate(domain)
+            # Steps 3-5: certificate, reachability and redirects from one request chain
+            probe = await self._probe_url(normalized_url)
+            certificate = probe["certificate"]
+            ssl_valid = certificate["valid"]
             result["ssl_valid"] = ssl_valid
+            result["ssl_certificate"] = certificate
             if not ssl_valid:
                 result["warnings"].append("SSL certificate invalid or self-signed")
+            elif certificate["days_until_expiry"] is not None and certificate["days_until_expiry"] < 14:
+                result["warnings"].append(f"SSL certificate expires in {certificate['days_until_expiry']} days")
 
-            # Step 4: Check if URL is reachable
-            is_reachable, status_code, headers = await self._check_url_reachable(normalized_url)
+            is_reachable, status_code = probe["is_reachable"], probe["status_code"]
             result["is_reachable"] = is_reachable
             result["status_code"] = status_code
-            result["response_headers"] = headers
+            result["response_headers"] = probe["headers"]
+            result["redirect_chain"] = probe["redirect_chain"]
 
             if not is_reachable:
                 result["errors"].append(f"URL not reachable (Status: {status_code})")
                 return result
 
-            # Step 5: Check for redirect chains (potential phishing)
-            redirect_issues = await self._check_redirect_chain(normalized_url)
-            if redirect_issues:
-                result["warnings"].extend(redirect_issues)
+            if probe["redirect_warnings"]:
+                result["warnings"].extend(probe["redirect_warnings"])
 
             # Step 6: Validate domain reputation
             domain_check = self._check_domain_reputation(domain)
@@ -132,82 +219,138 @@ class URLValidator:
         except:
             return None
 
-    async def _check_ssl_certificate(self, domain: str) -> bool:
-        """Check if SSL certificate is valid for the domain"""
+    @staticmethod
+    def _certificate_info(cert: Optional[dict], error: Optional[str] = None) -> Dict[str, Any]:
+        """Validity, issuer and expiry from a verified ``getpeercert()`` dict"""
+        info = {
+            "valid": bool(cert) and error is None,
+            "issuer": None,
+            "subject": None,
+            "expires_at": None,
+            "days_until_expiry": None,
+            "error": error
+        }
+        if cert:
+            issuer = dict(item for rdn in cert.get("issuer", ()) for item in rdn)
+            subject = dict(item for rdn in cert.get("subject", ()) for item in rdn)
+            expires_at = datetime.utcfromtimestamp(ssl.cert_time_to_seconds(cert["notAfter"]))
+            info.update({
+                "issuer": issuer.get("organizationName") or issuer.get("commonName"),
+                "subject": subject.get("commonName"),
+                "expires_at": expires_at,
+                "days_until_expiry": (expires_at - current_timestamp()).days
+            })
+        return info
+
+    async def _check_ssl_certificate(self, host: str, port: int = 443) -> Dict[str, Any]:
+        """TLS handshake on asyncio streams (never blocks the event loop)"""
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    return cert is not None
-        except (ssl.SSLError, socket.gaierror, socket.timeout, ConnectionRefusedError):
-            return False
-        except Exception:
-            return False
-
-    async def _check_url_reachable(self, url: str) -> tuple:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self.ssl_context, server_hostname=host),
+                timeout=self.ssl_timeout
+            )
+        except asyncio.TimeoutError:
+            return self._certificate_info(None, "TLS handshake timed out")
+        except (ssl.SSLError, OSError) as e:
+            return self._certificate_info(None, str(e))
+
+        try:
+            return self._certificate_info(writer.get_extra_info("peercert"))
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_tls_error(error: Optional[BaseException]) -> bool:
+        while error is not None:
+            if isinstance(error, ssl.SSLError):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    @staticmethod
+    def _peer_certificate(response: httpx.Response) -> Optional[dict]:
+        """Certificate of the TLS connection a response arrived on, if any"""
+        stream = response.extensions.get("network_stream")
+        ssl_object = stream.get_extra_info("ssl_object") if stream else None
+        return ssl_object.getpeercert() if ssl_object else None
+
+    async def _request_checks(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
         """
-        Check if URL is reachable and returns status code
-        Returns: (is_reachable, status_code, headers)
+        Reachability and redirect checks from a single request chain: one
+        HEAD with redirects followed (GET only if the site rejects HEAD).
+        Redirect warnings come from ``response.history``; the certificate
+        from the connection the first hop arrived on.
         """
-        try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True,
-                verify=False  # Allow self-signed certs for now
-            ) as client:
-                response = await client.head(
-                    url,
-                    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-                )
-
-                # If HEAD fails, try GET
-                if response.status_code >= 400:
-                    response = await client.get(
-                        url,
-                        headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"},
-                        follow_redirects=True
-                    )
-
-                is_reachable = 200 <= response.status_code < 400
-                return (
-                    is_reachable,
-                    response.status_code,
-                    dict(response.headers)
-                )
+        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+        response = await client.head(url, headers=headers, follow_redirects=True)
+        # If HEAD fails, try GET
+        if response.status_code >= 400:
+            response = await client.get(url, headers=headers, follow_redirects=True)
+
+        chain = list(response.history) + [response]
+        original_domain = urlparse(url).netloc
+        redirect_warnings = []
+        for hop in chain[1:]:
+            redirect_domain = hop.url.netloc.decode("ascii")
+            warning = f"⚠️ Redirects to different domain: {redirect_domain}"
+            if redirect_domain != original_domain and warning not in redirect_warnings:
+                redirect_warnings.append(warning)
+
+        return {
+            "is_reachable": 200 <= response.status_code < 400,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "redirect_warnings": redirect_warnings,
+            "redirect_chain": [str(hop.url) for hop in chain],
+            "peer_certificate": self._peer_certificate(chain[0])
+        }
 
-        except Exception as e:
-            return False, None, {}
+    async def _probe_url(self, url: str) -> Dict[str, Any]:
+        """
+        Certificate, reachability and redirect checks.
+
+        For an https URL the certificate is read from the verified connection
+        httpx opens for the reachability request, so a healthy site costs one
+        TLS handshake. A rejected certificate is reported and the site is
+        re-checked without verification; a plain-http URL gets a separate
+        certificate check on port 443.
+        """
+        parsed = urlparse(url)
+        unreachable = {"is_reachable": False, "status_code": None, "headers": {},
+                       "redirect_warnings": [], "redirect_chain": [], "peer_certificate": None}
+
+        async def unverified_checks():
+            try:
+                async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
+                    return await self._request_checks(client, url)
+            except Exception:
+                return unreachable
+
+        if parsed.scheme != "https":
+            certificate, checks = await asyncio.gather(
+                self._check_ssl_certificate(parsed.hostname), unverified_checks()
+            )
+            return {**checks, "certificate": certificate}
 
-    async def _check_redirect_chain(self, url: str) -> list:
-        """Check for suspicious redirect chains"""
-        warnings = []
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                verify=False
-            ) as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": "Mozilla/5.0"},
-                    follow_redirects=False
-                )
-
-                if response.status_code in [301, 302, 303, 307, 308]:
-                    redirect_url = response.headers.get("location", "")
-                    if redirect_url:
-                        original_domain = urlparse(url).netloc
-                        redirect_domain = urlparse(redirect_url).netloc
-
-                        if original_domain != redirect_domain:
-                            warnings.append(
-                                f"⚠️ Redirects to different domain: {redirect_domain}"
-                            )
-
-        except Exception:
-            pass
-
-        return warnings
+            async with httpx.AsyncClient(timeout=self.timeout, verify=self.ssl_context) as client:
+                checks = await self._request_checks(client, url)
+        except httpx.ConnectError as e:
+            if not self._is_tls_error(e):
+                return {**unreachable, "certificate": self._certificate_info(None, str(e))}
+            return {**await unverified_checks(), "certificate": self._certificate_info(None, str(e))}
+        except Exception as e:
+            return {**unreachable, "certificate": self._certificate_info(None, str(e))}
+
+        certificate = checks["peer_certificate"]
+        if certificate is None:
+            # Transport did not expose the TLS stream: fall back to a direct handshake
+            return {**checks, "certificate": await self._check_ssl_certificate(parsed.hostname, parsed.port or 443)}
+        return {**checks, "certificate": self._certificate_info(certificate)}
 
     def _check_domain_reputation(self, domain: str) -> Dict[str, Any]:
         """
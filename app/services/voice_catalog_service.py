@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.config.database import get_voice_catalog_collection
+from app.config.settings import settings
+from app.services.elevenlabs_service import elevenlabs_service
+from app.utils.helpers import current_timestamp
+
+CATALOG_ID = "elevenlabs"
+
+
+class VoiceCatalogService:
+    """
+    Cached ElevenLabs voice metadata.
+
+    The catalog is one document in the ``voice_catalog`` collection, shared
+    by every worker. It is fresh for VOICE_CATALOG_TTL_SECONDS; after that
+    callers still get the stale copy immediately while a single background
+    task re-fetches it (stale-while-revalidate). Only a process with no copy
+    at all waits on ElevenLabs, and a failed fetch never raises.
+    """
+
+    def __init__(self):
+        self.ttl_seconds = settings.VOICE_CATALOG_TTL_SECONDS
+        self.fetch_timeout = settings.VOICE_CATALOG_FETCH_TIMEOUT_SECONDS
+        self._voices: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at: Optional[datetime] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._fetched_at is not None
+            and current_timestamp() - self._fetched_at < timedelta(seconds=self.ttl_seconds)
+        )
+
+    def _apply(self, voices: List[Dict[str, Any]], fetched_at: datetime):
+        self._voices = voices
+        self._fetched_at = fetched_at
+        elevenlabs_service.set_voice_catalog(voices)
+
+    async def _load_persisted(self):
+        try:
+            doc = await get_voice_catalog_collection().find_one({"_id": CATALOG_ID})
+        except Exception as e:
+            print(f"⚠️ Voice catalog read failed: {e}")
+            return
+        if doc and doc.get("voices"):
+            self._apply(doc["voices"], doc["fetched_at"])
+
+    async def refresh(self) -> bool:
+        """Fetch from ElevenLabs and persist. Returns False (keeping the old copy) on failure."""
+        try:
+            voices = await asyncio.wait_for(elevenlabs_service.fetch_voices(), timeout=self.fetch_timeout)
+        except Exception as e:
+            print(f"⚠️ Voice catalog refresh failed: {e}")
+            return False
+        if not voices:
+            return False
+
+        now = current_timestamp()
+        self._apply(voices, now)
+        try:
+            await get_voice_catalog_collection().update_one(
+                {"_id": CATALOG_ID},
+                {"$set": {"voices": voices, "fetched_at": now}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠️ Voice catalog write failed: {e}")
+        print(f"🗣️ Voice catalog refreshed: {len(voices)} voices")
+        return True
+
+    def _refresh_in_background(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def get_voices(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        if force_refresh:
+            await self.refresh()
+        if self._voices is None:
+            await self._load_persisted()
+        if self._voices is None:
+            await self.refresh()  # cold cache: nothing to serve yet
+        elif not self._is_fresh():
+            self._refresh_in_background()
+        return self._voices or []
+
+    async def warm_up(self):
+        """Startup: load the persisted catalog, revalidating it in the background if stale."""
+        await self.get_voices()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "voices": len(self._voices or []),
+            "fetched_at": self._fetched_at,
+            "fresh": self._is_fresh(),
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+        }
+
+
+voice_catalog_service = VoiceCatalogService()
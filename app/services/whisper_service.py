@@ -103,48 +103,77 @@
 
 
 
-import asyncio
-from openai import AsyncOpenAI
+from typing import Any, Dict, Optional
 from app.config.settings import settings
-import io
-import struct
+from app.services.audio_normalizer import NormalizedAudio, audio_normalizer
+from app.services.stt_engines import HostedWhisperEngine, LatencyStats, LocalWhisperEngine, STTEngine, Transcript
+from app.utils.audio_formats import pcm_to_wav
+import asyncio
+import re
+import time
 
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+# Phrases Whisper commonly produces for silence / room noise (normalized: lowercase, no punctuation)
+# Whisper artifacts nobody says on a sales call: dropped from short or unsure clips
+HALLUCINATION_PHRASES = {
+    "thanks for watching", "thank you for watching", "thanks for watching and see you next time",
+    "please subscribe", "like and subscribe", "subscribe to my channel",
+    "subtitles by the amaraorg community", "transcribed by", "music",
+}
+# Stock replies Whisper also invents for noise, but real speech too: dropped
+# only from short clips the model was unsure about
+SHORT_STOCK_PHRASES = {
+    "thank you", "thank you so much", "thanks", "you", "bye", "bye bye", "okay", "so", "uh", "um", "hmm",
+}
 
 
 class WhisperService:
-    """Handle real-time speech-to-text using OpenAI Whisper"""
+    """Handle real-time speech-to-text (hosted Whisper API or local faster-whisper)"""
     
     def __init__(self):
         self.model = "whisper-1"
-    
-    def _create_wav_from_pcm(self, pcm_bytes: bytes, sample_rate: int = 48000, channels: int = 1, sample_width: int = 2) -> bytes:
-        """
-        Wrap raw PCM bytes in a proper WAV header so Whisper accepts it.
-        Browser MediaRecorder sends PCM-like data — this makes it valid WAV.
-        """
-        num_frames = len(pcm_bytes) // (channels * sample_width)
-        wav_buffer = io.BytesIO()
-        
-        # WAV header
-        data_size = len(pcm_bytes)
-        wav_buffer.write(b'RIFF')
-        wav_buffer.write(struct.pack('<I', 36 + data_size))  # file size - 8
-        wav_buffer.write(b'WAVE')
-        wav_buffer.write(b'fmt ')
-        wav_buffer.write(struct.pack('<I', 16))              # chunk size
-        wav_buffer.write(struct.pack('<H', 1))               # PCM format
-        wav_buffer.write(struct.pack('<H', channels))
-        wav_buffer.write(struct.pack('<I', sample_rate))
-        wav_buffer.write(struct.pack('<I', sample_rate * channels * sample_width))
-        wav_buffer.write(struct.pack('<H', channels * sample_width))
-        wav_buffer.write(struct.pack('<H', sample_width * 8))
-        wav_buffer.write(b'data')
-        wav_buffer.write(struct.pack('<I', data_size))
-        wav_buffer.write(pcm_bytes)
-        
-        return wav_buffer.getvalue()
+        self.engine_mode = settings.STT_ENGINE
+        self.engines: Dict[str, STTEngine] = {
+            "hosted": HostedWhisperEngine(model=self.model),
+            "local": LocalWhisperEngine(),
+        }
+        self.min_speech_seconds = settings.STT_MIN_SPEECH_MS / 1000
+        self.no_speech_threshold = settings.STT_NO_SPEECH_PROB_THRESHOLD
+        self.logprob_threshold = settings.STT_LOGPROB_THRESHOLD
+        self.hallucination_max_seconds = settings.STT_HALLUCINATION_MAX_SECONDS
+        self.gate_totals: Dict[str, int] = {}
+        self.turn_budget_seconds = settings.STT_TURN_BUDGET_SECONDS
+        self.hedge_enabled = settings.STT_HEDGE_ENABLED
+        self.hedge_default_seconds = settings.STT_HEDGE_DEFAULT_SECONDS
+        self.hedge_min_seconds = settings.STT_HEDGE_MIN_SECONDS
+        self.hedge_min_samples = settings.STT_HEDGE_MIN_SAMPLES
+        self.hedge_stats = {"hedges_issued": 0, "hedges_won": 0, "deadline_exceeded": 0}
+        self.turn_latency = LatencyStats()
+
+    async def warm_up(self):
+        """Load the local model up front when it may be used (called at startup)."""
+        if self.engine_mode in ("local", "auto"):
+            await self.engines["local"].warm_up()
+
+    def _select_engine(self) -> STTEngine:
+        local = self.engines["local"]
+        if self.engine_mode == "local" and local.available:
+            return local
+        if self.engine_mode == "auto" and local.ready:
+            return local
+        return self.engines["hosted"]
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.engine_mode,
+            "engines": {
+                name: dict(engine.stats.snapshot(), available=engine.available, ready=engine.ready)
+                for name, engine in self.engines.items()
+            },
+            "gate": dict(self.gate_totals),
+            "hedging": dict(self.hedge_stats, enabled=self.hedge_enabled),
+            "turn_latency": self.turn_latency.snapshot()
+        }
+    
     def _detect_audio_format(self, audio_bytes: bytes) -> str:
         """Detect audio format from magic bytes"""
         if audio_bytes[:4] == b'RIFF':
@@ -162,6 +191,108 @@ class WhisperService:
         else:
             return 'unknown'
 
+    async def _transcribe_detailed(self, audio_bytes: bytes, language: str = "en") -> Transcript:
+        """Pick an engine and transcribe; returns text plus confidence signals."""
+        print(f"📝 Transcribing {len(audio_bytes)} bytes of audio...")
+        
+        # Detect format
+        fmt = self._detect_audio_format(audio_bytes)
+        print(f"🔍 Detected audio format: {fmt}")
+        
+        if fmt in ('wav', 'mp3', 'ogg', 'flac', 'm4a', 'webm'):
+            # Already a valid format — use directly
+            filename = f"audio.{fmt}"
+            print(f"✅ Using detected format: {fmt}")
+        else:
+            # Unknown/raw format — wrap in WAV
+            print("⚠️ Unknown format — wrapping PCM in WAV header...")
+            audio_bytes = pcm_to_wav(audio_bytes, sample_rate=48000)
+            filename = "audio.wav"
+            print(f"✅ Wrapped as WAV: {len(audio_bytes)} bytes")
+        
+        started = time.perf_counter()
+        try:
+            transcript = await self._hedged_transcribe(audio_bytes, filename, language)
+        except Exception:
+            self.turn_latency.record(time.perf_counter() - started, ok=False)
+            raise
+        self.turn_latency.record(time.perf_counter() - started)
+        
+        print(f"✅ Transcription successful: '{transcript.text}'")
+        return transcript
+
+    def _backup_engine(self, primary: STTEngine) -> Optional[STTEngine]:
+        """Engine for the hedge / fallback request: a warm local model if possible, else hosted."""
+        local = self.engines["local"]
+        if primary is not local and local.ready and self.engine_mode != "hosted":
+            return local
+        if primary is local:
+            return self.engines["hosted"]
+        return self.engines["hosted"] if self.hedge_enabled else None
+
+    def _hedge_delay(self, engine: STTEngine) -> float:
+        """Hedge once the primary is slower than its own p95 (clamped to the turn budget)."""
+        if len(engine.stats.samples) >= self.hedge_min_samples:
+            delay = engine.stats.percentile(95)
+        else:
+            delay = self.hedge_default_seconds
+        return min(max(delay, self.hedge_min_seconds), self.turn_budget_seconds)
+
+    async def _hedged_transcribe(self, audio_bytes: bytes, filename: str, language: str) -> Transcript:
+        """
+        Deadline-aware STT: start the primary engine; if it hasn't answered by
+        its p95 (or failed), start a backup request and keep whichever finishes
+        first. Gives up after STT_TURN_BUDGET_SECONDS.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.turn_budget_seconds
+        primary = self._select_engine()
+        backup = self._backup_engine(primary)
+        hedge_delay = self._hedge_delay(primary)
+        hedge_at = loop.time() + hedge_delay if self.hedge_enabled else deadline
+        
+        print(f"🔄 Calling {primary.name} STT engine...")
+        tasks = {asyncio.ensure_future(primary.transcribe(audio_bytes, filename, language)): primary}
+        hedge_task = None
+        last_error: Optional[Exception] = None
+        
+        try:
+            while tasks:
+                now = loop.time()
+                if now >= deadline:
+                    break
+                wait_until = deadline if (hedge_task or backup is None) else min(hedge_at, deadline)
+                done, _ = await asyncio.wait(
+                    list(tasks), timeout=max(0.0, wait_until - now),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    engine = tasks.pop(task)
+                    try:
+                        transcript = task.result()
+                    except Exception as e:
+                        print(f"⚠️ {engine.name} STT failed: {e}")
+                        last_error = e
+                        continue
+                    if task is hedge_task:
+                        self.hedge_stats["hedges_won"] += 1
+                    return transcript
+                
+                if hedge_task is None and backup is not None and (last_error or loop.time() >= hedge_at):
+                    self.hedge_stats["hedges_issued"] += 1
+                    reason = "failed" if last_error else f"slower than {hedge_delay:.2f}s"
+                    print(f"🪝 Primary STT {reason} — hedging with {backup.name} engine")
+                    hedge_task = asyncio.ensure_future(backup.transcribe(audio_bytes, filename, language))
+                    tasks[hedge_task] = backup
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if tasks or not last_error:
+            self.hedge_stats["deadline_exceeded"] += 1
+            raise Exception(f"Transcription deadline exceeded ({self.turn_budget_seconds:.0f}s)")
+        raise last_error
+
     async def transcribe_audio(self, audio_bytes: bytes, language: str = "en") -> str:
         """
         Transcribe audio to text using Whisper.
@@ -173,54 +304,76 @@ class WhisperService:
                 print("⚠️ Empty audio bytes received")
                 return ""
             
-            print(f"📝 Transcribing {len(audio_bytes)} bytes of audio...")
-            
-            # Detect format
-            fmt = self._detect_audio_format(audio_bytes)
-            print(f"🔍 Detected audio format: {fmt}")
+            transcript = await self._transcribe_detailed(audio_bytes, language)
+            return transcript.text
             
-            if fmt in ('wav', 'mp3', 'ogg', 'flac', 'm4a', 'webm'):
-                # Already a valid format — use directly
-                audio_file = io.BytesIO(audio_bytes)
-                audio_file.name = f"audio.{fmt}"
-                print(f"✅ Using detected format: {fmt}")
-            else:
-                # Unknown/raw format — wrap in WAV
-                print("⚠️ Unknown format — wrapping PCM in WAV header...")
-                wav_bytes = self._create_wav_from_pcm(audio_bytes)
-                audio_file = io.BytesIO(wav_bytes)
-                audio_file.name = "audio.wav"
-                print(f"✅ Wrapped as WAV: {len(wav_bytes)} bytes")
-            
-            print("🔄 Calling Whisper API...")
-            
-            transcript = await asyncio.wait_for(
-                client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    language=language,
-                    response_format="text"
-                ),
-                timeout=30.0
-            )
-            
-            result = transcript.strip() if transcript else ""
-            print(f"✅ Transcription successful: '{result}'")
-            return result
-            
-        except asyncio.TimeoutError:
-            print("❌ Whisper API timeout (30s)")
-            raise Exception("Transcription timeout - audio might be too long")
         except Exception as e:
             print(f"❌ Error in Whisper transcription: {e}")
             import traceback
             traceback.print_exc()
             raise
-    
-    async def transcribe_audio_stream(self, audio_chunks: list) -> str:
+
+    def _count(self, stats: Optional[Dict[str, int]], key: str):
+        """Bump a gate counter for the session (``stats``) and for this process."""
+        self.gate_totals[key] = self.gate_totals.get(key, 0) + 1
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + 1
+
+    def is_hallucination(self, transcript: Transcript, speech_seconds: Optional[float] = None) -> bool:
+        """
+        Whisper invents stock phrases ("Thank you.", "Thanks for watching!") for
+        noise. Artifacts are dropped when the clip was short or the model was
+        unsure; everyday replies like "Okay." only when both. Anything Whisper
+        itself flags as likely non-speech is dropped too.
+        """
+        key = re.sub(r"[^a-z' ]", "", transcript.text.lower()).strip()
+        if not key:
+            return False
+        no_speech = transcript.no_speech_prob is not None and transcript.no_speech_prob >= self.no_speech_threshold
+        low_logprob = transcript.avg_logprob is not None and transcript.avg_logprob <= self.logprob_threshold
+
+        short = speech_seconds is not None and speech_seconds < self.hallucination_max_seconds
+        if key in HALLUCINATION_PHRASES:
+            return short or no_speech or low_logprob
+        if key in SHORT_STOCK_PHRASES:
+            return short and (no_speech or low_logprob)
+        return no_speech and low_logprob
+
+    async def transcribe_normalized(
+        self,
+        audio: NormalizedAudio,
+        language: str = "en",
+        stats: Optional[Dict[str, int]] = None
+    ) -> str:
+        """
+        Transcribe 16 kHz mono PCM from the normalization stage (sent as a compact WAV).
+        Silence never reaches the STT engine; known hallucinations are filtered out.
+        """
+        if audio.is_empty or audio.speech_seconds < self.min_speech_seconds:
+            print(f"🔇 Silence gate: {audio.speech_seconds:.2f}s voiced — skipping STT")
+            self._count(stats, "stt_skipped_silence")
+            return ""
+        
+        transcript = await self._transcribe_detailed(audio.to_wav(), language)
+        if self.is_hallucination(transcript, audio.speech_seconds):
+            print(f"👻 Dropped likely hallucination '{transcript.text}' "
+                  f"(no_speech={transcript.no_speech_prob}, logprob={transcript.avg_logprob})")
+            self._count(stats, "stt_hallucinations_filtered")
+            return ""
+        return transcript.text
+
+    async def transcribe_audio_stream(
+        self,
+        audio_chunks: list,
+        normalized: Optional[NormalizedAudio] = None,
+        stats: Optional[Dict[str, int]] = None
+    ) -> str:
         """
         Transcribe multiple audio chunks (for streaming).
         ✅ Handles both bytes and base64 string chunks.
+        ✅ Decodes to 16 kHz mono + trims silence first (pass ``normalized``
+           if the caller already ran the normalization stage).
+        ✅ Returns "" for silence / noise / hallucinations; reasons are counted in ``stats``.
         """
         
         try:
@@ -252,9 +405,17 @@ class WhisperService:
             
             if len(combined_audio) < 1000:  # 1KB এর কম হলে skip (too short / no real audio)
                 print("⚠️ Audio too short/noise, skipping")
+                self._count(stats, "stt_skipped_silence")
+                return ""
+            
+            if normalized is None:
+                normalized = await audio_normalizer.normalize(combined_audio)
+            if normalized is None:
+                print("⚠️ Undecodable audio fragment, skipping")
+                self._count(stats, "stt_skipped_undecodable")
                 return ""
             
-            return await self.transcribe_audio(combined_audio)
+            return await self.transcribe_normalized(normalized, stats=stats)
             
         except Exception as e:
             print(f"❌ Error in streaming transcription: {e}")
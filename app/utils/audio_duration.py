@@ -0,0 +1,276 @@
+"""
+Header-only audio duration probes.
+
+Exact durations without decoding: MP3 by walking frame headers, WebM by
+walking EBML element headers to the block timecodes (plus the Opus TOC of
+the last block), Ogg/Opus from the last page's granule position and WAV
+from the header. Each probe only touches headers, so it costs microseconds
+per turn.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+# ── MP3 ──────────────────────────────────────────────────────────────────────
+
+# kbps, indexed [version_is_mpeg1][layer][bitrate_index]
+_MP3_BITRATES = {
+    True: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    False: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _parse_mp3_header(data: bytes, pos: int) -> Optional[Tuple[int, int, int]]:
+    """(frame_length, samples_per_frame, sample_rate) for a frame header at ``pos``."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2 = data[pos + 1], data[pos + 2]
+    version = (b1 >> 3) & 0x03          # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer_bits = (b1 >> 1) & 0x03       # 3 = Layer I, 2 = II, 1 = III
+    bitrate_index = (b2 >> 4) & 0x0F
+    sr_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sr_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    layer = 4 - layer_bits
+    bitrate = _MP3_BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sr_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+    return length, samples, sample_rate
+
+
+def _skip_id3(data: bytes, pos: int) -> int:
+    while data[pos:pos + 3] == b"ID3" and pos + 10 <= len(data):
+        size = 0
+        for b in data[pos + 6:pos + 10]:
+            size = (size << 7) | (b & 0x7F)
+        footer = 10 if data[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+
+def mp3_duration(data: bytes) -> Optional[float]:
+    """Sum of frame durations; tolerates concatenated streams (several ID3 tags / resyncs)."""
+    pos = _skip_id3(data, 0)
+    seconds = 0.0
+    frames = 0
+    while pos + 4 <= len(data):
+        header = _parse_mp3_header(data, pos)
+        if header is None:
+            if data[pos:pos + 3] == b"ID3":
+                pos = _skip_id3(data, pos)
+            else:
+                pos += 1  # resync on the next frame header
+            continue
+        length, samples, sample_rate = header
+        if pos + length > len(data):
+            break  # truncated last frame
+        frame = data[pos:pos + min(length, 64)]
+        if b"Xing" in frame or b"Info" in frame or b"VBRI" in frame:
+            pos += length  # encoder metadata frame, carries no audio
+            continue
+        seconds += samples / sample_rate
+        frames += 1
+        pos += length
+    return seconds if frames else None
+
+
+# ── WebM / Matroska ──────────────────────────────────────────────────────────
+
+_EBML_ID = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_CLUSTER = 0x1F43B675
+_CLUSTER_TIMECODE = 0xE7
+_BLOCK_GROUP = 0xA0
+_BLOCK = 0xA1
+_SIMPLE_BLOCK = 0xA3
+_MASTER_IDS = {_SEGMENT, _INFO, _CLUSTER, _BLOCK_GROUP}
+
+
+def _read_vint(data: bytes, pos: int, keep_marker: bool) -> Tuple[Optional[int], int]:
+    """EBML variable-length int → (value, length). value is None for 'unknown size'."""
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not (first & mask):
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError("invalid EBML vint")
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = (first & (mask - 1)) == mask - 1
+    for b in data[pos + 1:pos + length]:
+        value = (value << 8) | b
+        all_ones = all_ones and b == 0xFF
+    if not keep_marker and all_ones:
+        return None, length
+    return value, length
+
+
+def _read_uint(data: bytes) -> int:
+    return int.from_bytes(data, "big") if data else 0
+
+
+def _opus_packet_seconds(packet: bytes) -> float:
+    """Duration of one Opus packet from its TOC byte (RFC 6716 §3.1)."""
+    if not packet:
+        return 0.0
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame_ms = (10, 20, 40, 60)[config % 4]
+    elif config < 16:
+        frame_ms = (10, 20)[config % 2]
+    else:
+        frame_ms = (2.5, 5, 10, 20)[config % 4]
+    code = toc & 0x03
+    if code == 0:
+        count = 1
+    elif code in (1, 2):
+        count = 2
+    else:
+        count = packet[1] & 0x3F if len(packet) > 1 else 1
+    return frame_ms * count / 1000
+
+
+def webm_duration(data: bytes) -> Optional[float]:
+    """
+    Duration from Info/Duration when present; otherwise from the last block
+    timecode (MediaRecorder output has no Duration) plus that block's length.
+    """
+    timecode_scale = 1_000_000  # ns per tick (default)
+    info_duration = None
+    cluster_time = 0
+    first_block = None
+    last_block = None
+    last_payload = b""
+
+    pos = 0
+    try:
+        while pos < len(data):
+            element_id, id_len = _read_vint(data, pos, keep_marker=True)
+            size, size_len = _read_vint(data, pos + id_len, keep_marker=False)
+            body = pos + id_len + size_len
+
+            if element_id in _MASTER_IDS:
+                pos = body  # descend (also handles unknown-size Segment/Cluster)
+                continue
+            if size is None:
+                break
+            end = body + size
+            if end > len(data):
+                # a partial final block still carries its timecode
+                if element_id not in (_SIMPLE_BLOCK, _BLOCK) or body + 4 > len(data):
+                    break
+                end = len(data)
+
+            if element_id == _EBML_ID:
+                pass
+            elif element_id == _TIMECODE_SCALE:
+                timecode_scale = _read_uint(data[body:end])
+            elif element_id == _DURATION:
+                fmt = ">f" if size == 4 else ">d"
+                info_duration = struct.unpack(fmt, data[body:end])[0]
+            elif element_id == _CLUSTER_TIMECODE:
+                cluster_time = _read_uint(data[body:end])
+            elif element_id in (_SIMPLE_BLOCK, _BLOCK):
+                _, track_len = _read_vint(data, body, keep_marker=False)
+                relative = struct.unpack(">h", data[body + track_len:body + track_len + 2])[0]
+                block_time = cluster_time + relative
+                if first_block is None:
+                    first_block = block_time
+                if last_block is None or block_time >= last_block:
+                    last_block = block_time
+                    last_payload = data[body + track_len + 3:end]
+            pos = end
+    except (ValueError, IndexError, struct.error):
+        pass  # use what was parsed so far
+
+    if info_duration:
+        return info_duration * timecode_scale / 1e9
+    if last_block is None:
+        return None
+    return (last_block - first_block) * timecode_scale / 1e9 + _opus_packet_seconds(last_payload)
+
+
+# ── Ogg / Opus ───────────────────────────────────────────────────────────────
+
+def ogg_opus_duration(data: bytes) -> Optional[float]:
+    """
+    Sum of (last granule - pre-skip) over each logical stream. Streamed
+    per-sentence TTS chunks arrive as chained Ogg streams, each starting
+    its granule positions from zero again.
+    """
+    total = 0.0
+    pre_skip, granule = 0, -1
+    pos = data.find(b"OggS")
+    while 0 <= pos and pos + 27 <= len(data):
+        header_type = data[pos + 5]
+        segments = data[pos + 26]
+        body = pos + 27 + segments
+        if body > len(data):
+            break
+        if header_type & 0x02:  # beginning of a new logical stream
+            if granule > 0:
+                total += max(0, granule - pre_skip) / 48000
+            pre_skip, granule = 0, -1
+            if data[body:body + 8] == b"OpusHead" and body + 12 <= len(data):
+                pre_skip = struct.unpack("<H", data[body + 10:body + 12])[0]
+        page_granule = struct.unpack("<q", data[pos + 6:pos + 14])[0]
+        if page_granule > 0:
+            granule = page_granule
+        pos = data.find(b"OggS", body + sum(data[pos + 27:body]))
+    if granule > 0:
+        total += max(0, granule - pre_skip) / 48000
+    return total or None
+
+
+# ── WAV ──────────────────────────────────────────────────────────────────────
+
+def wav_duration(data: bytes) -> Optional[float]:
+    pos = 12
+    byte_rate = None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        if chunk_id == b"fmt ":
+            byte_rate = struct.unpack("<I", data[pos + 16:pos + 20])[0]
+        elif chunk_id == b"data" and byte_rate:
+            return min(size, len(data) - pos - 8) / byte_rate
+        pos += 8 + size + (size & 1)
+    return None
+
+
+def probe_duration(data: bytes) -> Optional[float]:
+    """Duration in seconds from headers only, or None if the format is not recognised."""
+    if not data or len(data) < 4:
+        return None
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return webm_duration(data)
+    if data[:4] == b"OggS":
+        return ogg_opus_duration(data)
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return wav_duration(data)
+    if data[:3] == b"ID3" or (data[0] == 0xFF and (data[1] & 0xE0) == 0xE0):
+        return mp3_duration(data)
+    return None
@@ -0,0 +1,65 @@
+"""
+TTS audio formats.
+
+The live stream format is negotiated per client (``audio_formats`` query
+parameter on the live WebSocket, in preference order) and announced in the
+``connected`` message. Stored audio is independent of it: per-turn
+segments are kept self-describing (raw PCM is wrapped in WAV) and the full
+recording is always encoded as RECORDING_ARCHIVE_FORMAT.
+"""
+
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.config.settings import settings
+
+# name → ElevenLabs output_format, MIME type for the browser, storage extension
+AUDIO_FORMATS: Dict[str, Dict[str, Any]] = {
+    "mp3": {"elevenlabs": "mp3_22050_32", "mime_type": "audio/mpeg", "extension": "mp3"},
+    "opus": {"elevenlabs": "opus_48000_32", "mime_type": "audio/ogg; codecs=opus", "extension": "ogg"},
+    # raw little-endian int16 mono — for gapless WebAudio scheduling on the client
+    "pcm": {"elevenlabs": "pcm_16000", "mime_type": "audio/pcm", "extension": "wav", "sample_rate": 16000},
+}
+
+# Full-recording encodings: ffmpeg codec args, MIME type, extension
+ARCHIVE_FORMATS: Dict[str, Dict[str, Any]] = {
+    "mp3": {"codec_args": ["-c:a", "libmp3lame", "-b:a", "128k"], "mime_type": "audio/mpeg", "extension": "mp3"},
+    "opus": {"codec_args": ["-c:a", "libopus", "-b:a", "48k"], "mime_type": "audio/ogg", "extension": "ogg"},
+}
+
+
+def allowed_stream_formats() -> list:
+    return [f.strip() for f in settings.TTS_STREAM_FORMATS.split(",") if f.strip() in AUDIO_FORMATS]
+
+
+def negotiate_audio_format(requested: Optional[Iterable[str]], supported: Optional[Iterable[str]] = None) -> str:
+    """First client-preferred format we can produce; the default format otherwise."""
+    allowed = [f for f in allowed_stream_formats() if supported is None or f in supported]
+    for name in requested or []:
+        name = name.strip().lower()
+        if name in allowed:
+            return name
+    return settings.TTS_DEFAULT_STREAM_FORMAT
+
+
+def format_info(name: str) -> Dict[str, Any]:
+    """Client-facing description of a stream format (sent in the handshake)."""
+    fmt = AUDIO_FORMATS[name]
+    info = {"codec": name, "mime_type": fmt["mime_type"]}
+    if "sample_rate" in fmt:
+        info.update({"sample_rate": fmt["sample_rate"], "channels": 1, "sample_format": "s16le"})
+    return info
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    header = b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVEfmt "
+    header += struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16)
+    return header + b"data" + struct.pack("<I", len(pcm)) + pcm
+
+
+def to_storage_segment(audio_bytes: bytes, name: str) -> Tuple[bytes, str, str]:
+    """(bytes, content_type, extension) for storing one streamed turn."""
+    fmt = AUDIO_FORMATS[name]
+    if name == "pcm":
+        return pcm_to_wav(audio_bytes, fmt["sample_rate"]), "audio/wav", "wav"
+    return audio_bytes, fmt["mime_type"], fmt["extension"]
@@ -0,0 +1,164 @@
+"""
+Incremental visible-text extraction for scraped pages.
+
+The scraper only keeps the first few thousand characters of a page's
+visible text, so there is no need to download the whole page or build a
+document tree. ``extract_visible_text`` decodes the response stream as it
+arrives (charset sniffed from BOM → Content-Type → <meta>), feeds it to a
+stdlib ``HTMLParser`` that skips script/style/nav/footer subtrees, and
+stops reading as soon as enough text is collected or the byte cap is hit.
+Output matches ``BeautifulSoup(...).get_text(separator=" ", strip=True)``
+with those tags decomposed.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import AsyncIterator, List, Optional
+
+SKIPPED_TAGS = {"script", "style", "noscript", "nav", "footer"}
+SNIFF_BYTES = 4096
+FEED_CHARS = 16 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+# Browsers decode these labels as windows-1252 (WHATWG encoding standard)
+_CHARSET_ALIASES = {"iso-8859-1": "cp1252", "latin1": "cp1252", "latin-1": "cp1252", "us-ascii": "cp1252", "ascii": "cp1252"}
+
+
+def _valid_charset(label: Optional[str]) -> Optional[str]:
+    if not label:
+        return None
+    label = label.strip().lower()
+    label = _CHARSET_ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def sniff_charset(content_type: Optional[str], head: bytes) -> str:
+    """Charset for a page: BOM, then the Content-Type header, then a <meta> tag, else UTF-8."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    header = _HEADER_CHARSET.search(content_type or "")
+    meta = _META_CHARSET.search(head[:SNIFF_BYTES])
+    return (
+        _valid_charset(header.group(1) if header else None)
+        or _valid_charset(meta.group(1).decode("ascii", "ignore") if meta else None)
+        or "utf-8"
+    )
+
+
+class VisibleTextExtractor(HTMLParser):
+    """
+    Collects stripped text nodes outside SKIPPED_TAGS until ``max_chars`` is
+    reached; with a ``links`` list, also every ``<a href>`` seen (nav included).
+    """
+
+    def __init__(self, max_chars: int = 3000, links: Optional[List[str]] = None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.links = links
+        self.parts: List[str] = []
+        self.pending: List[str] = []
+        self.pending_length = 0
+        self.length = 0
+        self.skip_depth = 0
+        self.done = False
+
+    def _flush(self):
+        # A text node can arrive in several handle_data calls (one per fed chunk)
+        text = "".join(self.pending).strip()
+        self.pending, self.pending_length = [], 0
+        if text and not self.done:
+            self.parts.append(text)
+            self.length += len(text) + 1
+            self.done = self.length > self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "a" and self.links is not None:
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_data(self, data):
+        if self.skip_depth or self.done:
+            return
+        self.pending.append(data)
+        self.pending_length += len(data)
+        if self.pending_length > self.max_chars:
+            self._flush()
+
+    def feed(self, data: str):
+        # Slice large input so parsing stops soon after the cutoff
+        for start in range(0, len(data), FEED_CHARS):
+            if self.done:
+                return
+            super().feed(data[start:start + FEED_CHARS])
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def text(self) -> str:
+        return " ".join(self.parts)[:self.max_chars]
+
+
+def visible_text(html: str, max_chars: int = 3000) -> str:
+    extractor = VisibleTextExtractor(max_chars)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+async def extract_visible_text(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str] = None,
+    max_chars: int = 3000,
+    max_bytes: int = 1_000_000,
+    links: Optional[List[str]] = None
+) -> str:
+    """
+    Visible text from a byte stream; stops reading at ``max_chars`` of text
+    or ``max_bytes``. Link targets read before then are appended to ``links``.
+    """
+    extractor = VisibleTextExtractor(max_chars, links)
+    decoder = None
+    head = b""
+    received = 0
+
+    async for chunk in chunks:
+        received += len(chunk)
+        if decoder is None:
+            head += chunk
+            if len(head) < SNIFF_BYTES and received < max_bytes:
+                continue
+            decoder = codecs.getincrementaldecoder(sniff_charset(content_type, head))(errors="replace")
+            chunk, head = head, b""
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done or received >= max_bytes:
+            break
+
+    if decoder is None:  # page shorter than the sniffing window
+        decoder = codecs.getincrementaldecoder(sniff_charset(content_type, head))(errors="replace")
+    extractor.feed(decoder.decode(head, final=True))
+    extractor.close()
+    return extractor.text()
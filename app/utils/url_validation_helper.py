@@ -47,7 +47,7 @@ class URLValidationHelper:
     @staticmethod
     async def validate_batch_urls(urls: List[str]) -> Dict[str, Optional[str]]:
         """
-        Validate multiple URLs and return authenticated versions
+        Validate multiple URLs concurrently (bounded, cached) and return authenticated versions
         
         Args:
             urls: List of URLs to validate
@@ -65,11 +65,11 @@ class URLValidationHelper:
             #   "invalid-site.tk": None
             # }
         """
-        results = {}
-        for url in urls:
-            authenticated_url = await URLValidationHelper.validate_and_get_url(url)
-            results[url] = authenticated_url
-        return results
+        validations = await url_validator.validate_many(urls)
+        return {
+            url: result["authenticated_url"] if result["is_valid"] else None
+            for url, result in validations.items()
+        }
 
     @staticmethod
     async def get_validation_details(url: str) -> Dict:
@@ -0,0 +1,41 @@
+"""
+Backfill analytics for sessions that ended without them.
+
+Run:
+    python -m app.workers.analytics_backfill --limit 5000
+    python -m app.workers.analytics_backfill --local      # skip the Batch API
+    python -m app.workers.analytics_backfill --dry-run
+"""
+
+import argparse
+import asyncio
+
+from app.config.database import mongodb
+from app.services.analytics_backfill_service import (
+    AnalyticsBackfillService, LocalBatchClient, analytics_backfill_service
+)
+
+
+async def main(args):
+    await mongodb.connect_db()
+    try:
+        service = AnalyticsBackfillService(LocalBatchClient()) if args.local else analytics_backfill_service
+        summary = await service.run(
+            limit=args.limit,
+            older_than_minutes=args.older_than_minutes,
+            dry_run=args.dry_run
+        )
+        print(f"✅ Backfill summary: {summary}")
+    finally:
+        await mongodb.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill missing conversation analytics")
+    parser.add_argument("--limit", type=int, default=1000, help="Max sessions to process")
+    parser.add_argument("--older-than-minutes", type=int, default=60,
+                        help="Only sessions created before this many minutes ago")
+    parser.add_argument("--local", action="store_true",
+                        help="Run requests directly instead of through the Batch API")
+    parser.add_argument("--dry-run", action="store_true", help="Only count pending sessions")
+    asyncio.run(main(parser.parse_args()))
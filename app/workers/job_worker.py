@@ -0,0 +1,158 @@
+"""
+Background job worker.
+
+Processes jobs from the ``jobs`` collection (post-session analytics,
+recording assembly, company enrichment, ...) outside the API processes.
+
+Run:
+    python -m app.workers.job_worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import traceback
+from contextlib import suppress
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.config.database import mongodb
+from app.config.settings import settings
+from app.services.job_queue_service import job_queue_service
+from app.utils.helpers import generate_id
+
+
+class JobWorker:
+    """
+    Runs ``concurrency`` claim loops against the job queue.
+
+    ``failure_handlers`` are called with ``(payload, error)`` once a job of
+    their type has failed permanently (no retry follows).
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[dict], Awaitable[None]]],
+        concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        failure_handlers: Optional[Dict[str, Callable[[dict, str], Awaitable[None]]]] = None
+    ):
+        self.handlers = handlers
+        self.failure_handlers = failure_handlers or {}
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{generate_id()[:8]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop claiming new jobs; in-flight jobs are allowed to finish."""
+        if not self._stopping.is_set():
+            print(f"🛑 Worker {self.worker_id} stopping after in-flight jobs...")
+            self._stopping.set()
+
+    async def run(self):
+        await job_queue_service.ensure_indexes()
+        print(f"👷 Job worker {self.worker_id} started | concurrency={self.concurrency} "
+              f"| types={', '.join(self.handlers)}")
+        await asyncio.gather(*[self._loop(i) for i in range(self.concurrency)])
+        print(f"👋 Job worker {self.worker_id} stopped")
+
+    async def _loop(self, slot: int):
+        while not self._stopping.is_set():
+            try:
+                job = await job_queue_service.claim(self.worker_id, list(self.handlers))
+            except Exception as e:
+                print(f"❌ Job claim error (slot {slot}): {e}")
+                job = None
+
+            if not job:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: dict):
+        handler = self.handlers[job["type"]]
+        heartbeat = asyncio.create_task(self._heartbeat(job["_id"]))
+        print(f"▶️ Job {job['type']} ({job['_id']}) attempt {job.get('attempts', 1)}")
+        try:
+            try:
+                await handler(job.get("payload", {}))
+            except Exception as e:
+                traceback.print_exc()
+                error = f"{type(e).__name__}: {e}"
+                gave_up = await job_queue_service.fail(job, self.worker_id, error)
+                if gave_up and job["type"] in self.failure_handlers:
+                    await self.failure_handlers[job["type"]](job.get("payload", {}), error)
+            else:
+                await job_queue_service.ack(job["_id"], self.worker_id)
+                print(f"✅ Job {job['type']} ({job['_id']}) done")
+        except Exception as e:
+            # The lease expires and another claim picks the job up again
+            print(f"❌ Could not record the outcome of job {job['type']} ({job['_id']}): {e}")
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def _heartbeat(self, job_id: str):
+        """Keep the lease alive while the handler runs."""
+        interval = max(job_queue_service.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                extended = await job_queue_service.extend_lease(job_id, self.worker_id)
+            except Exception as e:
+                print(f"⚠️ Lease renewal error on job {job_id}: {e}")
+                continue
+            if not extended:
+                print(f"⚠️ Lost lease on job {job_id}")
+                return
+
+
+def default_handlers() -> Dict[str, Callable[[dict], Awaitable[None]]]:
+    from app.services.session_jobs import JOB_HANDLERS
+    from app.services.analytics_backfill_service import analytics_backfill_service
+    from app.services.company_enrichment_service import company_enrichment_service
+    handlers = dict(JOB_HANDLERS)
+    handlers["analytics_backfill"] = analytics_backfill_service.run_job
+    handlers["company_enrichment"] = company_enrichment_service.run_job
+    return handlers
+
+
+def default_failure_handlers() -> Dict[str, Callable[[dict, str], Awaitable[None]]]:
+    from app.services.company_enrichment_service import company_enrichment_service
+    return {"company_enrichment": company_enrichment_service.mark_failed}
+
+
+async def main(concurrency: Optional[int] = None):
+    await mongodb.connect_db()
+    worker = JobWorker(
+        default_handlers(),
+        concurrency=concurrency or settings.JOB_WORKER_CONCURRENCY,
+        failure_handlers=default_failure_handlers()
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        await mongodb.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the background job worker")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"Parallel jobs (default {settings.JOB_WORKER_CONCURRENCY})")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
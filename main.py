@@ -73,16 +73,87 @@
 
 
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config.database import mongodb
+from app.config.settings import settings
 from app.routes import salesperson, company, meeting, conversation
 from app.routes import admin
+from app.services.service_container import container
+
+# -------------------------
+# Startup & Shutdown (lifespan)
+# -------------------------
+
+def _register_warmups():
+    """Background work that must not delay serving (models, caches)."""
+    if settings.STT_ENGINE in ("local", "auto"):
+        # Loading the local model takes a few seconds
+        from app.services.whisper_service import whisper_service
+        container.register_warmup("stt_model", whisper_service.warm_up)
+    # Voice metadata loads after startup instead of blocking the import on ElevenLabs
+    from app.services.voice_catalog_service import voice_catalog_service
+    container.register_warmup("voice_catalog", voice_catalog_service.warm_up)
+    if settings.TTS_CACHE_ENABLED and settings.TTS_CACHE_WARMUP_ON_STARTUP:
+        # Pre-render fallback/filler lines per voice (loads from S3 after the first deploy)
+        from app.services.tts_cache_service import tts_cache_service
+        container.register_warmup("tts_phrase_cache", tts_cache_service.warm_up)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await mongodb.connect_db()
+    from app.services.question_cache_service import question_cache_service
+    from app.services.job_queue_service import job_queue_service
+    from app.services.session_registry_service import session_registry_service
+    from app.services.company_import_service import company_import_service
+
+    async def ensure_indexes(name, coro):
+        try:
+            await coro
+        except Exception as e:
+            print(f"⚠️ Could not create {name} indexes: {e}")
+
+    # Vendor clients (S3 bucket check, ElevenLabs, OpenAI) and indexes in parallel
+    await asyncio.gather(
+        container.start(),
+        ensure_indexes("question cache", question_cache_service.ensure_indexes()),
+        ensure_indexes("job queue", job_queue_service.ensure_indexes()),
+        ensure_indexes("live session", session_registry_service.ensure_indexes()),
+        ensure_indexes("company", company_import_service.ensure_indexes()),
+    )
+    app.state.session_heartbeat_task = asyncio.create_task(session_registry_service.run_heartbeat())
+    _register_warmups()
+    container.start_warmups()
+    if settings.RUN_EMBEDDED_JOB_WORKER:
+        # Dev convenience only — production runs `python -m app.workers.job_worker`
+        from app.workers.job_worker import JobWorker, default_failure_handlers, default_handlers
+        app.state.job_worker = JobWorker(default_handlers(), failure_handlers=default_failure_handlers())
+        app.state.job_worker_task = asyncio.create_task(app.state.job_worker.run())
+    print(f"🚀 AI Sales Training Platform started | DB: {settings.MONGODB_DB_NAME} | worker {session_registry_service.worker_id}")
+
+    yield
+
+    await container.stop_warmups()
+    app.state.session_heartbeat_task.cancel()
+    await session_registry_service.release_worker()
+    if getattr(app.state, "job_worker", None):
+        app.state.job_worker.stop()
+        await app.state.job_worker_task
+    await mongodb.close_db()
+    print("🛑 AI Sales Training Platform stopped")
+
+
 app = FastAPI(
     title="AI Sales Training Platform",
     description="Multi-agent AI conversation platform for sales training",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -94,21 +165,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# -------------------------
-# Startup & Shutdown events
-# -------------------------
-
-@app.on_event("startup")
-async def startup_db():
-    await mongodb.connect_db()
-    from app.config.settings import settings
-    print(f"🚀 AI Sales Training Platform started | DB: {settings.MONGODB_DB_NAME}")
-
-@app.on_event("shutdown")
-async def shutdown_db():
-    await mongodb.close_db()
-    print("🛑 AI Sales Training Platform stopped")
-
 # -------------------------
 # Health checks
 # -------------------------
@@ -128,6 +184,22 @@ async def health_check():
         "database": "connected",
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 once the database answers and required clients are
+    built, 503 otherwise. Also reports which warm-ups (STT model, voice
+    catalog, TTS phrase cache) have finished.
+    """
+    report = container.readiness()
+    try:
+        await asyncio.wait_for(mongodb.client.admin.command("ping"), timeout=2.0)
+        report["database"] = "connected"
+    except Exception as e:
+        report["database"] = f"unavailable: {type(e).__name__}"
+        report["ready"] = False
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
 # -------------------------
 # API Routes
 # -------------------------
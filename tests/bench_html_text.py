@@ -0,0 +1,41 @@
+"""
+CPU and peak-memory comparison of the streaming visible-text extractor
+against the BeautifulSoup pipeline it replaced, over the saved pages in
+tests/fixtures/html. Not part of the test run; invoke it directly:
+
+    python -m tests.bench_html_text [repeat]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from app.utils.html_text import sniff_charset, visible_text
+from tests.test_html_text import load_corpus, soup_text
+
+
+def measure(extract, pages, repeat):
+    tracemalloc.start()
+    started = time.process_time()
+    for _ in range(repeat):
+        for html in pages:
+            extract(html)
+    cpu = time.process_time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main(repeat: int = 50) -> None:
+    corpus = load_corpus()
+    pages = [raw.decode(sniff_charset(None, raw[:2048])) for raw in corpus.values()]
+    size = sum(len(raw) for raw in corpus.values())
+    print(f"📄 {len(pages)} saved pages, {size / 1000:.1f} KB, {repeat} passes")
+
+    for label, extract in (("BeautifulSoup", soup_text), ("streaming", visible_text)):
+        cpu, peak = measure(extract, pages, repeat)
+        print(f"⏱️ {label:<14} {cpu * 1000 / repeat:7.2f} ms/pass   peak {peak / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,204 @@
+"""
+Shared test doubles.
+
+FakeCollection is an in-memory stand-in for a Motor collection, covering
+the calls the services make: find/find_one with simple filters, inserts
+with unique keys, updates with $set/$setOnInsert/$inc/$addToSet on dotted
+paths, and bulk_write. Every call is recorded in ``calls``; a test makes a
+call fail by naming it (and its 1-based call number) in ``fail``.
+"""
+
+import copy
+import itertools
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Optional
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+_ids = itertools.count(1)
+
+_MISSING = object()
+
+_OPERATORS = {
+    "$in": lambda value, arg: value in arg,
+    "$nin": lambda value, arg: value not in arg,
+    "$exists": lambda value, arg: (value is not _MISSING) == bool(arg),
+    "$lt": lambda value, arg: value is not _MISSING and value < arg,
+    "$lte": lambda value, arg: value is not _MISSING and value <= arg,
+    "$gt": lambda value, arg: value is not _MISSING and value > arg,
+    "$gte": lambda value, arg: value is not _MISSING and value >= arg,
+    "$not": lambda value, arg: not all(_OPERATORS[op](value, inner) for op, inner in arg.items()),
+}
+
+
+def _get(doc: Dict[str, Any], path: str):
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else _MISSING
+        elif isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        else:
+            return _MISSING
+        if value is _MISSING:
+            break
+    return value
+
+
+def _parent(doc: Dict[str, Any], path: str):
+    *parts, last = path.split(".")
+    for part in parts:
+        doc = doc.setdefault(part, {})
+    return doc, last
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    for key, condition in (query or {}).items():
+        value = _get(doc, key)
+        if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            if not all(_OPERATORS[op](value, arg) for op, arg in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length else list(self.docs)
+
+
+class FakeCollection:
+    def __init__(
+        self,
+        docs: Iterable[Dict[str, Any]] = (),
+        unique: Iterable[str] = (),
+        fail: Optional[Dict[str, Iterable[int]]] = None,
+        write_errors: Iterable[Dict[str, Any]] = ()
+    ):
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+        for doc in docs:
+            self._store(copy.deepcopy(doc))
+        self.unique = tuple(unique)
+        self.fail = {name: set(numbers) for name, numbers in (fail or {}).items()}
+        self.write_errors = list(write_errors)  # raised once by the next bulk_write
+        self.calls = []
+        self.snapshots = []  # copy of a document after each update to it
+
+    def _store(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc.setdefault("_id", f"id{next(_ids)}")
+        self.docs[doc["_id"]] = doc
+        return doc
+
+    def _record(self, name: str, *args):
+        self.calls.append((name, *args))
+        if sum(call[0] == name for call in self.calls) in self.fail.get(name, ()):
+            raise ConnectionError("connection reset")
+
+    def calls_to(self, name: str):
+        return [call[1:] for call in self.calls if call[0] == name]
+
+    def _duplicate(self, doc: Dict[str, Any]) -> Optional[str]:
+        for key in ("_id", *self.unique):
+            if key in doc and any(other.get(key) == doc[key] for other in self.docs.values()):
+                return f"E11000 duplicate key error: {key}"
+        return None
+
+    def _matching(self, query):
+        return [doc for doc in self.docs.values() if matches(doc, query)]
+
+    def _apply(self, doc: Dict[str, Any], update: Dict[str, Any], inserted: bool = False):
+        for key, value in update.get("$set", {}).items():
+            target, last = _parent(doc, key)
+            target[last] = copy.deepcopy(value)
+        if inserted:
+            for key, value in update.get("$setOnInsert", {}).items():
+                target, last = _parent(doc, key)
+                target[last] = copy.deepcopy(value)
+        for key, value in update.get("$inc", {}).items():
+            target, last = _parent(doc, key)
+            target[last] = target.get(last, 0) + value
+        for key, value in update.get("$addToSet", {}).items():
+            target, last = _parent(doc, key)
+            items = target.setdefault(last, [])
+            for item in value["$each"] if isinstance(value, dict) else [value]:
+                if item not in items:
+                    items.append(copy.deepcopy(item))
+        self.snapshots.append(copy.deepcopy(doc))
+
+    async def create_index(self, keys, **kwargs):
+        self._record("create_index", keys)
+        return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    async def find_one(self, query=None, projection=None):
+        self._record("find_one", query)
+        found = self._matching(query)
+        return copy.deepcopy(found[0]) if found else None
+
+    def find(self, query=None, projection=None, sort=None, limit=0):
+        self._record("find", query)
+        docs = self._matching(query)
+        for field, direction in reversed(sort or []):
+            docs.sort(key=lambda doc: doc.get(field), reverse=direction < 0)
+        return FakeCursor(copy.deepcopy(docs[:limit] if limit else docs))
+
+    async def insert_one(self, doc):
+        self._record("insert_one", doc)
+        doc.setdefault("_id", f"id{next(_ids)}")  # like pymongo, the caller's document gets its _id
+        error = self._duplicate(doc)
+        if error:
+            raise DuplicateKeyError(error, 11000)
+        self._store(copy.deepcopy(doc))
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        self._record("insert_many", len(docs), ordered)
+        errors, inserted = [], 0
+        for index, doc in enumerate(docs):
+            doc.setdefault("_id", f"id{next(_ids)}")
+            error = self._duplicate(doc)
+            if error:
+                errors.append({"index": index, "code": 11000, "errmsg": error})
+                if ordered:
+                    break
+            else:
+                self._store(copy.deepcopy(doc))
+                inserted += 1
+        if errors:
+            raise BulkWriteError({"nInserted": inserted, "writeErrors": errors})
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+    async def update_one(self, query, update, upsert=False):
+        self._record("update_one", query, update)
+        found = self._matching(query)
+        if found:
+            self._apply(found[0], update)
+        elif upsert:
+            doc = self._store({key: value for key, value in query.items() if not isinstance(value, dict)})
+            self._apply(doc, update, inserted=True)
+        return SimpleNamespace(matched_count=len(found[:1]), modified_count=len(found[:1]))
+
+    async def update_many(self, query, update):
+        self._record("update_many", query, update)
+        found = self._matching(query)
+        for doc in found:
+            self._apply(doc, update)
+        return SimpleNamespace(matched_count=len(found), modified_count=len(found))
+
+    async def bulk_write(self, operations, ordered=True):
+        """Records the operations without applying them."""
+        self._record("bulk_write", list(operations), ordered)
+        if self.write_errors:
+            errors, self.write_errors = self.write_errors, []
+            raise BulkWriteError({"writeErrors": errors})
+        return SimpleNamespace(modified_count=len(operations))
@@ -0,0 +1,128 @@
+"""
+Analytics backfill tests.
+
+Runs a full backfill chunk through LocalBatchClient (the Batch API stub)
+against in-memory collections: requests are built per session, responses are
+parsed, and results land in a single bulk_write.
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.services import analytics_backfill_service as backfill_module
+from app.services.analytics_backfill_service import AnalyticsBackfillService, LocalBatchClient
+from app.utils.helpers import current_timestamp
+from tests.conftest import FakeCollection
+
+
+def make_conversation(session_id, texts):
+    return {
+        "_id": f"conv_{session_id}", "session_id": session_id, "meeting_id": "m1",
+        "turns": [
+            {"speaker": "salesperson" if i % 2 == 0 else "rep_1",
+             "speaker_name": "Salesperson" if i % 2 == 0 else "Alice", "text": t}
+            for i, t in enumerate(texts)
+        ],
+        "total_turns": len(texts), "salesperson_talk_time": 30.0, "representatives_talk_time": 10.0,
+    }
+
+
+def run_chunk(conversations, responder):
+    conv_col = FakeCollection(conversations)
+    collections = {
+        "get_meeting_collection": FakeCollection([{"_id": "m1", "salesperson_id": "s1", "company_id": "c1"}]),
+        "get_salesperson_collection": FakeCollection([{"_id": "s1", "product_name": "SalesBot"}]),
+        "get_company_collection": FakeCollection([{"_id": "c1", "company_data": {"industry": "SaaS"}}]),
+        "get_conversation_collection": conv_col,
+    }
+    patches = [patch.object(backfill_module, name, return_value=col) for name, col in collections.items()]
+    for p in patches:
+        p.start()
+    try:
+        service = AnalyticsBackfillService(LocalBatchClient(responder))
+        counts = asyncio.run(service._process_chunk(conversations, dry_run=False))
+    finally:
+        for p in patches:
+            p.stop()
+    return counts, conv_col
+
+
+def test_backfill_writes_parsed_analytics_in_one_bulk_write():
+    seen_bodies = []
+
+    async def responder(body):
+        seen_bodies.append(body)
+        return json.dumps({"overall_score": 70, "summary": "ok"})
+
+    conversations = [make_conversation("s_a", ["Hi?", "Hello"]), make_conversation("s_b", ["What now?", "Budget"])]
+    counts, conv_col = run_chunk(conversations, responder)
+
+    assert counts == {"submitted": 2, "written": 2, "failed": 0}
+    assert len(seen_bodies) == 2
+    assert seen_bodies[0]["response_format"] == {"type": "json_object"}
+    assert len(conv_col.calls_to("bulk_write")) == 1
+
+    update = conv_col.calls_to("bulk_write")[0][0][0]._doc["$set"]["analytics"]
+    assert update["overall_score"] == 70
+    assert update["salesperson_talk_ratio"] == 75.0
+
+
+def test_failed_requests_are_skipped():
+    async def responder(body):
+        if "What now?" in body["messages"][-1]["content"]:
+            raise RuntimeError("rate limited")
+        return json.dumps({"overall_score": 50})
+
+    conversations = [make_conversation("s_a", ["Hi?", "Hello"]), make_conversation("s_b", ["What now?", "Budget"])]
+    counts, conv_col = run_chunk(conversations, responder)
+
+    assert counts == {"submitted": 2, "written": 1, "failed": 1}
+    assert len(conv_col.calls_to("bulk_write")[0][0]) == 1
+
+
+def test_unparseable_output_is_left_pending():
+    async def responder(body):
+        if "What now?" in body["messages"][-1]["content"]:
+            return "Sorry, I can't help with that."
+        return json.dumps({"overall_score": 50})
+
+    conversations = [make_conversation("s_a", ["Hi?", "Hello"]), make_conversation("s_b", ["What now?", "Budget"])]
+    counts, conv_col = run_chunk(conversations, responder)
+
+    # no empty analytics is written for s_b, so it is picked up again next run
+    assert counts == {"submitted": 2, "written": 1, "failed": 1}
+    assert [op._filter["session_id"] for op in conv_col.calls_to("bulk_write")[0][0]] == ["s_a"]
+
+    # ...but the failed attempt is counted, so it cannot block the queue forever
+    (failures, _), = conv_col.calls_to("bulk_write")[1:]
+    assert [op._filter["session_id"] for op in failures] == ["s_b"]
+    assert failures[0]._doc["$inc"] == {"analytics_backfill.attempts": 1}
+    assert "not a JSON object" in failures[0]._doc["$set"]["analytics_backfill.last_error"]
+
+
+def test_sessions_at_max_attempts_are_not_picked_up():
+    old = current_timestamp() - timedelta(days=1)
+    conversations = FakeCollection([
+        dict(make_conversation(session_id, ["Hi?"]), created_at=old - timedelta(minutes=i), **extra)
+        for i, (session_id, extra) in enumerate([
+            ("fresh", {}),
+            ("retried", {"analytics_backfill": {"attempts": 2}}),
+            ("given_up", {"analytics_backfill": {"attempts": 3}}),
+        ])
+    ])
+    service = AnalyticsBackfillService(LocalBatchClient())
+    service.max_attempts = 3
+    with patch.object(backfill_module, "get_conversation_collection", return_value=conversations):
+        pending = asyncio.run(service.find_pending_sessions(limit=10, older_than_minutes=60))
+    assert [c["session_id"] for c in pending] == ["retried", "fresh"]
+
+
+def test_parse_batch_output_ignores_non_200_lines():
+    output = "\n".join([
+        json.dumps({"custom_id": "a", "response": {"status_code": 200,
+                    "body": {"choices": [{"message": {"content": "{}"}}]}}, "error": None}),
+        json.dumps({"custom_id": "b", "response": {"status_code": 500, "body": {}}, "error": None}),
+    ])
+    assert AnalyticsBackfillService.parse_batch_output(output) == {"a": "{}"}
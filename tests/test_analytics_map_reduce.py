@@ -0,0 +1,66 @@
+"""
+Map-reduce analytics tests: transcripts are split into token-bounded
+windows of whole turns, and a failed window is reported as a partial result
+instead of being silently left out of the merge.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import openai_service as openai_module
+from app.services.openai_service import OpenAIService
+
+
+def test_windows_hold_whole_turns_within_budget():
+    service = OpenAIService()
+    lines = [f"[Alice]: {'word ' * 20}{i}" for i in range(10)]  # ~27 tokens each
+    windows = service._split_transcript_windows(lines, window_tokens=60)
+
+    assert len(windows) == 5
+    assert "\n".join(windows).split("\n") == lines  # order kept, nothing split or dropped
+    assert all(service._estimate_tokens(w) <= 60 for w in windows)
+
+    # a single turn larger than the budget gets a window of its own
+    assert service._split_transcript_windows(["x" * 400, "short"], window_tokens=50) == ["x" * 400, "short"]
+    assert service._split_transcript_windows([], window_tokens=50) == []
+
+
+class FakeCompletions:
+    def __init__(self, fail_part):
+        self.fail_part = fail_part
+        self.reduce_input = None
+
+    async def create(self, model, messages, **kwargs):
+        user = messages[-1]["content"]
+        if user.startswith("PARTIAL ANALYSES"):
+            self.reduce_input = json.loads(user.split("\n\n", 1)[1])
+            content = json.dumps({"overall_score": 60, "summary": "merged"})
+        elif user.startswith(f"TRANSCRIPT PART {self.fail_part}/"):
+            raise RuntimeError("rate limited")
+        else:
+            content = json.dumps({"key_points": [user.split(":")[0]]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_failed_window_marks_result_partial():
+    service = OpenAIService()
+    completions = FakeCompletions(fail_part=2)
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    lines = [f"[Alice]: {'word ' * 20}{i}" for i in range(6)]
+
+    with patch.object(openai_module, "client", fake_client), \
+            patch.object(openai_module.settings, "ANALYTICS_WINDOW_TOKENS", 60):
+        analytics = asyncio.run(service._map_reduce_analytics(lines, {}, {}))
+
+    assert analytics["summary"] == "merged"
+    assert (analytics["windows_total"], analytics["windows_failed"], analytics["partial"]) == (3, 1, True)
+    # the merge saw the two windows that succeeded, in order
+    assert [p["key_points"] for p in completions.reduce_input] == [["TRANSCRIPT PART 1/3"], ["TRANSCRIPT PART 3/3"]]
+
+    completions.fail_part = None
+    with patch.object(openai_module, "client", fake_client), \
+            patch.object(openai_module.settings, "ANALYTICS_WINDOW_TOKENS", 60):
+        analytics = asyncio.run(service._map_reduce_analytics(lines, {}, {}))
+    assert analytics["windows_failed"] == 0 and analytics["partial"] is False
@@ -0,0 +1,61 @@
+"""
+Header-only duration probe tests.
+
+MP3 input is built frame by frame (MPEG2 Layer III, 22.05 kHz, 32 kbps —
+the ElevenLabs ``mp3_22050_32`` format); WebM/Opus comes from the bundled
+ffmpeg written to a pipe, like MediaRecorder output (no Duration element).
+"""
+
+import subprocess
+
+import imageio_ffmpeg
+
+from app.utils.audio_duration import mp3_duration, probe_duration, webm_duration
+
+# MPEG2, Layer III, no CRC | 32 kbps, 22050 Hz, no padding
+MP3_HEADER = bytes([0xFF, 0xF3, 0x40, 0x00])
+MP3_FRAME_LEN = 576 // 8 * 32000 // 22050  # 104 bytes, 576 samples
+
+
+def make_mp3(frames):
+    return b"".join(MP3_HEADER + b"\x00" * (MP3_FRAME_LEN - 4) for _ in range(frames))
+
+
+def test_mp3_frames_sum_to_exact_duration():
+    data = b"ID3\x03\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10 + make_mp3(100)
+    assert abs(mp3_duration(data) - 100 * 576 / 22050) < 1e-9
+    assert probe_duration(data) == mp3_duration(data)
+
+    # concatenated TTS chunks and a truncated final frame
+    assert abs(probe_duration(make_mp3(50) + make_mp3(50) + MP3_HEADER) - 100 * 576 / 22050) < 1e-9
+
+
+def test_webm_opus_from_block_timecodes():
+    data = subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error",
+         "-f", "lavfi", "-i", "sine=frequency=440:duration=2.5",
+         "-c:a", "libopus", "-f", "webm", "-"],
+        capture_output=True, check=True
+    ).stdout
+    assert abs(webm_duration(data) - 2.5) < 0.05
+    # a fragment cut mid-stream still yields the duration so far
+    assert 0.5 < probe_duration(data[:len(data) // 2]) < 2.0
+
+
+def test_unknown_audio_returns_none():
+    assert probe_duration(b"not audio at all") is None
+    assert probe_duration(b"") is None
+
+
+def test_chained_ogg_opus_streams_are_summed():
+    def ogg(seconds):
+        return subprocess.run(
+            [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+             "-c:a", "libopus", "-f", "ogg", "-"],
+            capture_output=True, check=True
+        ).stdout
+
+    # per-sentence TTS chunks concatenated into one turn
+    assert abs(probe_duration(ogg(1.5)) - 1.5) < 0.05
+    assert abs(probe_duration(ogg(1.5) + ogg(2.0)) - 3.5) < 0.05
@@ -0,0 +1,27 @@
+"""
+TTS stream format negotiation tests.
+"""
+
+import os
+from unittest.mock import patch
+
+with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.utils.audio_formats import negotiate_audio_format, to_storage_segment
+    from app.utils.audio_duration import probe_duration
+
+
+def test_negotiation_follows_client_preference():
+    assert negotiate_audio_format(["opus", "mp3"]) == "opus"
+    assert negotiate_audio_format(["flac", "pcm"]) == "pcm"
+    # unknown, empty or unsupported by the TTS client → default
+    assert negotiate_audio_format(["flac"]) == "mp3"
+    assert negotiate_audio_format([""]) == "mp3"
+    assert negotiate_audio_format(None) == "mp3"
+    assert negotiate_audio_format(["opus"], supported=["mp3"]) == "mp3"
+
+
+def test_pcm_is_stored_as_wav():
+    pcm = b"\x00\x00" * 16000
+    stored, content_type, extension = to_storage_segment(pcm, "pcm")
+    assert (content_type, extension) == ("audio/wav", "wav")
+    assert probe_duration(stored) == 1.0
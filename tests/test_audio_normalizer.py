@@ -0,0 +1,54 @@
+"""
+Audio normalization tests.
+
+Input is a 48 kHz stereo WAV (0.5s silence, 1s tone, 0.5s silence); the
+stage must output 16 kHz mono with the silence trimmed to the padding.
+"""
+
+import asyncio
+import io
+import math
+import struct
+import wave
+
+from app.services.audio_normalizer import AudioNormalizer
+
+
+def make_wav(sample_rate=48000, channels=2, silence_s=0.5, tone_s=1.0):
+    frames = []
+    total = int(sample_rate * (2 * silence_s + tone_s))
+    for i in range(total):
+        t = i / sample_rate
+        value = int(8000 * math.sin(2 * math.pi * 440 * t)) if silence_s <= t < silence_s + tone_s else 0
+        frames.append(struct.pack("<" + "h" * channels, *([value] * channels)))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"".join(frames))
+    return buffer.getvalue()
+
+
+def test_normalize_downmixes_resamples_and_trims():
+    normalizer = AudioNormalizer()
+    audio = asyncio.run(normalizer.normalize(make_wav()))
+
+    assert audio.sample_rate == 16000
+    assert abs(audio.original_duration_seconds - 2.0) < 0.05
+    # 1s of tone plus up to the trim padding on each side
+    padding = normalizer.trim_padding_ms / 1000
+    assert 1.0 <= audio.duration_seconds <= 1.0 + 2 * padding + 0.05
+
+    with wave.open(io.BytesIO(audio.to_wav())) as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getframerate() == 16000
+        assert wav.getnframes() == len(audio.samples)
+
+
+def test_silence_only_is_empty_and_garbage_is_rejected():
+    normalizer = AudioNormalizer()
+    silent = asyncio.run(normalizer.normalize(make_wav(tone_s=0.0)))
+    assert silent is not None and silent.is_empty
+
+    assert asyncio.run(normalizer.normalize(b"\x1a\x45\xdf\xa3" + b"\x00" * 500)) is None
@@ -0,0 +1,96 @@
+"""
+Company enrichment cache tests: domains normalize to one key, a fresh
+entry is served without scraping, and only stale fields are re-fetched.
+"""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.services import company_enrichment_cache_service as cache_module
+from app.services.company_enrichment_cache_service import CompanyEnrichmentCacheService, FIELD_TTLS
+from app.utils.helpers import current_timestamp
+from tests.conftest import FakeCollection
+
+
+def scraped(**fields):
+    data = {"data_sources": ["Company Website"], "data_source_timings": {
+        name: {"status": "ok"} for name in ("website", "wikipedia", "ai_search", "pagespeed")
+    }}
+    data.update(fields)
+    return data
+
+
+def run(service, collection, result):
+    calls = []
+
+    async def fake_scrape(url, on_late_result=None, sources=None, website_cache=None, on_progress=None):
+        calls.append(sources)
+        return result
+
+    with patch.object(cache_module, "get_company_enrichment_collection", return_value=collection), \
+            patch.object(cache_module.scraper, "scrape_company_data", side_effect=fake_scrape):
+        data = asyncio.run(service.get_or_scrape("https://www.Acme.com/about"))
+    return data, calls
+
+
+def test_normalize_domain():
+    normalize = CompanyEnrichmentCacheService.normalize_domain
+    assert normalize("https://WWW.Acme.com:443/about?x=1") == "acme.com"
+    assert normalize("acme.com") == "acme.com"
+    assert normalize("http://shop.acme.com/") == "shop.acme.com"
+
+
+def test_fresh_entry_is_served_without_scraping():
+    service = CompanyEnrichmentCacheService()
+    collection = FakeCollection()
+
+    data, calls = run(service, collection, scraped(industry="Aerospace", tech_stack=["React"]))
+    assert calls == [{"website", "wikipedia", "ai_search", "pagespeed"}]
+    assert set(collection.docs["acme.com"]["field_fetched_at"]) == set(FIELD_TTLS)
+
+    data, calls = run(service, collection, scraped())
+    assert calls == []
+    assert data["industry"] == "Aerospace"
+    assert collection.docs["acme.com"]["hits"] == 1
+
+
+def test_only_stale_fields_are_refreshed():
+    service = CompanyEnrichmentCacheService()
+    collection = FakeCollection()
+    run(service, collection, scraped(industry="Aerospace", latest_news=["Old launch"], tech_stack=["React"]))
+
+    # Age only the fast fields (news, hiring, reviews) past their TTL
+    fetched = collection.docs["acme.com"]["field_fetched_at"]
+    for field, ttl in FIELD_TTLS.items():
+        if ttl == "COMPANY_CACHE_FAST_TTL_SECONDS":
+            fetched[field] -= timedelta(days=2)
+
+    data, calls = run(service, collection, scraped(industry="Changed", latest_news=["New launch"]))
+    assert calls == [{"website", "wikipedia", "ai_search"}]  # tech stack still fresh: no PageSpeed
+    assert data["latest_news"] == ["New launch"]
+    assert data["industry"] == "Aerospace"  # still fresh, kept from the cache
+    assert data["tech_stack"] == ["React"]
+    assert current_timestamp() - fetched["latest_news"] < timedelta(minutes=1)
+
+
+def test_late_result_survives_the_main_write():
+    service = CompanyEnrichmentCacheService()
+    collection = FakeCollection()
+
+    async def fake_scrape(url, on_late_result=None, sources=None, website_cache=None, on_progress=None):
+        # PageSpeed is still pending at return, but its late merge lands before the main write
+        result = scraped(industry="Aerospace")
+        result["data_source_timings"]["pagespeed"] = {"status": "pending"}
+        await on_late_result({"tech_stack": ["React"], "data_sources": ["PageSpeed Insights"]})
+        return result
+
+    with patch.object(cache_module, "get_company_enrichment_collection", return_value=collection), \
+            patch.object(cache_module.scraper, "scrape_company_data", side_effect=fake_scrape):
+        asyncio.run(service.get_or_scrape("https://acme.com"))
+
+    doc = collection.docs["acme.com"]
+    assert doc["data"]["tech_stack"] == ["React"]
+    assert doc["data"]["industry"] == "Aerospace"
+    assert set(doc["data"]["data_sources"]) == {"Company Website", "PageSpeed Insights"}
+    assert "tech_stack" in doc["field_fetched_at"] and doc["hits"] == 0
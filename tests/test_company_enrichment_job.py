@@ -0,0 +1,79 @@
+"""
+Background company enrichment tests: the job writes source progress into
+the company document before the final fields, and the SSE stream ends
+with a ``done`` event.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from app.services import company_enrichment_service as enrichment_module
+from app.services.company_enrichment_service import CompanyEnrichmentService
+from tests.conftest import FakeCollection
+
+
+def company():
+    return {"_id": "c1", "company_data": {}, "enrichment_status": "queued", "enrichment": {"sources": {}}}
+
+
+def test_job_writes_progress_then_fields():
+    companies = FakeCollection([company()])
+
+    async def fake_get_or_scrape(url, on_late_result=None, fresh=False, on_progress=None):
+        await on_progress("pagespeed", {"status": "ok"}, {"tech_stack": ["React"]})
+        await on_progress("website", {"status": "ok"}, "Acme builds rockets.")
+        return {"industry": "Aerospace", "tech_stack": [], "data_sources": ["Company Website"]}
+
+    with patch.object(enrichment_module, "get_company_collection", return_value=companies), \
+            patch.object(enrichment_module.company_enrichment_cache_service, "get_or_scrape",
+                         side_effect=fake_get_or_scrape):
+        asyncio.run(CompanyEnrichmentService().run_job({"company_id": "c1", "company_url": "https://acme.com"}))
+
+    statuses = [s["enrichment_status"] for s in companies.snapshots]
+    assert statuses[0] == "running" and statuses[-1] == "complete"
+    # The tech stack was visible before extraction finished, and an empty final value did not erase it
+    assert companies.snapshots[1]["company_data"]["tech_stack"] == ["React"]
+    assert "industry" not in companies.snapshots[2]["company_data"]
+    final = companies.docs["c1"]
+    assert final["company_data"]["industry"] == "Aerospace"
+    assert final["company_data"]["tech_stack"] == ["React"]
+    assert set(final["enrichment"]["sources"]) == {"pagespeed", "website"}
+
+
+def test_failed_attempt_is_retrying_until_the_queue_gives_up():
+    companies = FakeCollection([company()])
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    with patch.object(enrichment_module, "get_company_collection", return_value=companies), \
+            patch.object(enrichment_module.company_enrichment_cache_service, "get_or_scrape", side_effect=broken):
+        try:
+            asyncio.run(CompanyEnrichmentService().run_job({"company_id": "c1", "company_url": "https://acme.com"}))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("job should raise so the queue retries it")
+
+        # Not terminal yet: a stream keeps following the company instead of ending
+        assert companies.docs["c1"]["enrichment_status"] == "retrying"
+        assert "boom" in companies.docs["c1"]["enrichment"]["error"]
+        assert "retrying" not in enrichment_module.TERMINAL_STATES
+
+        asyncio.run(CompanyEnrichmentService().mark_failed({"company_id": "c1"}, "RuntimeError: boom"))
+    assert companies.docs["c1"]["enrichment_status"] == "failed"
+    assert companies.docs["c1"]["enrichment"]["finished_at"]
+
+
+def test_event_stream_ends_with_done():
+    doc = company()
+    doc.update({"enrichment_status": "complete", "company_data": {"industry": "Aerospace"}})
+    companies = FakeCollection([doc])
+
+    async def collect():
+        return [event async for event in CompanyEnrichmentService().stream_events("c1")]
+
+    with patch.object(enrichment_module, "get_company_collection", return_value=companies):
+        events = asyncio.run(collect())
+    assert len(events) == 1
+    assert events[0].startswith("event: done\n") and "Aerospace" in events[0]
@@ -0,0 +1,122 @@
+"""
+Bulk company import tests: domains are deduplicated before validation,
+validation is bounded, companies are written with one insert_many per
+batch, enrichment is queued in one write, and every row gets an event.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from app.services import company_import_service as import_module
+from app.services.company_import_service import CompanyImportService
+from tests.conftest import FakeCollection
+
+
+def run_import(service, companies, urls, enqueue_fails=False, **kwargs):
+    state = {"in_flight": 0, "max_in_flight": 0}
+    validated = []
+    enqueued = []
+
+    async def validate(url):
+        validated.append(url)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        domain = url.replace("https://", "").strip("/")
+        return {"is_valid": "broken" not in url, "authenticated_url": f"https://{domain}", "domain": domain,
+                "ssl_valid": True, "ssl_certificate": None, "errors": ["unreachable"], "warnings": []}
+
+    async def cached(url):
+        return {"industry": "Cached"} if "cached" in url else None
+
+    async def enqueue_many(pairs, refresh_cache=False):
+        if enqueue_fails:
+            raise ConnectionError("queue unavailable")
+        enqueued.append(pairs)
+        return [company_id for company_id, _ in pairs]
+
+    async def collect():
+        return [event async for event in service.run_import("sp1", urls, **kwargs)]
+
+    with patch.object(import_module, "get_company_collection", return_value=companies), \
+            patch.object(import_module.url_validator, "validate_and_authenticate_url", side_effect=validate), \
+            patch.object(import_module.company_enrichment_cache_service, "cached", side_effect=cached), \
+            patch.object(import_module.company_enrichment_service, "enqueue_many", side_effect=enqueue_many):
+        events = asyncio.run(collect())
+    return events, validated, enqueued, state
+
+
+def test_import_dedupes_validates_and_batches_writes():
+    companies = FakeCollection([{"_id": "old", "salesperson_id": "sp1", "company_url": "https://www.existing.com"}])
+    urls = [f"company{i}.com" for i in range(10)] + [
+        "https://Company0.com/", "existing.com", "broken.com", "cached.com", ""
+    ]
+    service = CompanyImportService()
+    service.insert_batch_size = 4
+
+    events, validated, enqueued, state = run_import(service, companies, urls, concurrency=3)
+
+    rows = {e["row"]: e for e in events if e["type"] == "row"}
+    assert sorted(rows) == list(range(len(urls)))  # one event per input row
+    assert rows[10]["status"] == "duplicate" and rows[10]["duplicate_of_row"] == 0
+    assert rows[11]["status"] == "duplicate" and rows[11]["company_id"] == "old"
+    assert rows[12]["status"] == "invalid" and rows[14]["status"] == "invalid"
+    assert rows[13]["enrichment_status"] == "complete"
+
+    # Duplicates never reach the validator, which runs at most 3 at a time
+    assert len(validated) == 12 and state["max_in_flight"] == 3
+    assert [size for size, _ in companies.calls_to("insert_many")] == [4, 4, 3]
+    assert sum(len(batch) for batch in enqueued) == 10
+
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert (summary["created"], summary["duplicate"], summary["invalid"], summary["failed"]) == (11, 2, 2, 0)
+    assert all(doc.get("import_id") == summary["import_id"] for key, doc in companies.docs.items() if key != "old")
+
+
+def test_failed_inserts_are_reported_per_row():
+    # another salesperson already has b.com, and company_url is unique
+    companies = FakeCollection([{"salesperson_id": "sp2", "company_url": "https://b.com"}], unique=["company_url"])
+    events, _, enqueued, _ = run_import(CompanyImportService(), companies, ["a.com", "b.com", "c.com"])
+
+    rows = {e["url"]: e for e in events if e["type"] == "row"}
+    assert rows["b.com"]["status"] == "failed" and "duplicate key" in rows["b.com"]["errors"][0]
+    assert rows["a.com"]["status"] == rows["c.com"]["status"] == "created"
+    assert sorted(url for _, url in enqueued[0]) == ["https://a.com", "https://c.com"]
+    assert events[-1]["failed"] == 1
+
+
+def test_batch_errors_become_failed_rows_and_summary_is_sent():
+    # second insert_many loses its connection: that batch fails, the others are written
+    companies = FakeCollection(fail={"insert_many": {2}})
+    service = CompanyImportService()
+    service.insert_batch_size = 2
+    events, _, enqueued, _ = run_import(service, companies, [f"c{i}.com" for i in range(5)], concurrency=1)
+
+    failed = [e for e in events if e["type"] == "row" and e["status"] == "failed"]
+    assert len(failed) == 2 and all("connection reset" in e["errors"][0] for e in failed)
+    assert events[-1]["type"] == "summary" and (events[-1]["created"], events[-1]["failed"]) == (3, 2)
+    assert sum(len(batch) for batch in enqueued) == 3
+
+    # enqueue failure: companies exist, so rows name them and their enrichment is marked failed
+    companies = FakeCollection()
+    events, _, _, _ = run_import(CompanyImportService(), companies, ["a.com"], enqueue_fails=True)
+    row = events[1]
+    assert row["status"] == "failed" and row["company_id"] and "could not be queued" in row["errors"][0]
+    assert companies.docs[row["company_id"]]["enrichment_status"] == "failed"
+    assert events[-1]["type"] == "summary" and events[-1]["failed"] == 1
+
+
+def test_summary_is_sent_when_the_import_stops():
+    companies = FakeCollection(fail={"find": {1}})
+    events, _, _, _ = run_import(CompanyImportService(), companies, ["a.com", "b.com"])
+    assert [e["type"] for e in events] == ["start", "summary"]
+    assert events[-1]["unprocessed"] == 2 and "connection reset" in events[-1]["error"]
+
+
+def test_parse_csv():
+    assert CompanyImportService.parse_csv("name,Website\nAcme,acme.com\nNone,\nGlobex,globex.com\n") == [
+        "acme.com", "globex.com"
+    ]
+    assert CompanyImportService.parse_csv("acme.com\nglobex.com") == ["acme.com", "globex.com"]
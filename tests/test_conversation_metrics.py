@@ -0,0 +1,93 @@
+"""
+Conversation metrics engine tests.
+
+Question detection and open/closed classification are lexical, and the
+incremental Mongo update must add up to the same counters as a full
+recomputation over the turn list.
+"""
+
+from app.services.conversation_metrics_service import ConversationMetricsService
+
+
+def salesperson(text, duration=5.0, **extra):
+    return dict({"speaker": "salesperson", "text": text, "duration_seconds": duration}, **extra)
+
+
+def rep(text, duration=6.0):
+    return {"speaker": "rep_1", "text": text, "duration_seconds": duration}
+
+
+def test_classify_question():
+    service = ConversationMetricsService()
+    assert service.classify_question("What keeps you up at night?") == "open"
+    assert service.classify_question("Tell me about your current process") == "open"
+    assert service.classify_question("How many reps do you have?") == "closed"
+    assert service.classify_question("Do you use Salesforce?") == "closed"
+    assert service.classify_question("Can you share the budget") == "closed"
+    assert service.classify_question("We help teams ramp faster.") is None
+    assert service.classify_question("What we do is simple.") is None
+    assert service.classify_question("Have a great day!") is None
+    assert service.classify_question("Can't wait!") is None
+    assert service.classify_question("Would that work for you?") == "closed"
+
+
+def test_turn_metrics_counts_each_question_sentence():
+    service = ConversationMetricsService()
+    m = service.turn_metrics(salesperson(
+        "Thanks for joining. How does your team onboard today? Is it manual? Why?"
+    ))
+    assert m["open_questions"] == 2
+    assert m["closed_questions"] == 1
+    assert m["words"] == 13
+
+    # representative questions are not counted
+    assert service.turn_metrics(rep("What is your pricing?"))["open_questions"] == 0
+
+
+def test_incremental_update_matches_recompute():
+    service = ConversationMetricsService()
+    turns = [
+        salesperson("Hi there. What brought you to us?", 4.0),
+        rep("We need better onboarding.", 3.0),
+        salesperson("Got it. Do you have a budget? How do you decide?", 8.0, interrupted=True),
+        rep("Yes, the VP signs off.", 2.0),
+    ]
+
+    # simulate two saves of two turns each, applying $inc/$max like Mongo would
+    stored = {}
+    for chunk in (turns[:2], turns[2:]):
+        update = service.build_update(chunk)
+        for field, value in update.get("$inc", {}).items():
+            key = field.split(".", 1)[1]
+            stored[key] = stored.get(key, 0) + value
+        for field, value in update.get("$max", {}).items():
+            key = field.split(".", 1)[1]
+            stored[key] = max(stored.get(key, value), value)
+
+    assert stored == service.compute_from_turns(turns)
+    assert stored["questions_asked"] == 3
+    assert stored["open_questions"] == 2
+    assert stored["interruptions"] == 1
+    assert stored["longest_monologue_seconds"] == 8.0
+
+
+def test_merge_update_keeps_existing_operators():
+    service = ConversationMetricsService()
+    update = {"$inc": {"salesperson_talk_time": 5.0}, "$push": {"turns": {"$each": []}}}
+    service.merge_update(update, service.build_update([salesperson("Why now?")]))
+    assert update["$inc"]["salesperson_talk_time"] == 5.0
+    assert update["$inc"]["metrics.open_questions"] == 1
+    assert update["$max"]["metrics.longest_monologue_words"] == 2
+
+
+def test_summarize_derives_rates():
+    service = ConversationMetricsService()
+    conv = {
+        "salesperson_talk_time": 30.0,
+        "representatives_talk_time": 90.0,
+        "turns": [salesperson("one two three four five six seven eight nine ten", 5.0)],
+    }
+    summary = service.summarize(conv)
+    assert summary["salesperson_talk_ratio"] == 25.0
+    assert summary["salesperson_wpm"] == 120.0
+    assert summary["questions_asked"] == 0
@@ -0,0 +1,94 @@
+"""
+Visible-text extraction tests: same text as the BeautifulSoup pipeline it
+replaced (generated pages and the saved pages in tests/fixtures/html),
+charset sniffing, early cutoff on a stream, and the byte cap. The CPU and
+memory comparison lives in tests/bench_html_text.py.
+"""
+
+import asyncio
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.utils.html_text import extract_visible_text, sniff_charset, visible_text
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def load_corpus() -> dict:
+    """Saved pages by file name, as raw bytes."""
+    return {path.name: path.read_bytes() for path in sorted(CORPUS_DIR.glob("*.html"))}
+
+
+def soup_text(html: str) -> str:
+    """The scraper's previous implementation."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "nav", "footer"]):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)[:3000]
+
+
+def make_page(paragraphs: int, seed: int = 0) -> str:
+    head = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Acme Rockets</title>"
+        "<style>body { color: red; }</style><script>var x = '<p>not text</p>';</script></head><body>"
+        "<nav><a href='/'>Home</a><a href='/about'>About</a></nav>"
+    )
+    body = "".join(
+        f"<section><h2>Section {i}</h2><p>Acme &amp; partners build <b>rockets</b> for customer {seed + i}. "
+        f"<script>track({i})</script>Reliable, fast &mdash; and café-friendly.</p>"
+        f"<div><span>Item {i}</span><img src='x.png'><br></div></section>"
+        for i in range(paragraphs)
+    )
+    return head + body + "<footer>© Acme</footer><noscript>Enable JS</noscript></body></html>"
+
+
+async def stream(data: bytes, chunk_size: int = 8192, read=None):
+    for start in range(0, len(data), chunk_size):
+        if read is not None:
+            read.append(chunk_size)
+        yield data[start:start + chunk_size]
+
+
+def test_matches_previous_extraction():
+    for paragraphs in (1, 5, 200):
+        html = make_page(paragraphs)
+        assert visible_text(html) == soup_text(html)
+
+
+def test_matches_previous_extraction_on_saved_pages():
+    corpus = load_corpus()
+    assert len(corpus) >= 5
+    for name, raw in corpus.items():
+        html = raw.decode(sniff_charset(None, raw[:2048]))
+        expected = soup_text(html)
+        assert expected, name
+        assert visible_text(html) == expected, name
+        assert asyncio.run(extract_visible_text(stream(raw, chunk_size=1024))) == expected, name
+
+
+def test_sniff_charset():
+    assert sniff_charset("text/html; charset=ISO-8859-1", b"") == "cp1252"
+    assert sniff_charset(None, b'<html><head><meta charset="shift_jis">') == "shift_jis"
+    assert sniff_charset("text/html", b'<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">') == "koi8-r"
+    assert sniff_charset("text/html; charset=bogus", b"\xef\xbb\xbf<html>") == "utf-8-sig"
+    assert sniff_charset("text/html; charset=bogus", b"<html>") == "utf-8"
+
+
+def test_stream_decodes_and_stops_early():
+    page = make_page(2000).replace("charset='utf-8'", "charset='windows-1252'").encode("cp1252", "replace")
+    read = []
+    text = asyncio.run(extract_visible_text(stream(page, read=read), content_type="text/html"))
+    assert "café-friendly" in text
+    assert len(text) == 3000
+    assert sum(read) < len(page) / 10  # stopped reading long before the end
+
+    # Multi-byte characters split across chunk boundaries survive
+    page = ("<p>" + "é" * 5000 + "</p>").encode("utf-8")
+    assert asyncio.run(extract_visible_text(stream(page, chunk_size=4097))) == "é" * 3000
+
+
+def test_byte_cap():
+    page = ("<script>" + "x" * 50000 + "</script><p>late text</p>").encode()
+    assert asyncio.run(extract_visible_text(stream(page), max_bytes=20000)) == ""
+
@@ -0,0 +1,61 @@
+"""
+Job worker tests: a Mongo error while recording a job's outcome does not
+stop the worker, lease renewal survives a transient error, and failure
+handlers run only once the queue gives up on a job.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.workers import job_worker as worker_module
+from app.workers.job_worker import JobWorker
+
+real_sleep = asyncio.sleep
+
+
+def job():
+    return {"_id": "j1", "type": "demo", "payload": {}, "attempts": 1}
+
+
+def test_ack_and_fail_errors_are_logged_not_raised():
+    async def ok(payload):
+        pass
+
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    queue = worker_module.job_queue_service
+    with patch.object(queue, "ack", AsyncMock(side_effect=ConnectionError("connection reset"))) as ack, \
+            patch.object(queue, "fail", AsyncMock(side_effect=ConnectionError("connection reset"))) as fail:
+        asyncio.run(JobWorker({"demo": ok})._process(job()))
+        asyncio.run(JobWorker({"demo": broken})._process(job()))
+    assert ack.await_count == 1 and fail.await_count == 1
+
+
+def test_heartbeat_survives_a_renewal_error():
+    async def fast_sleep(seconds):
+        await real_sleep(0)
+
+    extend = AsyncMock(side_effect=[ConnectionError("connection reset"), True, False])
+    with patch.object(worker_module.job_queue_service, "extend_lease", extend), \
+            patch.object(worker_module.asyncio, "sleep", fast_sleep):
+        asyncio.run(JobWorker({})._heartbeat("j1"))
+    assert extend.await_count == 3  # kept renewing after the error, stopped when the lease was lost
+
+
+def test_failure_handler_runs_only_when_the_queue_gives_up():
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    gave_up = []
+
+    async def on_failed(payload, error):
+        gave_up.append((payload, error))
+
+    worker = JobWorker({"demo": broken}, failure_handlers={"demo": on_failed})
+    queue = worker_module.job_queue_service
+    with patch.object(queue, "fail", AsyncMock(side_effect=[False, True])):
+        asyncio.run(worker._process(job()))
+        assert gave_up == []  # a retry follows
+        asyncio.run(worker._process(job()))
+    assert gave_up == [({}, "RuntimeError: boom")]
@@ -0,0 +1,47 @@
+"""
+Question cache key tests.
+
+The cache key must be stable across cosmetic differences (case, whitespace)
+in the meeting context, and must change when any keyed field changes.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+with patch("openai.AsyncOpenAI", return_value=MagicMock()), \
+        patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.services.question_cache_service import QuestionCacheService
+
+
+def make_context(**overrides):
+    salesperson = {"product_name": "SalesBot Pro", "description": "AI sales training"}
+    company = {"company_data": {"industry": "SaaS", "company_size": "200 employees"}}
+    goal = "Book a demo"
+    salesperson.update({k: v for k, v in overrides.items() if k in salesperson})
+    company["company_data"].update({k: v for k, v in overrides.items() if k in company["company_data"]})
+    return salesperson, company, overrides.get("meeting_goal", goal)
+
+
+def test_key_ignores_case_and_whitespace():
+    service = QuestionCacheService()
+    base = service.build_cache_key(*make_context())
+    noisy = service.build_cache_key(*make_context(
+        product_name="  salesbot   PRO ", meeting_goal="book a  demo\n"
+    ))
+    assert base == noisy
+
+
+def test_key_changes_with_each_field():
+    service = QuestionCacheService()
+    base = service.build_cache_key(*make_context())
+    for field, value in [
+        ("product_name", "Other"), ("description", "Other"), ("industry", "FinTech"),
+        ("company_size", "10 employees"), ("meeting_goal", "Close the deal"),
+    ]:
+        assert service.build_cache_key(*make_context(**{field: value})) != base, field
+
+
+def test_key_tolerates_missing_company_data():
+    service = QuestionCacheService()
+    assert service.build_cache_key({"product_name": "X"}, None, "goal") == \
+        service.build_cache_key({"product_name": "X"}, {"company_data": {}}, "goal")
@@ -0,0 +1,72 @@
+"""
+Representative bulk writes: add_representatives issues one ordered
+insert_many, and the bulk endpoint sends creates, updates and deletes in
+one bulk_write, reporting per-item failures without aborting the rest.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from pymongo import DeleteOne, InsertOne, UpdateOne
+
+from app.models.schemas import RepresentativeBulkWrite, RepresentativeCreate
+from app.routes import company as company_routes
+from tests.conftest import FakeCollection
+
+
+def call(route, reps, *args):
+    companies = FakeCollection([{"_id": "c1"}])
+    with patch.object(company_routes, "get_company_collection", return_value=companies), \
+            patch.object(company_routes, "get_representative_collection", return_value=reps):
+        return asyncio.run(route(*args))
+
+
+def rep(name):
+    return RepresentativeCreate(name=name, role="CTO")
+
+
+def test_add_representatives_uses_one_insert_many():
+    reps = FakeCollection()
+    response = call(company_routes.add_representatives, reps, "c1", [rep(f"Rep {i}") for i in range(50)])
+
+    assert response["success"]
+    assert reps.calls_to("insert_many") == [(50, True)]
+    assert len(response["data"]["representative_ids"]) == 50
+    assert all(doc["company_id"] == "c1" and doc["role"] == "CTO" for doc in reps.docs.values())
+
+
+def test_add_representatives_reports_partial_failure():
+    # "Rep 2" collides with an existing representative; the ordered insert stops there
+    reps = FakeCollection([{"company_id": "c1", "name": "Rep 2"}], unique=["name"])
+    response = call(company_routes.add_representatives, reps, "c1", [rep(f"Rep {i}") for i in range(4)])
+
+    assert not response["success"]
+    assert len(response["data"]["representative_ids"]) == 2
+    statuses = [item["status"] for item in response["data"]["results"]]
+    assert statuses == ["created", "created", "failed", "failed"]
+    assert "duplicate key" in response["data"]["results"][2]["error"]
+
+
+def test_bulk_write_mixes_operations_and_reports_per_item():
+    reps = FakeCollection(
+        docs=[{"_id": "r1", "company_id": "c1"}, {"_id": "r2", "company_id": "c1"},
+              {"_id": "other", "company_id": "c2"}],
+        write_errors=[{"index": 1, "code": 121, "errmsg": "validation failed"}]
+    )
+    request = RepresentativeBulkWrite(
+        create=[rep("New")],
+        update=[{"id": "r1", "name": "Renamed", "role": "CEO"}, {"id": "missing", "name": "X", "role": "CEO"}],
+        delete=["r2", "other"]
+    )
+    response = call(company_routes.bulk_write_representatives, reps, "c1", request)
+
+    # One round-trip for all valid operations, unordered so failures do not stop the rest
+    (operations, ordered), = reps.calls_to("bulk_write")
+    assert [type(op) for op in operations] == [InsertOne, UpdateOne, DeleteOne] and not ordered
+    results = {(item["op"], item["representative_id"]): item for item in response["data"]["results"]}
+    assert results[("update", "r1")]["error"] == "validation failed"
+    assert results[("update", "missing")]["error"] == "Representative not found"
+    assert results[("delete", "other")]["status"] == "failed"  # another company's representative
+    assert results[("delete", "r2")]["status"] == "deleted"
+    assert [item["status"] for item in response["data"]["results"] if item["op"] == "create"] == ["created"]
+    assert response["data"]["failed"] == 3 and not response["success"]
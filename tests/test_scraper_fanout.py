@@ -0,0 +1,62 @@
+"""
+Company scraper fan-out tests: sources run concurrently, a source over
+the budget is dropped, and a late PageSpeed result is merged afterwards.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from app.config.settings import settings
+from app.services.scraper import CompanyScraper
+
+
+def make_scraper(delays):
+    scraper = CompanyScraper()
+    scraper.openai_client = None  # no AI extraction step
+
+    def source(name, value):
+        async def fetch(*args):
+            await asyncio.sleep(delays[name])
+            return value
+        return fetch
+
+    scraper._scrape_website_content = source("website", "Acme builds rockets.")
+    scraper._fetch_wikipedia = source("wikipedia", "Acme Corporation is a company.")
+    scraper._fetch_ai_search_results = source("ai_search", "Acme, founded 1949.")
+    scraper._fetch_from_pagespeed = source("pagespeed", {"tech_stack": ["React"]})
+    return scraper
+
+
+def test_sources_run_concurrently():
+    scraper = make_scraper({"website": 0.2, "wikipedia": 0.2, "ai_search": 0.2, "pagespeed": 0.1})
+    started = time.perf_counter()
+    data = asyncio.run(scraper.scrape_company_data("https://acme.com"))
+    assert time.perf_counter() - started < 0.5  # max of the sources, not the 0.7s sum
+    assert data["tech_stack"] == ["React"]
+    timings = data["data_source_timings"]
+    assert {t["status"] for t in timings.values()} == {"ok"}
+    assert all(t["elapsed_ms"] >= 100 for t in timings.values())
+
+
+def test_slow_sources_are_dropped_or_merged_late():
+    scraper = make_scraper({"website": 0.05, "wikipedia": 0.05, "ai_search": 5.0, "pagespeed": 0.3})
+    late = []
+
+    async def on_late(update):
+        late.append(update)
+
+    async def scenario():
+        with patch.object(settings, "SCRAPER_TOTAL_BUDGET_SECONDS", 0.1):
+            data = await scraper.scrape_company_data("https://acme.com", on_late_result=on_late)
+        assert len(scraper._late_tasks) == 1  # held until delivered, not left to the GC
+        await asyncio.sleep(0.4)  # PageSpeed finishes after the response
+        assert not scraper._late_tasks
+        return data
+
+    data = asyncio.run(scenario())
+    assert data["data_source_timings"]["ai_search"]["status"] == "dropped"
+    assert "OpenAI Web Search" not in data["data_sources"]
+    assert data["tech_stack"] == []
+    assert late and late[0]["tech_stack"] == ["React"]
+    assert late[0]["data_source_timings"]["pagespeed"]["status"] == "ok"
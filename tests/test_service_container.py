@@ -0,0 +1,60 @@
+"""
+Startup cost tests: importing the app must not build vendor clients, and
+the import itself must stay under IMPORT_TIME_BUDGET_SECONDS.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.services.service_container import ServiceContainer
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORT_TIME_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", "6.0"))
+
+IMPORT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+from app.services.service_container import container
+print(json.dumps({"seconds": elapsed, "built": [n for n, s in container.services.items() if s.built]}))
+"""
+
+
+def test_import_builds_no_clients_and_is_fast():
+    env = dict(os.environ, OPENAI_API_KEY="test-key", AWS_ACCESS_KEY_ID="x", AWS_SECRET_ACCESS_KEY="y")
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    # with credentials set, an eager S3 client would have called head_bucket here
+    assert report["built"] == []
+    assert report["seconds"] < IMPORT_TIME_BUDGET_SECONDS, report
+
+
+def test_readiness_tracks_required_clients():
+    container = ServiceContainer()
+    calls = []
+    client = container.register("vendor", lambda: calls.append(1) or object())
+    container.register("optional", lambda: None, required=False)
+
+    def broken():
+        raise RuntimeError("no route to host")
+
+    container.register("flaky", broken, required=False)
+
+    assert calls == []  # registering builds nothing
+    assert not container.readiness()["ready"]
+
+    asyncio.run(container.start())
+    report = container.readiness()
+    assert report["ready"]
+    assert calls == [1]
+    assert report["services"]["optional"]["available"] is False
+    assert "no route to host" in report["services"]["flaky"]["error"]
+    assert client.get() is client.get() and calls == [1]
@@ -0,0 +1,59 @@
+"""
+Post-session job tests: a failed analytics call raises out of the handler
+(so the job queue retries it) and nothing is saved for the session.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services import openai_service as openai_module
+from app.services import session_jobs
+from tests.conftest import FakeCollection
+
+
+def run_job(create):
+    conversations = FakeCollection([{
+        "session_id": "s1", "meeting_id": "m1", "total_turns": 2,
+        "turns": [{"speaker": "salesperson", "speaker_name": "Sam", "text": "How do you onboard today?"},
+                  {"speaker": "rep_1", "speaker_name": "Alice", "text": "Manually."}],
+    }])
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    with patch.object(openai_module, "client", fake_client), \
+            patch.object(session_jobs, "get_conversation_collection", return_value=conversations), \
+            patch.object(session_jobs, "get_meeting_collection",
+                         return_value=FakeCollection([{"_id": "m1", "salesperson_id": "sp", "company_id": "c"}])), \
+            patch.object(session_jobs, "get_salesperson_collection", return_value=FakeCollection()), \
+            patch.object(session_jobs, "get_company_collection", return_value=FakeCollection()):
+        asyncio.run(session_jobs.generate_and_save_analytics({"session_id": "s1"}))
+    return conversations
+
+
+def reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_analytics_failure_is_raised_for_retry():
+    async def rate_limited(**kwargs):
+        raise RuntimeError("rate limited")
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        run_job(rate_limited)
+
+    async def not_json(**kwargs):
+        return reply("I can't analyze this.")
+
+    with pytest.raises(ValueError):
+        run_job(not_json)
+
+
+def test_analytics_are_saved_on_success():
+    async def ok(**kwargs):
+        return reply('{"overall_score": 80, "summary": "Good call"}')
+
+    conversations = run_job(ok)
+    analytics = asyncio.run(conversations.find_one({"session_id": "s1"}))["analytics"]
+    assert analytics["overall_score"] == 80
+    assert analytics["open_questions"] == 1
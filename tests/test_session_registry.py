@@ -0,0 +1,33 @@
+"""
+Live-session registry tests (in-memory backend; the Mongo backend stores
+the same documents in ``live_sessions``).
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.services.session_registry_service import SessionRegistryService
+
+
+def test_register_list_and_release():
+    registry = SessionRegistryService()
+    registry.backend = "memory"
+
+    async def scenario():
+        await registry.register("s1", "m1", attempt_number=1)
+        await registry.register("s2", "m2", attempt_number=1)
+        listed = await registry.list_active("m1")
+        listed[0].pop("_id")  # callers may reshape results
+        owner = await registry.owner("s1")
+        await registry.unregister("s2")
+        remaining = await registry.list_active()
+        await registry.release_worker()
+        return listed, owner, remaining, await registry.list_active()
+
+    listed, owner, remaining, after_release = asyncio.run(scenario())
+    assert [s["meeting_id"] for s in listed] == ["m1"]
+    assert owner["_id"] == "s1" and owner["worker_id"] == registry.worker_id
+    assert [s["_id"] for s in remaining] == ["s1"]
+    assert after_release == []
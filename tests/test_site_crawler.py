@@ -0,0 +1,135 @@
+"""
+Site crawler tests against a local HTTP fixture server: section pages are
+found and deduplicated, robots.txt is honoured, and the per-host
+concurrency, byte and time budgets hold.
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.services.scraper import CompanyScraper
+from app.services.site_crawler import SiteCrawler
+
+HOMEPAGE = """<html><body>
+<nav><a href="/about">About</a><a href="/about/#team">Team</a><a href="/careers/">Careers</a>
+<a href="/pricing">Pricing</a><a href="https://other.example/about">Partner</a></nav>
+<h1>Acme Rockets</h1><p>We build rockets.</p>
+<a href="/news">News</a><a href="/news/2020/launch-day">Launch day</a>
+</body></html>"""
+
+PAGES = {
+    "/": HOMEPAGE,
+    "/robots.txt": "User-agent: *\nDisallow: /pricing\n",
+    "/about": "<html><body><p>Acme was founded in 1999 and has a team of 250 staff.</p></body></html>",
+    "/careers": "<html><body><p>We are hiring engineers.</p></body></html>",
+    "/pricing": "<html><body><p>Secret prices.</p></body></html>",
+    "/news": "<html><body><p>Acme raised $40M.</p></body></html>",
+}
+
+
+class FixtureServer:
+    """Serves PAGES (plus /<section>-slow and /<section>-big pages) and records requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                with fixture.lock:
+                    fixture.requests.append(path)
+                    fixture.in_flight += 1
+                    fixture.max_in_flight = max(fixture.max_in_flight, fixture.in_flight)
+                try:
+                    if path.endswith("-slow") or path.endswith("-big"):
+                        time.sleep(delay)
+                    if path.endswith("-big"):
+                        body = "<html><body><script>" + "x" * 200_000 + "</script><p>end</p></body></html>"
+                    else:
+                        body = PAGES.get(path.rstrip("/") or "/")
+                    if path.endswith("-slow"):
+                        body = f"<p>{path}</p>"
+                    if body is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    data = body.encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain" if path == "/robots.txt" else "text/html")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with fixture.lock:
+                        fixture.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_scraper_reads_section_pages():
+    scraper = CompanyScraper()
+    with FixtureServer() as server:
+        content = asyncio.run(scraper._scrape_website_content(server.url + "/"))
+
+    # /about#team and /about/ collapse into /about; /pricing is disallowed; other hosts and articles ignored
+    assert sorted(server.requests) == ["/", "/about", "/careers/", "/news", "/robots.txt"]
+    assert content.startswith("Acme Rockets We build rockets.")
+    assert "[About] Acme was founded in 1999" in content and "[Careers]" in content
+    assert "Secret prices" not in content
+
+    extracted = asyncio.run(scraper._basic_extraction(content))
+    assert extracted["founded_year"] == "1999"
+    assert extracted["company_size"] == "250"
+
+
+def crawl(crawler, server, links):
+    async def run():
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await crawler.crawl(client, server.url + "/", links)
+    return asyncio.run(run())
+
+
+def test_per_host_concurrency_limit():
+    links = [f"/{section}-slow" for section in ("about", "careers", "press")]
+    crawler = SiteCrawler(max_pages=4, per_host_concurrency=2, budget_seconds=5)
+    with FixtureServer(delay=0.2) as server:
+        pages = crawl(crawler, server, links)
+    assert len(pages) == 3
+    assert server.max_in_flight == 2
+
+
+def test_byte_and_time_budgets():
+    crawler = SiteCrawler(max_pages=4, per_host_concurrency=4, max_total_bytes=50_000, budget_seconds=5)
+    with FixtureServer() as server:
+        pages = crawl(crawler, server, ["/about-big", "/careers-big", "/pricing-big"])
+    assert pages == []  # every page's text sits past the shared 50 KB budget
+
+    crawler = SiteCrawler(max_pages=4, per_host_concurrency=4, budget_seconds=0.5)
+    with FixtureServer(delay=3.0) as server:
+        started = time.perf_counter()
+        pages = crawl(crawler, server, ["/about-slow", "/careers"])
+        elapsed = time.perf_counter() - started
+    assert [page["label"] for page in pages] == ["Careers"]
+    assert elapsed < 1.5
@@ -0,0 +1,152 @@
+"""
+STT engine selection and gating tests.
+
+In "auto" mode the local engine is only used once its model is loaded, and
+a local failure falls back to the hosted engine. Silence never reaches an
+engine, Whisper artifacts from short or unsure clips are dropped and
+short stock replies only when the clip is short and unsure.
+"""
+
+import asyncio
+import os
+from array import array
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+with patch("openai.AsyncOpenAI", return_value=MagicMock()), \
+        patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.services.audio_normalizer import NormalizedAudio
+    from app.services.stt_engines import LatencyStats, STTEngine, Transcript
+    from app.services.whisper_service import WhisperService
+
+WAV_HEADER = b"RIFF" + b"\x00" * 2000
+
+
+class FakeEngine(STTEngine):
+    def __init__(self, name, text="hello", ready=True, fail=False, **confidence):
+        super().__init__()
+        self.name = name
+        self.text = text
+        self._ready = ready
+        self.fail = fail
+        self.confidence = confidence
+
+    @property
+    def ready(self):
+        return self._ready
+
+    async def _transcribe(self, audio_bytes, filename, language):
+        if self.fail:
+            raise RuntimeError("boom")
+        return Transcript(self.text, **self.confidence)
+
+
+def make_service(mode, local):
+    service = WhisperService()
+    service.engine_mode = mode
+    service.engines = {"hosted": FakeEngine("hosted", "from hosted"), "local": local}
+    return service
+
+
+def test_auto_uses_local_only_when_ready():
+    service = make_service("auto", FakeEngine("local", "from local", ready=False))
+    assert asyncio.run(service.transcribe_audio(WAV_HEADER)) == "from hosted"
+
+    service.engines["local"]._ready = True
+    assert asyncio.run(service.transcribe_audio(WAV_HEADER)) == "from local"
+
+
+def test_auto_falls_back_to_hosted_on_local_error():
+    service = make_service("auto", FakeEngine("local", fail=True))
+    assert asyncio.run(service.transcribe_audio(WAV_HEADER)) == "from hosted"
+    stats = service.get_stats()["engines"]
+    assert stats["local"]["errors"] == 1
+    assert stats["hosted"]["calls"] == 1
+
+
+def test_latency_stats_percentiles():
+    stats = LatencyStats()
+    for ms in range(1, 101):
+        stats.record(ms / 1000)
+    stats.record(5.0, ok=False)
+    snapshot = stats.snapshot()
+    assert snapshot["calls"] == 101
+    assert snapshot["errors"] == 1
+    assert snapshot["p50_ms"] == 50.0
+    assert snapshot["p95_ms"] == 95.0
+
+
+def speech(seconds):
+    samples = array("h", [1000] * int(16000 * seconds))
+    return NormalizedAudio(samples, 16000, len(samples), speech_seconds=seconds)
+
+
+def test_silence_gate_skips_engine():
+    service = make_service("hosted", FakeEngine("local"))
+    stats = {}
+    assert asyncio.run(service.transcribe_normalized(speech(0.1), stats=stats)) == ""
+    assert stats == {"stt_skipped_silence": 1}
+    assert service.engines["hosted"].stats.calls == 0
+
+
+def test_hallucination_filter():
+    service = make_service("hosted", FakeEngine("local"))
+    service.engines["hosted"] = FakeEngine("hosted", "Thank you.", avg_logprob=-1.3, no_speech_prob=0.7)
+    stats = {}
+    assert asyncio.run(service.transcribe_normalized(speech(0.8), stats=stats)) == ""
+    assert stats == {"stt_hallucinations_filtered": 1}
+
+    # a short, confident "Okay." is a real reply
+    service.engines["hosted"] = FakeEngine("hosted", "Okay.", avg_logprob=-0.2, no_speech_prob=0.05)
+    assert asyncio.run(service.transcribe_normalized(speech(0.8))) == "Okay."
+
+    # Whisper artifacts from a short clip are dropped even without confidence scores
+    service.engines["hosted"] = FakeEngine("hosted", "Thanks for watching!")
+    assert asyncio.run(service.transcribe_normalized(speech(0.8))) == ""
+
+    # a confident, longer "Thank you." is kept
+    service.engines["hosted"] = FakeEngine("hosted", "Thank you.", avg_logprob=-0.2, no_speech_prob=0.05)
+    assert asyncio.run(service.transcribe_normalized(speech(3.0))) == "Thank you."
+
+    # anything Whisper marks as non-speech with low confidence is dropped
+    assert service.is_hallucination(Transcript("Go ahead", avg_logprob=-1.4, no_speech_prob=0.9))
+    assert not service.is_hallucination(Transcript("Go ahead", avg_logprob=-0.3, no_speech_prob=0.9))
+
+
+class SlowEngine(FakeEngine):
+    """Each call takes the next delay from ``delays`` (the last one repeats)."""
+
+    def __init__(self, name, delays):
+        super().__init__(name)
+        self.delays = list(delays)
+
+    async def _transcribe(self, audio_bytes, filename, language):
+        delay = self.delays.pop(0) if len(self.delays) > 1 else self.delays[0]
+        await asyncio.sleep(delay)
+        return Transcript("slow" if delay >= 1.0 else "fast")
+
+
+def test_slow_primary_is_hedged():
+    service = make_service("hosted", FakeEngine("local", ready=False))
+    service.hedge_default_seconds = service.hedge_min_seconds = 0.05
+    # first request hangs; the hedge (a second hosted call) answers first
+    service.engines["hosted"] = SlowEngine("hosted", [1.0, 0.0])
+    assert asyncio.run(service.transcribe_audio(WAV_HEADER)) == "fast"
+    assert service.hedge_stats["hedges_issued"] == 1
+    assert service.hedge_stats["hedges_won"] == 1
+    # the abandoned primary still leaves a (censored) latency sample for the p95
+    stats = service.engines["hosted"].stats
+    assert stats.cancelled == 1 and len(stats.samples) == 2
+    assert max(stats.samples) >= 0.05
+
+
+def test_turn_deadline():
+    service = make_service("hosted", FakeEngine("local", ready=False))
+    service.hedge_enabled = False
+    service.turn_budget_seconds = 0.1
+    service.engines["hosted"] = SlowEngine("hosted", [1.0])
+    with pytest.raises(Exception, match="deadline"):
+        asyncio.run(service.transcribe_audio(WAV_HEADER))
+    assert service.hedge_stats["deadline_exceeded"] == 1
+    assert service.get_stats()["turn_latency"]["errors"] == 1
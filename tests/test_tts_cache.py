@@ -0,0 +1,62 @@
+"""
+Phrase-level TTS cache tests (memory tier; S3 is disabled without credentials).
+"""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+with patch("openai.AsyncOpenAI", return_value=MagicMock()), \
+        patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.services.openai_service import FALLBACK_RESPONSES, STREAM_ERROR_RESPONSE
+    from app.services.tts_cache_service import TTSCacheService
+
+
+def test_fixed_phrases_and_their_sentences_are_cacheable():
+    cache = TTSCacheService()
+    assert cache.is_cacheable(STREAM_ERROR_RESPONSE)
+    # the streaming path speaks it one sentence at a time
+    assert cache.is_cacheable("That's an interesting point.")
+    assert cache.is_cacheable("Could you tell us more?")
+    assert cache.is_cacheable(FALLBACK_RESPONSES["angry"])
+    assert not cache.is_cacheable("Our pricing starts at ten dollars per seat.")
+    assert FALLBACK_RESPONSES["angry"] not in cache.phrases_for("nice")
+
+
+def test_key_covers_voice_settings_and_format():
+    key = TTSCacheService.build_key
+    base = key("Hi.", "voice-a", "eleven_turbo_v2_5", {"stability": 0.5}, "mp3")
+    assert base == key(" Hi. ", "voice-a", "eleven_turbo_v2_5", {"stability": 0.5}, "mp3")
+    assert base != key("Hi.", "voice-b", "eleven_turbo_v2_5", {"stability": 0.5}, "mp3")
+    assert base != key("Hi.", "voice-a", "eleven_turbo_v2_5", {"stability": 0.3}, "mp3")
+    assert base != key("Hi.", "voice-a", "eleven_turbo_v2_5", {"stability": 0.5}, "opus")
+
+
+def test_memory_tier_is_lru_within_byte_budget():
+    cache = TTSCacheService()
+    cache.max_bytes = 25
+
+    async def run():
+        await cache.set("a", b"x" * 10)
+        await cache.set("b", b"x" * 10)
+        assert await cache.get("a")  # a is now most recent
+        await cache.set("c", b"x" * 10)  # evicts b
+        return await cache.get("a"), await cache.get("b"), await cache.get("c")
+
+    a, b, c = asyncio.run(run())
+    assert a and c and b is None
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 3 and stats["misses"] == 1
+    assert stats["memory_bytes"] == 20
+
+
+def test_warm_up_is_skipped_without_storage():
+    cache = TTSCacheService()
+
+    async def voices_in_use():
+        raise AssertionError("warm-up should not render without S3")
+
+    cache.voices_in_use = voices_in_use
+    asyncio.run(cache.warm_up())
+    assert cache.get_stats()["storage_enabled"] is False
+    assert cache.get_stats()["memory_entries"] == 0
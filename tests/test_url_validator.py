@@ -0,0 +1,254 @@
+"""
+URL validator tests against a local HTTPS server with a throwaway CA:
+certificate, reachability and redirect facts come from one request chain
+on one connection, untrusted certificates are reported, and a stalled
+handshake does not block the event loop.
+"""
+
+import asyncio
+import datetime
+import ipaddress
+import socket
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.services.url_validator_service import URLValidator
+
+
+def make_certificates(tmp_path):
+    now = datetime.datetime.utcnow()
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_name = x509.Name([x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Test CA")])
+    ca = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name).issuer_name(ca_name)
+        .public_key(ca_key.public_key()).serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=365))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(x509.KeyUsage(False, False, False, False, False, True, True, False, False), critical=True)
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(ca_key.public_key()), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+    key = ec.generate_private_key(ec.SECP256R1())
+    leaf = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")]))
+        .issuer_name(ca_name)
+        .public_key(key.public_key()).serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName(
+            [x509.DNSName("localhost"), x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(ca_key.public_key()), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+    paths = {name: tmp_path / f"{name}.pem" for name in ("ca", "cert", "key")}
+    paths["ca"].write_bytes(ca.public_bytes(serialization.Encoding.PEM))
+    paths["cert"].write_bytes(leaf.public_bytes(serialization.Encoding.PEM))
+    paths["key"].write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return paths
+
+
+class TLSServer:
+    """
+    Keep-alive HTTPS server: / redirects to /home, /away to /home on
+    127.0.0.1 (another domain). Counts connections and requests.
+    """
+
+    def __init__(self, paths):
+        fixture = self
+        self.connections = 0
+        self.requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, body: bool):
+                fixture.requests.append(f"{self.command} {self.path}")
+                if self.path in ("/", "/away"):
+                    port = fixture.server.server_address[1]
+                    self.send_response(301)
+                    self.send_header("Location", "/home" if self.path == "/" else f"https://127.0.0.1:{port}/home")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                data = b"<p>home</p>"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(data)
+
+            def do_HEAD(self):
+                self._respond(body=False)
+
+            def do_GET(self):
+                self._respond(body=True)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            def get_request(self):
+                sock, addr = super().get_request()
+                fixture.connections += 1
+                return sock, addr
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(paths["cert"], paths["key"])
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.url = f"https://localhost:{self.server.server_address[1]}/"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_trusted_certificate_uses_one_handshake(tmp_path):
+    paths = make_certificates(tmp_path)
+    validator = URLValidator()
+    validator.ssl_context = ssl.create_default_context(cafile=str(paths["ca"]))
+
+    with TLSServer(paths) as server:
+        result = asyncio.run(validator.validate_and_authenticate_url(server.url))
+
+    assert result["is_valid"] and result["is_reachable"] and result["status_code"] == 200
+    certificate = result["ssl_certificate"]
+    assert certificate["valid"] and certificate["issuer"] == "Test CA" and certificate["subject"] == "localhost"
+    assert 28 <= certificate["days_until_expiry"] <= 30
+    # Certificate, redirect and reachability checks: one connection, one request per hop
+    assert server.connections == 1
+    assert server.requests == ["HEAD /", "HEAD /home"]
+    assert result["redirect_chain"] == [server.url, server.url + "home"]
+    assert not any("different domain" in w for w in result["warnings"])
+
+
+def test_cross_domain_redirect_warning(tmp_path):
+    paths = make_certificates(tmp_path)
+    validator = URLValidator()
+    validator.ssl_context = ssl.create_default_context(cafile=str(paths["ca"]))
+
+    with TLSServer(paths) as server:
+        result = asyncio.run(validator.validate_and_authenticate_url(server.url + "away"))
+
+    port = server.server.server_address[1]
+    assert result["is_reachable"] and result["ssl_valid"]
+    assert f"⚠️ Redirects to different domain: 127.0.0.1:{port}" in result["warnings"]
+    assert result["redirect_chain"][-1] == f"https://127.0.0.1:{port}/home"
+
+
+def test_untrusted_certificate_is_reported(tmp_path):
+    paths = make_certificates(tmp_path)
+    validator = URLValidator()  # system trust store: the test CA is unknown
+
+    with TLSServer(paths) as server:
+        result = asyncio.run(validator.validate_and_authenticate_url(server.url))
+
+    assert result["is_reachable"]
+    assert not result["ssl_valid"]
+    assert "certificate verify failed" in result["ssl_certificate"]["error"].lower()
+    assert "SSL certificate invalid or self-signed" in result["warnings"]
+
+
+def test_stalled_handshake_does_not_block_event_loop():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()  # accepts TCP but never answers the TLS ClientHello
+    validator = URLValidator()
+    validator.ssl_timeout = 0.5
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        certificate = await validator._check_ssl_certificate("127.0.0.1", listener.getsockname()[1])
+        task.cancel()
+        return certificate, ticks
+
+    try:
+        certificate, ticks = asyncio.run(scenario())
+    finally:
+        listener.close()
+    assert certificate == {**certificate, "valid": False, "error": "TLS handshake timed out"}
+    assert ticks >= 20
+
+
+def fake_validation(validator, delay=0.05, invalid=()):
+    """Replace the network check with a counted fake."""
+    calls = []
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def validate(url):
+        calls.append(url)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(delay)
+        state["in_flight"] -= 1
+        normalized = validator._normalize_url(url)
+        return {"is_valid": url not in invalid, "authenticated_url": normalized, "domain": normalized[8:],
+                "errors": [], "warnings": []}
+
+    validator._validate = validate
+    return calls, state
+
+
+def test_results_are_cached_with_shorter_negative_ttl():
+    validator = URLValidator()
+    validator.negative_cache_ttl = 0.1
+    calls, _ = fake_validation(validator, delay=0, invalid={"broken.com"})
+
+    async def scenario():
+        first = await validator.validate_and_authenticate_url("acme.com")
+        again = await validator.validate_and_authenticate_url("https://ACME.com/")
+        await validator.validate_and_authenticate_url("broken.com")
+        await validator.validate_and_authenticate_url("broken.com")
+        await asyncio.sleep(0.15)  # negative entry expired; positive one has not
+        await validator.validate_and_authenticate_url("broken.com")
+        await validator.validate_and_authenticate_url("acme.com")
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert not first["cached"] and again["cached"]
+    assert calls == ["acme.com", "broken.com", "broken.com"]
+    assert validator.get_cache_stats()["hits"] == 3
+
+
+def test_concurrent_validations_are_coalesced():
+    validator = URLValidator()
+    calls, _ = fake_validation(validator)
+
+    async def scenario():
+        return await asyncio.gather(*(validator.validate_and_authenticate_url("acme.com") for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(r["is_valid"] for r in results)
+    assert validator.get_cache_stats()["coalesced"] == 9
+
+
+def test_batch_validation_is_bounded():
+    validator = URLValidator()
+    calls, state = fake_validation(validator)
+    urls = [f"company{i}.com" for i in range(20)] + ["company0.com"]
+
+    results = asyncio.run(validator.validate_many(urls, concurrency=4))
+    assert len(results) == 20 and len(calls) == 20
+    assert state["max_in_flight"] == 4
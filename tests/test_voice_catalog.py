@@ -0,0 +1,71 @@
+"""
+Voice catalog cache tests: a stale catalog is served immediately and
+revalidated in the background; an unreachable vendor never raises.
+"""
+
+import asyncio
+import os
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+with patch("openai.AsyncOpenAI", return_value=MagicMock()), \
+        patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+    from app.services import voice_catalog_service as catalog_module
+    from app.services.elevenlabs_service import DEFAULT_VOICES, elevenlabs_service
+    from app.utils.helpers import current_timestamp
+
+OLD = [{"voice_id": "old-voice", "name": "Old"}]
+NEW = [{"voice_id": "new-voice", "name": "New"}]
+
+
+def make_service(persisted, fetch):
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=persisted)
+    collection.update_one = AsyncMock()
+    service = catalog_module.VoiceCatalogService()
+    patches = [
+        patch.object(catalog_module, "get_voice_catalog_collection", return_value=collection),
+        patch.object(elevenlabs_service, "fetch_voices", fetch),
+    ]
+    return service, collection, patches
+
+
+def run_with(patches, coro_fn):
+    for p in patches:
+        p.start()
+    try:
+        return asyncio.run(coro_fn())
+    finally:
+        for p in patches:
+            p.stop()
+        elevenlabs_service.available_voices = dict(DEFAULT_VOICES)
+
+
+def test_stale_catalog_is_served_then_revalidated():
+    stale = {"voices": OLD, "fetched_at": current_timestamp() - timedelta(days=2)}
+    service, collection, patches = make_service(stale, AsyncMock(return_value=NEW))
+
+    async def scenario():
+        first = await service.get_voices()
+        await service._refresh_task
+        return first, await service.get_voices(), dict(elevenlabs_service.available_voices)
+
+    first, second, aliases = run_with(patches, scenario)
+    assert first == OLD
+    assert second == NEW
+    assert aliases == {"voice_0": "new-voice"}
+    collection.update_one.assert_awaited_once()
+
+
+def test_fresh_catalog_does_not_call_vendor():
+    fresh = {"voices": OLD, "fetched_at": current_timestamp()}
+    fetch = AsyncMock(return_value=NEW)
+    service, _, patches = make_service(fresh, fetch)
+    assert run_with(patches, service.get_voices) == OLD
+    fetch.assert_not_awaited()
+
+
+def test_vendor_failure_keeps_defaults():
+    service, _, patches = make_service(None, AsyncMock(side_effect=RuntimeError("offline")))
+    assert run_with(patches, service.get_voices) == []
+    assert elevenlabs_service.available_voices == DEFAULT_VOICES